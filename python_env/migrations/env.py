@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Alembic migration environment
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+
+from src import models
+from src.database import SQLALCHEMY_DATABASE_URL, create_db_engine
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = models.Base.metadata
+
+
+def database_url():
+    """
+    Get the URL to migrate, preferring the one set in alembic.ini
+    """
+    return config.get_main_option("sqlalchemy.url") or SQLALCHEMY_DATABASE_URL
+
+
+def run_migrations_offline():
+    """
+    Emit the migration SQL without connecting to the database
+    """
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        render_as_batch=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    """
+    Run the migrations against the database
+    """
+    connectable = create_db_engine(database_url())
+    with connectable.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+    connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
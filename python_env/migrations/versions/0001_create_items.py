@@ -0,0 +1,40 @@
+"""Create the items table
+
+Baseline of the schema the application used to create on startup. It
+is skipped on databases that already have the table, so those can be
+brought under migrations with a plain `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("items"):
+        return
+    op.create_table(
+        "items",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=100)),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_items_id", "items", ["id"])
+    op.create_index("ix_items_name", "items", ["name"])
+
+
+def downgrade():
+    op.drop_index("ix_items_name", table_name="items")
+    op.drop_index("ix_items_id", table_name="items")
+    op.drop_table("items")
@@ -0,0 +1,36 @@
+"""Add composite indexes for filtered and sorted item listings
+
+Each index serves one filter/ordering pair of GET /items/ in order:
+(created_at, id) for the created_at ordering and time ranges, and one
+index per ordering behind the is_active filter.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_items_created_at_id": ["created_at", "id"],
+    "ix_items_is_active_id": ["is_active", "id"],
+    "ix_items_is_active_created_at_id": ["is_active", "created_at", "id"],
+    "ix_items_is_active_name_id": ["is_active", "name", "id"],
+}
+
+
+def upgrade():
+    for name, columns in INDEXES.items():
+        op.create_index(name, "items", columns, if_not_exists=True)
+    # Refresh planner statistics so the new indexes are picked up
+    op.execute("ANALYZE items")
+
+
+def downgrade():
+    for name in INDEXES:
+        op.drop_index(name, table_name="items")
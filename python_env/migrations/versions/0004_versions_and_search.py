@@ -0,0 +1,56 @@
+"""Create the items version counter and full-text index
+
+Adds the table_versions counter with the triggers bumping it on every
+items write, and the items_fts index with the triggers keeping it in
+sync. Both reuse the SQLite DDL the models attach to create_all, and
+existing rows are indexed once.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.models import ITEMS_FTS_DDL, ITEMS_FTS_TRIGGERS_DDL, ITEMS_VERSION_DDL
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+ITEMS_TRIGGERS = [
+    "items_version_insert", "items_version_update", "items_version_delete",
+    "items_fts_insert", "items_fts_delete", "items_fts_update",
+]
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("table_versions"):
+        op.create_table(
+            "table_versions",
+            sa.Column("name", sa.String(length=64), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False),
+        )
+    if bind.dialect.name != "sqlite":
+        return
+
+    for statement in ITEMS_VERSION_DDL:
+        op.execute(statement)
+
+    if not inspector.has_table("items_fts"):
+        op.execute(ITEMS_FTS_DDL)
+        op.execute("INSERT INTO items_fts (items_fts) VALUES ('rebuild')")
+    for statement in ITEMS_FTS_TRIGGERS_DDL:
+        op.execute(statement)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "sqlite":
+        for trigger in ITEMS_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS items_fts")
+    op.drop_table("table_versions")
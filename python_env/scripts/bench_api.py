@@ -0,0 +1,411 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Load test the items API over HTTP
+
+Seeds a temporary SQLite database, boots the application on it with
+uvicorn, and drives a weighted mix of GET /items/, GET /items/{id},
+POST /items/ and DELETE /items/{id} from concurrent aiohttp clients.
+Reports req/s and p50/p95/p99 latency per operation and saves them as
+JSON, tagged with the current commit, to compare runs.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+# ANSI color codes
+COLORS = {
+    'GREEN': '\033[32m',
+    'YELLOW': '\033[33m',
+    'RED': '\033[31m',
+    'BLUE': '\033[34m',
+    'CYAN': '\033[36m',
+    'MAGENTA': '\033[35m',
+    'RESET': '\033[0m'
+}
+
+# Default request mix, as relative weights
+DEFAULT_MIX = "list=40,get=40,create=15,delete=5"
+
+OPERATIONS = ("list", "get", "create", "delete")
+
+def colorize(text, color):
+    """
+    Add color to the given text
+
+    Args:
+        text: Text to colorize
+        color: Color to use from COLORS dict
+
+    Returns:
+        Colorized text string
+    """
+    return f"{COLORS[color]}{text}{COLORS['RESET']}"
+
+
+def parse_mix(mix):
+    """
+    Parse a request mix such as `list=40,get=40,create=15,delete=5`
+
+    Args:
+        mix: Comma separated `operation=weight` pairs
+
+    Returns:
+        dict: Weight by operation
+
+    Raises:
+        ValueError: If an operation is unknown or no weight is positive
+    """
+    weights = {}
+    for pair in mix.split(","):
+        operation, _, weight = pair.partition("=")
+        operation = operation.strip()
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {operation!r}")
+        weights[operation] = float(weight)
+    if not any(weight > 0 for weight in weights.values()):
+        raise ValueError("The mix needs at least one positive weight")
+    return weights
+
+
+def percentile(sorted_values, fraction):
+    """
+    Get a percentile by the nearest-rank method
+
+    Args:
+        sorted_values: Values in ascending order
+        fraction: Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        float: The percentile, or 0.0 without values
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * fraction // 1))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies, errors, elapsed):
+    """
+    Summarize the latencies of one operation
+
+    Args:
+        latencies: Latencies in seconds
+        errors: Number of failed requests
+        elapsed: Duration of the run in seconds
+
+    Returns:
+        dict: Request count, errors, req/s and latency percentiles in ms
+    """
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": len(values) / elapsed if elapsed else 0.0,
+        "mean_ms": sum(values) / len(values) * 1000 if values else 0.0,
+        "p50_ms": percentile(values, 0.50) * 1000,
+        "p95_ms": percentile(values, 0.95) * 1000,
+        "p99_ms": percentile(values, 0.99) * 1000,
+        "max_ms": values[-1] * 1000 if values else 0.0,
+    }
+
+
+def seed_database(path, rows, seed):
+    """
+    Create a database filled with items
+
+    Args:
+        path: Database file
+        rows: Number of items
+        seed: Random seed of the item contents
+    """
+    from seed_db import seed_items
+
+    seed_items(f"sqlite:///{path}", rows, seed=seed, synchronous_off=True)
+
+
+def free_port():
+    """
+    Get a free local TCP port
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_path, port, workers, extra_env=None):
+    """
+    Start the application with uvicorn in a child process
+
+    Args:
+        database_path: Database file
+        port: Port to listen on
+        workers: Number of worker processes
+        extra_env: Additional environment variables for the server
+
+    Returns:
+        Popen: Server process
+    """
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{database_path}", DATABASE_CREATE_SCHEMA="0")
+    env.update(extra_env or {})
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.app:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+         "--no-access-log"],
+        env=env,
+    )
+
+
+async def wait_until_ready(session, base_url, timeout=30.0):
+    """
+    Wait for the server to answer
+
+    Raises:
+        RuntimeError: If it does not answer in time
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            async with session.get(f"{base_url}/") as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        await asyncio.sleep(0.1)
+    raise RuntimeError("Server did not start")
+
+
+async def drive_load(base_url, weights, concurrency, duration, total_requests,
+                     seed_rows, page_size, seed):
+    """
+    Send the request mix from concurrent clients
+
+    Args:
+        base_url: Server URL
+        weights: Weight by operation
+        concurrency: Number of concurrent clients
+        duration: Seconds to run, unless total_requests is set
+        total_requests: Number of requests to send, or None
+        seed_rows: Number of seeded items, the ids read at random
+        page_size: Page size of GET /items/
+        seed: Random seed of the request sequence
+
+    Returns:
+        dict: Latencies and errors by operation, and the elapsed time
+    """
+    import aiohttp
+
+    operations = list(weights)
+    cumulative = list(weights.values())
+    latencies = {operation: [] for operation in operations}
+    errors = {operation: 0 for operation in operations}
+    created = []
+    sent = 0
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        await wait_until_ready(session, base_url)
+        deadline = time.perf_counter() + duration
+
+        async def client(index):
+            nonlocal sent
+            rng = random.Random(seed * 1000 + index)
+            while True:
+                if total_requests is not None:
+                    if sent >= total_requests:
+                        return
+                    sent += 1
+                elif time.perf_counter() >= deadline:
+                    return
+                operation = rng.choices(operations, cumulative)[0]
+                if operation == "list":
+                    request = session.get(f"{base_url}/items/", params={"limit": page_size})
+                elif operation == "get":
+                    request = session.get(f"{base_url}/items/{rng.randint(1, seed_rows)}")
+                elif operation == "create":
+                    request = session.post(f"{base_url}/items/", json={
+                        "name": f"Load {index}-{rng.random():.8f}",
+                        "description": "Created by bench_api",
+                    })
+                else:
+                    # Delete items this run created, so reads keep hitting
+                    item_id = created.pop() if created else rng.randint(1, seed_rows)
+                    request = session.delete(f"{base_url}/items/{item_id}")
+                start = time.perf_counter()
+                try:
+                    async with request as response:
+                        body = await response.read()
+                        ok = response.status < 500
+                        if operation == "create" and response.status == 201:
+                            created.append(json.loads(body)["id"])
+                except aiohttp.ClientError:
+                    ok = False
+                latencies[operation].append(time.perf_counter() - start)
+                if not ok:
+                    errors[operation] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[client(index) for index in range(concurrency)])
+        elapsed = time.perf_counter() - started
+
+    return {"latencies": latencies, "errors": errors, "elapsed": elapsed}
+
+
+def git_commit():
+    """
+    Get the commit being benchmarked, or None outside a git checkout
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_api(mix=DEFAULT_MIX, concurrency=32, duration=10.0, total_requests=None,
+              seed_rows=10000, workers=1, page_size=20, seed=42, server_env=None):
+    """
+    Seed a database, serve it and load test it
+
+    Args:
+        mix: Request mix, see parse_mix
+        concurrency: Number of concurrent clients
+        duration: Seconds to run, unless total_requests is set
+        total_requests: Number of requests to send, or None
+        seed_rows: Number of items seeded
+        workers: Number of server worker processes
+        page_size: Page size of GET /items/
+        seed: Random seed of the data and the request sequence
+        server_env: Additional environment variables for the server
+
+    Returns:
+        dict: Configuration, environment and results per operation
+    """
+    weights = parse_mix(mix)
+    with tempfile.TemporaryDirectory() as scratch:
+        database_path = os.path.join(scratch, "bench.db")
+        seed_database(database_path, seed_rows, seed)
+        port = free_port()
+        server = start_server(database_path, port, workers, server_env)
+        try:
+            run = asyncio.run(drive_load(
+                f"http://127.0.0.1:{port}", weights, concurrency, duration,
+                total_requests, seed_rows, page_size, seed,
+            ))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+    elapsed = run["elapsed"]
+    operations = {
+        operation: summarize(run["latencies"][operation], run["errors"][operation], elapsed)
+        for operation in weights
+    }
+    all_latencies = [value for values in run["latencies"].values() for value in values]
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "mix": weights,
+            "concurrency": concurrency,
+            "duration": duration,
+            "total_requests": total_requests,
+            "seed_rows": seed_rows,
+            "workers": workers,
+            "page_size": page_size,
+            "seed": seed,
+            "server_env": server_env or {},
+        },
+        "elapsed_s": elapsed,
+        "total": summarize(all_latencies, sum(run["errors"].values()), elapsed),
+        "operations": operations,
+    }
+
+
+def print_report(result, baseline=None):
+    """
+    Print a result table, with changes against a baseline run
+
+    Args:
+        result: Result of bench_api
+        baseline: Earlier result to compare with, or None
+    """
+    header = f"{'operation':<10}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(colorize(header, 'BLUE'))
+    rows = list(result["operations"].items()) + [("total", result["total"])]
+    for operation, stats in rows:
+        line = (f"{operation:<10}{stats['requests']:>10}{stats['errors']:>8}{stats['rps']:>10.1f}"
+                f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}")
+        print(colorize(line, 'GREEN') if operation == "total" else line)
+
+    if baseline is not None:
+        before, after = baseline["total"], result["total"]
+        rps_change = (after["rps"] / before["rps"] - 1) * 100 if before["rps"] else 0.0
+        p95_change = (after["p95_ms"] / before["p95_ms"] - 1) * 100 if before["p95_ms"] else 0.0
+        print(colorize(f"\nAgainst {baseline.get('commit') or 'baseline'}: "
+                       f"req/s {rps_change:+.1f}%, p95 {p95_change:+.1f}%",
+                       'GREEN' if rps_change >= 0 else 'YELLOW'))
+
+
+if __name__ == "__main__":
+    # Change to project root directory
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.insert(0, os.getcwd())
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mix", default=DEFAULT_MIX,
+                        help=f"request mix as operation=weight pairs (default: {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--requests", type=int, default=None,
+                        help="send this many requests instead of running for --duration")
+    parser.add_argument("--seed-rows", type=int, default=10000, help="items seeded")
+    parser.add_argument("--workers", type=int, default=1, help="server worker processes")
+    parser.add_argument("--page-size", type=int, default=20, help="GET /items/ page size")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE",
+                        help="environment variable for the server, e.g. ITEM_WRITE_COALESCE=1")
+    parser.add_argument("--output", default=None,
+                        help="JSON results file (default: bench_results/api-<commit>-<time>.json)")
+    parser.add_argument("--compare", default=None, help="earlier JSON results to compare with")
+    args = parser.parse_args()
+
+    print(colorize("\n" + "="*50, 'CYAN'))
+    print(colorize("API LOAD TEST".center(50), 'CYAN'))
+    print(colorize("="*50 + "\n", 'CYAN'))
+
+    server_env = dict(pair.split("=", 1) for pair in args.env)
+    result = bench_api(
+        mix=args.mix, concurrency=args.concurrency, duration=args.duration,
+        total_requests=args.requests, seed_rows=args.seed_rows, workers=args.workers,
+        page_size=args.page_size, seed=args.seed, server_env=server_env,
+    )
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    output = args.output
+    if output is None:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join("bench_results", f"api-{result['commit'] or 'unknown'}-{stamp}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(colorize(f"\nResults saved to {output}", 'BLUE'))
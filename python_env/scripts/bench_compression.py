@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark response compression on GET /items/ pages
+
+Encodes pages of realistic items (from the seeder's generator) as the API
+does, then compresses them with each encoding and level, reporting CPU
+time per page against the bytes saved.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# ANSI color codes
+COLORS = {
+    'GREEN': '\033[32m',
+    'YELLOW': '\033[33m',
+    'RED': '\033[31m',
+    'BLUE': '\033[34m',
+    'CYAN': '\033[36m',
+    'MAGENTA': '\033[35m',
+    'RESET': '\033[0m'
+}
+
+def colorize(text, color):
+    """
+    Add color to the given text
+
+    Args:
+        text: Text to colorize
+        color: Color to use from COLORS dict
+
+    Returns:
+        Colorized text string
+    """
+    return f"{COLORS[color]}{text}{COLORS['RESET']}"
+
+
+def build_page(limit, seed=42):
+    """
+    Encode one page of generated items as the API sends it
+
+    Args:
+        limit: Page size
+        seed: Random seed of the items
+
+    Returns:
+        bytes: JSON body of the page
+    """
+    from seed_db import generate_items
+    from src.serialization import dumps
+
+    page = [
+        dict(item, id=index + 1)
+        for index, item in enumerate(generate_items(limit, seed))
+    ]
+    return dumps(page)
+
+
+def settings():
+    """
+    List the encodings and levels to compare
+
+    Returns:
+        list: (encoding, level) pairs; level is the brotli quality for br
+    """
+    from src import compression
+
+    pairs = [("gzip", 1), ("gzip", 4), ("gzip", 6), ("gzip", 9), ("deflate", 4), ("deflate", 6)]
+    if compression.BROTLI_AVAILABLE:
+        pairs += [("br", 1), ("br", 4), ("br", 11)]
+    return pairs
+
+
+def bench_compression(limits=(20, 100, 500), iterations=50, seed=42):
+    """
+    Time every encoding and level on pages of each size
+
+    Args:
+        limits: Page sizes
+        iterations: Compressions timed per setting
+        seed: Random seed of the items
+
+    Returns:
+        list: One result per page size and setting
+    """
+    from src.compression import compress
+
+    results = []
+    for limit in limits:
+        body = build_page(limit, seed)
+        for encoding, level in settings():
+            options = {"brotli_quality": level} if encoding == "br" else {"level": level}
+            encoded = compress(body, encoding, **options)
+            start = time.perf_counter()
+            for _ in range(iterations):
+                compress(body, encoding, **options)
+            cpu_ms = (time.perf_counter() - start) * 1000 / iterations
+            saved = len(body) - len(encoded)
+            results.append({
+                "limit": limit,
+                "encoding": encoding,
+                "level": level,
+                "original_bytes": len(body),
+                "compressed_bytes": len(encoded),
+                "ratio": len(body) / len(encoded),
+                "cpu_ms": cpu_ms,
+                "saved_kb_per_cpu_ms": saved / 1024 / cpu_ms if cpu_ms else 0.0,
+            })
+    return results
+
+
+if __name__ == "__main__":
+    # Change to project root directory
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.insert(0, os.getcwd())
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limits", type=int, nargs="+", default=[20, 100, 500],
+                        help="page sizes")
+    parser.add_argument("--iterations", type=int, default=50, help="compressions per setting")
+    parser.add_argument("--json", default=None, help="also save the results to this file")
+    args = parser.parse_args()
+
+    print(colorize("\n" + "="*50, 'CYAN'))
+    print(colorize("COMPRESSION BENCHMARK".center(50), 'CYAN'))
+    print(colorize("="*50 + "\n", 'CYAN'))
+
+    results = bench_compression(args.limits, args.iterations)
+    print(colorize(f"{'page':>6} {'encoding':<9}{'level':>6}{'bytes':>10}{'encoded':>10}"
+                   f"{'ratio':>8}{'cpu ms':>9}{'KiB saved/ms':>14}", 'BLUE'))
+    for result in results:
+        print(f"{result['limit']:>6} {result['encoding']:<9}{result['level']:>6}"
+              f"{result['original_bytes']:>10}{result['compressed_bytes']:>10}"
+              f"{result['ratio']:>8.2f}{result['cpu_ms']:>9.3f}{result['saved_kb_per_cpu_ms']:>14.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(colorize(f"\nResults saved to {args.json}", 'BLUE'))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark the cold import time of the API application
+
+Runs `python -X importtime -c "import src.app"` in fresh interpreters,
+the work every server worker does before it can serve, and checks the
+fastest run against a budget. The database URL points at a scratch path
+so the import can be checked not to touch the database.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+# ANSI color codes
+COLORS = {
+    'GREEN': '\033[32m',
+    'YELLOW': '\033[33m',
+    'RED': '\033[31m',
+    'BLUE': '\033[34m',
+    'CYAN': '\033[36m',
+    'MAGENTA': '\033[35m',
+    'RESET': '\033[0m'
+}
+
+# Default cold import budget of src.app, in milliseconds
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "1000"))
+
+def colorize(text, color):
+    """
+    Add color to the given text
+
+    Args:
+        text: Text to colorize
+        color: Color to use from COLORS dict
+
+    Returns:
+        Colorized text string
+    """
+    return f"{COLORS[color]}{text}{COLORS['RESET']}"
+
+
+def parse_importtime(output):
+    """
+    Parse the report written by `-X importtime`
+
+    Args:
+        output: stderr of the interpreter
+
+    Returns:
+        dict: (self_us, cumulative_us) by module name
+    """
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure_import(module="src.app", runs=5):
+    """
+    Import a module in fresh interpreters and time it
+
+    Args:
+        module: Module to import
+        runs: Number of interpreters started
+
+    Returns:
+        dict: Fastest cumulative import time, its slowest modules by self
+        time, and whether the database file was created
+    """
+    best = None
+    with tempfile.TemporaryDirectory() as scratch:
+        database_path = os.path.join(scratch, "import.db")
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{database_path}")
+        for _ in range(runs):
+            result = subprocess.run(
+                [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                env=env, capture_output=True, text=True, check=True,
+            )
+            modules = parse_importtime(result.stderr)
+            if best is None or modules[module][1] < best[module][1]:
+                best = modules
+        touched_database = os.path.exists(database_path)
+    slowest = sorted(best.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    return {
+        "module": module,
+        "total_ms": best[module][1] / 1000,
+        "slowest": [{"module": name, "self_ms": self_us / 1000} for name, (self_us, _) in slowest],
+        "touched_database": touched_database,
+    }
+
+
+if __name__ == "__main__":
+    # Change to project root directory
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.insert(0, os.getcwd())
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="src.app", help="module to import")
+    parser.add_argument("--runs", type=int, default=5, help="interpreters started")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="maximum cold import time")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    result = measure_import(args.module, args.runs)
+    within_budget = result["total_ms"] <= args.budget_ms and not result["touched_database"]
+
+    if args.json:
+        print(json.dumps(dict(result, budget_ms=args.budget_ms, within_budget=within_budget)))
+    else:
+        print(colorize("\n" + "="*50, 'CYAN'))
+        print(colorize("IMPORT TIME BENCHMARK".center(50), 'CYAN'))
+        print(colorize("="*50 + "\n", 'CYAN'))
+
+        print(colorize(f"Slowest modules of {args.module} (self time):", 'BLUE'))
+        for entry in result["slowest"]:
+            print(f"  {entry['self_ms']:8.1f} ms  {entry['module']}")
+        if result["touched_database"]:
+            print(colorize("Importing created the database file", 'RED'))
+        color = 'GREEN' if within_budget else 'RED'
+        print(colorize(f"Cold import: {result['total_ms']:.1f} ms "
+                       f"(budget {args.budget_ms:.0f} ms)", color))
+
+    sys.exit(0 if within_budget else 1)
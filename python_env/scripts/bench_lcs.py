@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark the memory and time of the LCS methods of SequenceUtils
+
+Methods are those of `longest_common_subsequence` ("table", "numpy",
+"hirschberg", "myers") and, prefixed with "length-", those of `lcs_length`
+("length-dp", "length-bitparallel"). Each runs on random string pairs of
+growing length, recording the peak memory allocated during the call
+(tracemalloc) and, in a separate untraced run, its wall time and DP
+cells filled per second.
+Linear-space methods must stay within a budget of bytes per input
+character at every length, which is what proves the O(m+n) bound: the
+full DP table grows with m*n instead.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# ANSI color codes
+COLORS = {
+    'GREEN': '\033[32m',
+    'YELLOW': '\033[33m',
+    'RED': '\033[31m',
+    'BLUE': '\033[34m',
+    'CYAN': '\033[36m',
+    'MAGENTA': '\033[35m',
+    'RESET': '\033[0m'
+}
+
+# Methods whose peak memory must be linear in the input length
+LINEAR_METHODS = ("hirschberg", "myers", "length-dp", "length-bitparallel")
+
+# Constant working memory allowed on top of the per-character budget,
+# e.g. the small DP tables Hirschberg solves its leaves with
+FIXED_OVERHEAD_BYTES = 64 * 1024
+
+def colorize(text, color):
+    """
+    Add color to the given text
+
+    Args:
+        text: Text to colorize
+        color: Color to use from COLORS dict
+
+    Returns:
+        Colorized text string
+    """
+    return f"{COLORS[color]}{text}{COLORS['RESET']}"
+
+
+def random_pair(length, alphabet="ACGT", seed=42):
+    """
+    Generate two random strings of the same length
+
+    Args:
+        length: Length of each string
+        alphabet: Characters to draw from
+        seed: Random seed
+
+    Returns:
+        tuple: The two strings
+    """
+    rng = random.Random(seed)
+    return tuple(
+        "".join(rng.choice(alphabet) for _ in range(length))
+        for _ in range(2)
+    )
+
+
+def lcs_length(method, str1, str2):
+    """
+    Compute the LCS length of two strings with one method
+
+    Args:
+        method: Benchmark method name
+        str1: First string
+        str2: Second string
+
+    Returns:
+        int: LCS length
+    """
+    from src.sequence_utils import SequenceUtils
+
+    if method.startswith("length-"):
+        return SequenceUtils.lcs_length(str1, str2, method=method[len("length-"):])
+    return len(SequenceUtils.longest_common_subsequence(str1, str2, method=method))
+
+
+def measure(method, str1, str2):
+    """
+    Run one LCS method, tracing its allocations, then once more untraced
+
+    Args:
+        method: Benchmark method name
+        str1: First string
+        str2: Second string
+
+    Returns:
+        tuple: (lcs_length, peak_bytes, seconds)
+    """
+    # Import outside the traced call, so the module is not counted
+    import src.sequence_utils  # noqa: F401
+
+    tracemalloc.start()
+    try:
+        length = lcs_length(method, str1, str2)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    start = time.perf_counter()
+    lcs_length(method, str1, str2)
+    return length, peak, time.perf_counter() - start
+
+
+def bench_lcs(lengths=(500, 1000, 2000), methods=("table", "hirschberg", "length-bitparallel"),
+              table_max_cells=4000000, seed=42):
+    """
+    Measure every method on string pairs of each length
+
+    Args:
+        lengths: Lengths of the input strings
+        methods: Methods to compare
+        table_max_cells: Skip the quadratic-time methods above this many cells
+        seed: Random seed of the inputs
+
+    Returns:
+        list: One result per length and method
+    """
+    results = []
+    for length in lengths:
+        str1, str2 = random_pair(length, seed=seed)
+        expected = None
+        for method in methods:
+            if method in ("table", "length-dp") and (length + 1) ** 2 > table_max_cells:
+                continue
+            lcs, peak, seconds = measure(method, str1, str2)
+            if expected is None:
+                expected = lcs
+            assert lcs == expected, f"{method} disagrees on the LCS length"
+            results.append({
+                "length": length,
+                "method": method,
+                "lcs_length": lcs,
+                "peak_bytes": peak,
+                "bytes_per_char": peak / (2 * length),
+                "seconds": seconds,
+                "mcells_per_second": length * length / seconds / 1e6 if seconds else 0.0,
+            })
+    return results
+
+
+def check_linear(results, max_bytes_per_char, fixed_overhead=FIXED_OVERHEAD_BYTES):
+    """
+    Find the linear-space results over the memory budget
+
+    Args:
+        results: Results of bench_lcs
+        max_bytes_per_char: Allowed peak bytes per input character
+        fixed_overhead: Constant bytes allowed on top of the budget
+
+    Returns:
+        list: Results breaking the budget
+    """
+    return [
+        result for result in results
+        if result["method"] in LINEAR_METHODS
+        and result["peak_bytes"] > fixed_overhead + max_bytes_per_char * 2 * result["length"]
+    ]
+
+
+if __name__ == "__main__":
+    # Change to project root directory
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.insert(0, os.getcwd())
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lengths", type=int, nargs="+", default=[500, 1000, 2000],
+                        help="length of each input string")
+    parser.add_argument("--methods", nargs="+",
+                        default=["table", "hirschberg", "length-bitparallel"],
+                        help="methods to compare")
+    parser.add_argument("--table-max-cells", type=int, default=4000000,
+                        help="skip table and length-dp above this many cells")
+    parser.add_argument("--max-bytes-per-char", type=float, default=64.0,
+                        help="peak memory budget of linear-space methods")
+    parser.add_argument("--json", default=None, help="also save the results to this file")
+    args = parser.parse_args()
+
+    print(colorize("\n" + "="*50, 'CYAN'))
+    print(colorize("LCS BENCHMARK".center(50), 'CYAN'))
+    print(colorize("="*50 + "\n", 'CYAN'))
+
+    results = bench_lcs(args.lengths, args.methods, args.table_max_cells)
+    print(colorize(f"{'length':>8} {'method':<20}{'lcs':>8}{'peak KiB':>12}"
+                   f"{'B/char':>10}{'seconds':>10}{'Mcells/s':>10}", 'BLUE'))
+    for result in results:
+        print(f"{result['length']:>8} {result['method']:<20}{result['lcs_length']:>8}"
+              f"{result['peak_bytes'] / 1024:>12.1f}{result['bytes_per_char']:>10.1f}"
+              f"{result['seconds']:>10.3f}{result['mcells_per_second']:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(colorize(f"\nResults saved to {args.json}", 'BLUE'))
+
+    over = check_linear(results, args.max_bytes_per_char)
+    if over:
+        for result in over:
+            print(colorize(f"{result['method']} at length {result['length']}: "
+                           f"{result['bytes_per_char']:.1f} B/char over the budget", 'RED'))
+        sys.exit(1)
+    print(colorize(f"\nLinear-space methods within {args.max_bytes_per_char:g} B/char "
+                   f"+ {FIXED_OVERHEAD_BYTES // 1024} KiB", 'GREEN'))
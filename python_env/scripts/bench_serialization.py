@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Benchmark the GET /items/ serialization paths
+
+Compares the original path (ORM objects validated one by one through
+ItemResponse, then encoded by jsonable_encoder) with the fast path
+(column tuples encoded straight to JSON bytes) on the same page.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+# ANSI color codes
+COLORS = {
+    'GREEN': '\033[32m',
+    'YELLOW': '\033[33m',
+    'RED': '\033[31m',
+    'BLUE': '\033[34m',
+    'CYAN': '\033[36m',
+    'MAGENTA': '\033[35m',
+    'RESET': '\033[0m'
+}
+
+def colorize(text, color):
+    """
+    Add color to the given text
+
+    Args:
+        text: Text to colorize
+        color: Color to use from COLORS dict
+
+    Returns:
+        Colorized text string
+    """
+    return f"{COLORS[color]}{text}{COLORS['RESET']}"
+
+
+def setup_database(rows, description_length):
+    """
+    Create an in-memory database filled with items
+
+    Args:
+        rows: Number of items to insert
+        description_length: Length of each item description
+
+    Returns:
+        Session: Session bound to the database
+    """
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import Session
+    from src.database import Base
+    from src.models import Item
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    db = Session(engine)
+    db.execute(insert(Item), [
+        {"name": f"Item {i}", "description": ("lorem ipsum " * description_length)[:description_length]}
+        for i in range(rows)
+    ])
+    db.commit()
+    return db
+
+
+def bench_serialization(limit=100, iterations=300, description_length=200):
+    """
+    Time both serialization paths on one page of items
+
+    Args:
+        limit: Page size
+        iterations: Number of pages serialized per path
+        description_length: Length of each item description
+
+    Returns:
+        dict: Milliseconds per page for each path and the speedup
+    """
+    from fastapi.responses import JSONResponse
+    from fastapi.routing import serialize_response
+    from fastapi.utils import create_response_field
+    from src import crud, serialization
+    from src.app import ItemResponse
+    from src.models import Item
+    from src.serialization import FastJSONResponse, rows_to_dicts
+
+    db = setup_database(limit, description_length)
+    field = create_response_field(name="Response_Read_Items", type_=List[ItemResponse])
+
+    async def legacy_page():
+        items = db.query(Item).offset(0).limit(limit).all()
+        content = await serialize_response(field=field, response_content=items)
+        return JSONResponse(content).body
+
+    async def fast_page():
+        rows, _, _ = crud.list_items(db, limit=limit)
+        return FastJSONResponse(rows_to_dicts(rows)).body
+
+    async def timed(page):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await page()
+        return (time.perf_counter() - start) * 1000 / iterations
+
+    async def run():
+        assert await legacy_page() == await fast_page(), "paths disagree"
+        return await timed(legacy_page), await timed(fast_page)
+
+    legacy_ms, fast_ms = asyncio.run(run())
+    db.close()
+    return {
+        "encoder": "orjson" if serialization.get_orjson() is not None else "json",
+        "legacy_ms": legacy_ms,
+        "fast_ms": fast_ms,
+        "speedup": legacy_ms / fast_ms,
+    }
+
+
+if __name__ == "__main__":
+    # Change to project root directory
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.insert(0, os.getcwd())
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--limit", type=int, default=100, help="page size")
+    parser.add_argument("--iterations", type=int, default=300, help="pages per path")
+    parser.add_argument("--description-length", type=int, default=200,
+                        help="characters per item description")
+    args = parser.parse_args()
+
+    print(colorize("\n" + "="*50, 'CYAN'))
+    print(colorize("SERIALIZATION BENCHMARK".center(50), 'CYAN'))
+    print(colorize("="*50 + "\n", 'CYAN'))
+
+    result = bench_serialization(args.limit, args.iterations, args.description_length)
+    print(colorize(f"Encoder: {result['encoder']}, page size: {args.limit}", 'BLUE'))
+    print(f"ORM + ItemResponse validation: {result['legacy_ms']:8.3f} ms/page")
+    print(f"Column tuples + fast encoder:  {result['fast_ms']:8.3f} ms/page")
+    print(colorize(f"Speedup: {result['speedup']:.1f}x", 'GREEN'))
@@ -4,6 +4,8 @@
 Script to run the FastAPI application
 """
 
+import argparse
+import importlib.util
 import os
 import sys
 import uvicorn
@@ -34,14 +36,110 @@ def colorize(text, color):
     return f"{COLORS[color]}{text}{COLORS['RESET']}"
 
 
-def run_api(host="127.0.0.1", port=8000, reload=True):
+def fastest_available(preferred, fallback):
+    """
+    Pick an optional speedup module when it is installed
+    
+    Args:
+        preferred: Name of the optional module
+        fallback: Name to use when it is missing
+    
+    Returns:
+        str: Implementation name for uvicorn
+    """
+    return preferred if importlib.util.find_spec(preferred) is not None else fallback
+
+
+def prepare_database():
+    """
+    Create the schema once before the workers start
+    
+    Workers would otherwise all race to create it on startup. The engine
+    used here is disposed of before any worker exists, and workers are
+    started as fresh processes, so none of them inherits a connection.
+    """
+    from src import database, models
+    
+    if database.DATABASE_CREATE_SCHEMA:
+        engine = database.create_db_engine()
+        models.Base.metadata.create_all(bind=engine)
+        engine.dispose()
+    # Read by the workers when they import src.database
+    os.environ["DATABASE_CREATE_SCHEMA"] = "0"
+
+
+def prepare_cache(workers, per_worker_cache=False):
+    """
+    Turn off the in-process item cache when several workers would each keep one
+    
+    An item written through one worker is only invalidated in that
+    worker's cache, so the others would serve the old body and answer 304
+    to its old ETag until the entry expires. A shared cache (ITEM_CACHE_URL)
+    is invalidated for every worker and is kept.
+    
+    Args:
+        workers: Number of worker processes
+        per_worker_cache: Keep the in-process cache anyway, accepting
+            staleness up to ITEM_CACHE_TTL
+    """
+    from src import cache
+    
+    if workers <= 1 or cache.ITEM_CACHE_URL or cache.ITEM_CACHE_SIZE <= 0:
+        return
+    if per_worker_cache:
+        print(colorize(f"Warning: each worker keeps its own item cache; reads may be stale "
+                       f"for up to {cache.ITEM_CACHE_TTL:g}s after a write", 'RED'))
+        return
+    print(colorize("Item cache disabled: set ITEM_CACHE_URL to share one between workers, "
+                   "or pass --per-worker-cache", 'YELLOW'))
+    # Read by the workers when they import src.cache
+    os.environ["ITEM_CACHE_SIZE"] = "0"
+
+
+def prepare_archiver(workers):
+    """
+    Archive from the supervisor process only when several workers run
+    
+    Each worker would otherwise start its own archiver, and they would
+    race to move the same rows. Workers get ITEM_ARCHIVE_INTERVAL=0 and
+    this process archives from a daemon thread instead. It invalidates a
+    shared cache (ITEM_CACHE_URL); per-worker caches keep an archived item,
+    already inactive, until it expires.
+    
+    Args:
+        workers: Number of worker processes
+    """
+    from src import archive, cache, database
+    
+    if workers <= 1 or archive.ITEM_ARCHIVE_INTERVAL <= 0:
+        return
+    on_chunk = None
+    if cache.ITEM_CACHE_URL:
+        shared_cache = cache.ItemCache(cache.create_backend())
+        on_chunk = lambda item_ids: shared_cache.invalidate(*item_ids)
+    archive.ItemArchiver(database.SessionLocal, on_chunk=on_chunk).start_thread()
+    print(colorize(f"Archiving from the supervisor every {archive.ITEM_ARCHIVE_INTERVAL:g}s", 'YELLOW'))
+    # Read by the workers when they import src.archive
+    os.environ["ITEM_ARCHIVE_INTERVAL"] = "0"
+
+
+def run_api(host="127.0.0.1", port=8000, reload=True, production=False, workers=None,
+            backlog=2048, timeout_keep_alive=5, limit_concurrency=None,
+            timeout_graceful_shutdown=30, per_worker_cache=False):
     """
     Run the FastAPI application
     
     Args:
         host: Host to bind the server to
         port: Port to bind the server to
-        reload: Whether to reload the server on code changes
+        reload: Whether to reload the server on code changes (development only)
+        production: Whether to run several workers without reload
+        workers: Number of worker processes in production, CPU count by default
+        backlog: Maximum number of pending connections
+        timeout_keep_alive: Seconds an idle keep-alive connection stays open
+        limit_concurrency: Connections or tasks per worker before answering 503
+        timeout_graceful_shutdown: Seconds in-flight requests get on shutdown
+        per_worker_cache: Keep the in-process item cache with several workers
     """
     print(colorize("\n" + "="*50, 'CYAN'))
     print(colorize("STARTING API SERVER".center(50), 'CYAN'))
@@ -58,15 +156,77 @@ def run_api(host="127.0.0.1", port=8000, reload=True):
     print(colorize(f"http://{host}:{port}/docs", 'BLUE'))
     print(colorize(f"http://{host}:{port}/redoc", 'BLUE'))
     
-    # Run the server
+    if not production:
+        # Run the server
+        uvicorn.run(
+            "src.app:app",
+            host=host,
+            port=port,
+            reload=reload,
+            log_level="info"
+        )
+        return
+    
+    workers = workers or os.cpu_count() or 1
+    loop = fastest_available("uvloop", "asyncio")
+    http = fastest_available("httptools", "h11")
+    print(colorize(f"Production mode: {workers} workers, {loop} loop, {http} parser", 'YELLOW'))
+    if workers > 1:
+        print(colorize("/metrics and /cache/stats report the worker serving the request", 'YELLOW'))
+    
+    prepare_database()
+    prepare_cache(workers, per_worker_cache)
+    prepare_archiver(workers)
+    
+    # Workers are spawned, not forked, and import the app themselves
     uvicorn.run(
         "src.app:app",
         host=host,
         port=port,
-        reload=reload,
-        log_level="info"
+        workers=workers,
+        loop=loop,
+        http=http,
+        reload=False,
+        backlog=backlog,
+        timeout_keep_alive=timeout_keep_alive,
+        limit_concurrency=limit_concurrency,
+        timeout_graceful_shutdown=timeout_graceful_shutdown,
+        access_log=False,
+        log_level="warning",
     )
 
 
 if __name__ == "__main__":
-    run_api()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="host to bind to")
+    parser.add_argument("--port", type=int, default=8000, help="port to bind to")
+    parser.add_argument("--no-reload", action="store_true",
+                        help="do not reload on code changes (development mode)")
+    parser.add_argument("--production", action="store_true",
+                        help="run several workers, without reload")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes in production mode (default: CPU count)")
+    parser.add_argument("--backlog", type=int, default=2048,
+                        help="maximum number of pending connections")
+    parser.add_argument("--timeout-keep-alive", type=int, default=5,
+                        help="seconds an idle keep-alive connection stays open")
+    parser.add_argument("--limit-concurrency", type=int, default=None,
+                        help="connections per worker before answering 503")
+    parser.add_argument("--timeout-graceful-shutdown", type=int, default=30,
+                        help="seconds in-flight requests get to finish on shutdown")
+    parser.add_argument("--per-worker-cache", action="store_true",
+                        help="keep the in-process item cache with several workers")
+    args = parser.parse_args()
+
+    run_api(
+        host=args.host,
+        port=args.port,
+        reload=not args.no_reload,
+        production=args.production,
+        workers=args.workers,
+        backlog=args.backlog,
+        timeout_keep_alive=args.timeout_keep_alive,
+        limit_concurrency=args.limit_concurrency,
+        timeout_graceful_shutdown=args.timeout_graceful_shutdown,
+        per_worker_cache=args.per_worker_cache,
+    )
@@ -4,23 +4,70 @@
 FastAPI application for interview environment
 """
 
-from typing import List, Optional
-from fastapi import FastAPI, Depends, HTTPException, status
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Literal, Optional
+from urllib.parse import urlencode
+from fastapi import Body, FastAPI, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
 from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
-from .database import get_db, engine
-from . import models
+from .database import DATABASE_CREATE_SCHEMA, AnySession, SessionLocal, get_db, get_engine, run_db
+from . import crud, models
+from .archive import ITEM_ARCHIVE_INTERVAL, ItemArchiver
+from .coalescer import ITEM_WRITE_COALESCE, WriteCoalescer
+from .compression import COMPRESSION_ENABLED, CompressionMiddleware
+from .cache import item_cache
+from .etag import if_none_match, item_etag, list_etag, partial_etag
+from .bulk import DEFAULT_CHUNK_SIZE, BulkLoader, LineTooLongError, NDJSONSplitter
+from .export import DEFAULT_BATCH_SIZE, MEDIA_TYPES, export_items
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, METRICS_ENABLED, MetricsMiddleware, registry
+from .pagination import CursorError
+from .search import search_items
+from .serialization import ITEM_FIELDS, FastJSONResponse, dumps, parse_fields, rows_to_dicts
+
+# Moves soft-deleted items out of the items table in the background
+archiver = ItemArchiver(
+    SessionLocal, ITEM_ARCHIVE_INTERVAL,
+    on_chunk=lambda item_ids: item_cache.invalidate(*item_ids),
+)
+
+# Batches concurrent item creations into shared transactions, when enabled
+write_coalescer = WriteCoalescer(SessionLocal) if ITEM_WRITE_COALESCE else None
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Prepare the database and run the background tasks of the application
+    while it serves
+    
+    Args:
+        app: FastAPI application
+    """
+    if DATABASE_CREATE_SCHEMA:
+        # Create tables in the database
+        await run_in_threadpool(models.Base.metadata.create_all, bind=get_engine())
+    if archiver.interval > 0:
+        archiver.start()
+    try:
+        yield
+    finally:
+        await archiver.stop()
+        if write_coalescer is not None:
+            await write_coalescer.close()
 
-# Create tables in the database
-models.Base.metadata.create_all(bind=engine)
 
 # Create FastAPI app
 app = FastAPI(
     title="Interview API",
     description="FastAPI application for technical interviews",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -30,8 +77,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Link", "X-Next-Cursor", "X-Prev-Cursor"],
 )
 
+# Compress responses for clients that accept gzip, deflate or brotli
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# Record request latency and SQL statement metrics, served at /metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 
 # Pydantic models for request/response
 class ItemBase(BaseModel):
@@ -49,11 +105,31 @@ class ItemCreate(ItemBase):
 class ItemResponse(ItemBase):
     """Item response schema"""
     id: int
-    created_at: str
-    updated_at: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
 
     class Config:
         orm_mode = True
+        from_attributes = True
+
+
+class BulkItemError(BaseModel):
+    """Bulk ingestion error for a single payload"""
+    index: int
+    error: str
+
+
+class BulkItemResult(BaseModel):
+    """Bulk ingestion result schema"""
+    created: int
+    ids: List[int]
+    errors: List[BulkItemError]
+
+
+class BulkDeleteResult(BaseModel):
+    """Bulk deletion result schema"""
+    deleted: int
+    soft: bool
 
 
 @app.get("/")
@@ -67,28 +143,143 @@ def read_root():
     return {"message": "Welcome to the Interview API"}
 
 
+def _page_link(request, rel, **params):
+    """
+    Build a Link header entry to another page of the same listing
+    """
+    query = {
+        key: value for key, value in request.query_params.items()
+        if key not in ("skip", "after", "before")
+    }
+    query.update(params)
+    return f'<?{urlencode(query)}>; rel="{rel}"'
+
+
+def _selected_fields(fields):
+    """
+    Parse the `fields` query parameter, rejecting unknown fields
+    """
+    try:
+        return parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @app.get("/items/", response_model=List[ItemResponse])
-def read_items(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def read_items(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[str] = None,
+    before: Optional[str] = None,
+    order_by: Optional[Literal["id", "created_at", "name"]] = None,
+    order: Literal["asc", "desc"] = "asc",
+    is_active: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    name_prefix: Optional[str] = Query(None, min_length=1, max_length=100),
+    fields: Optional[str] = None,
+    db: AnySession = Depends(get_db),
+):
     """
     Get all items
     
+    Pages can be walked with `skip` (OFFSET scan) or with the opaque
+    `after`/`before` cursors returned in the `X-Next-Cursor` and
+    `X-Prev-Cursor` headers, which seek on an index so every page costs
+    the same however deep it is.
+    
+    Items can be filtered by `is_active`, by creation time and by name
+    prefix. Each filter is served by an index in the order it lists items
+    in: a name prefix lists by name and a creation time range by
+    created_at, which is also the default ordering for those filters.
+    
+    Responses carry an ETag derived from the items table version; a
+    request whose `If-None-Match` still matches gets a 304 without the
+    page being queried.
+    
+    The page is selected as column tuples and encoded straight to JSON,
+    skipping ORM loading and per-item response model validation. With
+    `fields`, e.g. `fields=id,name`, only those columns are read and
+    returned, so narrow listings do not load the descriptions.
+    
     Args:
+        request: Incoming request, for the query string and If-None-Match
         skip: Number of items to skip
         limit: Maximum number of items to return
+        after: Cursor of the item preceding the page
+        before: Cursor of the item following the page
+        order_by: Ordering, by id, creation time or name
+        order: Ordering direction
+        is_active: Only items with this active flag
+        created_after: Only items created at or after this time
+        created_before: Only items created before this time
+        name_prefix: Only items whose name starts with this (case-sensitive)
+        fields: Comma separated fields to return, by default all of them
         db: Database session
         
     Returns:
         List[Item]: List of items
+        
+    Raises:
+        HTTPException: If the cursor is invalid or combined with skip, if
+        the filters cannot be served with the requested ordering, or if a
+        field is unknown
     """
-    items = db.query(models.Item).offset(skip).limit(limit).all()
-    return items
+    selected = _selected_fields(fields)
+    if after is not None and before is not None:
+        raise HTTPException(status_code=400, detail="Use either after or before, not both")
+    if skip and (after is not None or before is not None):
+        raise HTTPException(status_code=400, detail="skip cannot be combined with a cursor")
+    try:
+        order_by = crud.resolve_order_by(
+            order_by, name_prefix,
+            created_range=created_after is not None or created_before is not None
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    # Read the version before the page so the ETag can only be older than
+    # the data it labels, never newer
+    version = await run_db(db, crud.get_table_version)
+    etag = None
+    if version is not None:
+        etag = list_etag(version, sorted(request.query_params.multi_items()))
+        if if_none_match(request.headers.get("if-none-match"), etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    try:
+        rows, next_cursor, prev_cursor = await run_db(
+            db, crud.list_items, order_by=order_by, limit=limit,
+            skip=skip, after=after, before=before, descending=order == "desc",
+            is_active=is_active, created_after=created_after,
+            created_before=created_before, name_prefix=name_prefix,
+            fields=selected
+        )
+    except CursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    headers = {}
+    links = []
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor
+        links.append(_page_link(request, "next", after=next_cursor))
+    if prev_cursor is not None:
+        headers["X-Prev-Cursor"] = prev_cursor
+        links.append(_page_link(request, "prev", before=prev_cursor))
+    if links:
+        headers["Link"] = ", ".join(links)
+    if etag is not None:
+        headers["ETag"] = etag
+    return FastJSONResponse(rows_to_dicts(rows, selected), headers=headers)
 
 
 @app.post("/items/", response_model=ItemResponse, status_code=status.HTTP_201_CREATED)
-def create_item(item: ItemCreate, db: Session = Depends(get_db)):
+async def create_item(item: ItemCreate, db: AnySession = Depends(get_db)):
     """
     Create a new item
     
+    The item is inserted and read back with a single statement, and its
+    columns encoded straight to JSON. With write coalescing enabled, the
+    insert is committed together with those of concurrent requests.
+    
     Args:
         item: Item data
         db: Database session
@@ -96,49 +287,303 @@ def create_item(item: ItemCreate, db: Session = Depends(get_db)):
     Returns:
         Item: Created item
     """
-    db_item = models.Item(**item.dict())
-    db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
-    return db_item
+    if write_coalescer is not None:
+        row = await write_coalescer.create_item(item.dict())
+    else:
+        row = await run_db(db, crud.create_item, item.dict())
+    # A new id cannot be cached yet, so there is nothing to invalidate
+    return FastJSONResponse(rows_to_dicts([row])[0], status_code=status.HTTP_201_CREATED)
+
+
+@app.post("/items/bulk", response_model=BulkItemResult)
+async def create_items_bulk(
+    request: Request,
+    chunk_size: int = Query(DEFAULT_CHUNK_SIZE, ge=1, le=10000),
+    db: AnySession = Depends(get_db),
+):
+    """
+    Create many items at once
+    
+    The body is either a JSON array of items or, with an
+    `application/x-ndjson` content type, one item per line. NDJSON bodies
+    are consumed as they stream in. Items are inserted `chunk_size` at a
+    time, one transaction per chunk; invalid items are reported by their
+    position without aborting the rest of the batch.
+    
+    Args:
+        request: Incoming request carrying the items
+        chunk_size: Number of items inserted per transaction
+        db: Database session
+        
+    Returns:
+        dict: Created item ids and per-item errors
+        
+    Raises:
+        HTTPException: If a JSON body is not an array, or an NDJSON line
+            is longer than MAX_LINE_BYTES (413)
+    """
+    loader = BulkLoader(ItemCreate, chunk_size)
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        splitter = NDJSONSplitter()
+        async for chunk in request.stream():
+            try:
+                lines = splitter.feed(chunk)
+            except LineTooLongError as exc:
+                # Chunks already flushed stay committed
+                item_cache.invalidate(*loader.ids)
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"{exc}; {len(loader.ids)} items were created before it",
+                )
+            for line in lines:
+                loader.add_line(line)
+                if loader.full:
+                    await run_db(db, loader.flush)
+        for line in splitter.close():
+            loader.add_line(line)
+    else:
+        try:
+            documents = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        if not isinstance(documents, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of items")
+        for document in documents:
+            loader.add(document)
+            if loader.full:
+                await run_db(db, loader.flush)
+    await run_db(db, loader.flush)
+    item_cache.invalidate(*loader.ids)
+    return loader.result()
+
+
+@app.delete("/items/", response_model=BulkDeleteResult)
+async def delete_items(
+    ids: Optional[List[int]] = Body(None),
+    is_active: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    name_prefix: Optional[str] = Query(None, min_length=1, max_length=100),
+    soft: bool = False,
+    db: AnySession = Depends(get_db),
+):
+    """
+    Delete many items at once
+    
+    Items are selected by a JSON array of `ids` in the body and/or the
+    same filters as the listing, and removed with a single DELETE
+    statement. The ids travel in the body because a query string of
+    MAX_DELETE_IDS ids would not fit in the request head. With `soft`, they
+    are deactivated with a single UPDATE instead, and moved to the archive
+    table later by the background archiver.
+    
+    Args:
+        ids: IDs of the items to delete
+        is_active: Only items with this active flag
+        created_after: Only items created at or after this time
+        created_before: Only items created before this time
+        name_prefix: Only items whose name starts with this (case-sensitive)
+        soft: Whether to deactivate the items instead of deleting them
+        db: Database session
+        
+    Returns:
+        dict: Number of items deleted or deactivated
+        
+    Raises:
+        HTTPException: If no item selection is given or too many ids are
+    """
+    conditions = crud.item_filters(is_active, created_after, created_before, name_prefix)
+    if ids is not None:
+        if len(ids) > crud.MAX_DELETE_IDS:
+            raise HTTPException(
+                status_code=400, detail=f"At most {crud.MAX_DELETE_IDS} ids per request"
+            )
+        conditions.append(models.Item.id.in_(ids))
+    if not conditions:
+        raise HTTPException(status_code=400, detail="Select the items to delete by ids or filters")
+    item_ids = await run_db(db, crud.delete_items, conditions, soft=soft)
+    item_cache.invalidate(*item_ids)
+    return {"deleted": len(item_ids), "soft": soft}
+
+
+@app.get("/items/export", response_class=StreamingResponse)
+async def export_items_table(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=50000),
+    db: AnySession = Depends(get_db),
+):
+    """
+    Export all items as NDJSON or CSV
+    
+    Rows are read through a server-side cursor and written as they are
+    fetched, so memory use stays constant whatever the table size.
+    
+    Args:
+        format: Output format, `ndjson` or `csv`
+        batch_size: Number of rows fetched and written at a time
+        db: Database session
+        
+    Returns:
+        StreamingResponse: The exported items
+    """
+    return StreamingResponse(
+        export_items(db, format, batch_size),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="items.{format}"'},
+    )
+
+
+@app.get("/items/search", response_model=List[ItemResponse])
+async def search_items_text(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = None,
+    prefix: bool = True,
+    fields: Optional[str] = None,
+    db: AnySession = Depends(get_db),
+):
+    """
+    Search items by name and description
+    
+    Results come from the full-text index, best matches first, with name
+    matches ranked above description matches. Every term must match; the
+    last one also matches as a prefix unless `prefix` is false. Further
+    pages are fetched with the cursor returned in `X-Next-Cursor`.
+    `fields` narrows the returned fields, as for listings.
+    
+    Args:
+        q: Search terms
+        limit: Maximum number of items to return
+        after: Cursor of the item preceding the page
+        prefix: Whether the last term matches as a prefix
+        fields: Comma separated fields to return, by default all of them
+        db: Database session
+        
+    Returns:
+        List[Item]: Matching items
+        
+    Raises:
+        HTTPException: If the cursor is invalid or a field is unknown
+    """
+    selected = _selected_fields(fields)
+    try:
+        rows, next_cursor = await run_db(
+            db, search_items, q, limit=limit, after=after, prefix=prefix,
+            fields=selected
+        )
+    except CursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    headers = {}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor
+    return FastJSONResponse(rows_to_dicts(rows, selected), headers=headers)
 
 
 @app.get("/items/{item_id}", response_model=ItemResponse)
-def read_item(item_id: int, db: Session = Depends(get_db)):
+async def read_item(
+    item_id: int,
+    request: Request,
+    fields: Optional[str] = None,
+    db: AnySession = Depends(get_db),
+):
     """
     Get item by ID
     
+    The item is served from the item cache when it holds a fresh copy.
+    Responses carry an ETag; when `If-None-Match` still matches, a 304 is
+    returned after at most a two-column version lookup.
+    
+    With `fields`, only those fields are returned: they are cut from the
+    cached item, or else read alone from the database. Each selection has
+    its own ETag.
+    
     Args:
         item_id: Item ID
+        request: Incoming request, for If-None-Match
+        fields: Comma separated fields to return, by default all of them
         db: Database session
         
     Returns:
         Item: Item with the specified ID
         
     Raises:
-        HTTPException: If item not found
+        HTTPException: If item not found or a field is unknown
     """
-    db_item = db.query(models.Item).filter(models.Item.id == item_id).first()
-    if db_item is None:
-        raise HTTPException(status_code=404, detail="Item not found")
-    return db_item
+    selected = _selected_fields(fields)
+    partial = None if selected == ITEM_FIELDS else selected
+    not_modified = request.headers.get("if-none-match")
+    generation = item_cache.generation
+    cached = item_cache.get(item_id)
+    if cached is None and not_modified:
+        version = await run_db(db, crud.get_item_version, item_id)
+        if version is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        etag = partial_etag(item_etag(item_id, *version), partial)
+        if if_none_match(not_modified, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    if cached is None and partial is not None:
+        result = await run_db(db, crud.get_item_fields, item_id, partial)
+        if result is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        row, created_at, updated_at = result
+        etag = partial_etag(item_etag(item_id, created_at, updated_at), partial)
+        body = dumps(rows_to_dicts([row], partial)[0])
+    elif cached is None:
+        db_item = await run_db(db, crud.get_item, item_id)
+        if db_item is None:
+            raise HTTPException(status_code=404, detail="Item not found")
+        etag = item_etag(db_item.id, db_item.created_at, db_item.updated_at)
+        body = JSONResponse(jsonable_encoder(ItemResponse.from_orm(db_item))).body
+        item_cache.set(item_id, etag, body, generation)
+    else:
+        etag, body = cached
+        etag = partial_etag(etag, partial)
+        if if_none_match(not_modified, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        if partial is not None:
+            body = dumps({field: value for field, value in json.loads(body).items()
+                          if field in partial})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 @app.delete("/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_item(item_id: int, db: Session = Depends(get_db)):
+async def delete_item(item_id: int, soft: bool = False, db: AnySession = Depends(get_db)):
     """
     Delete item by ID
     
     Args:
         item_id: Item ID
+        soft: Whether to deactivate the item instead of deleting it
         db: Database session
         
     Raises:
         HTTPException: If item not found
     """
-    db_item = db.query(models.Item).filter(models.Item.id == item_id).first()
-    if db_item is None:
+    if not await run_db(db, crud.delete_item, item_id, soft=soft):
         raise HTTPException(status_code=404, detail="Item not found")
-    db.delete(db_item)
-    db.commit()
+    item_cache.invalidate(item_id)
     return None
+
+
+@app.get("/cache/stats")
+def read_cache_stats():
+    """
+    Get item cache counters
+    
+    Returns:
+        dict: Hits, misses, hit ratio, size and evictions
+    """
+    return item_cache.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    """
+    Get request and database metrics in the Prometheus text format
+    
+    Returns:
+        Response: Latency histograms per route, requests in progress, and
+        SQL statement counts and durations
+    """
+    return Response(content=registry.render(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Archiving of soft-deleted items
+
+Soft deletes only clear `is_active`, which keeps them cheap but leaves
+the rows in the items table. The archiver moves them to `items_archive`
+in small chunks, one short transaction each, so the hot table stays small
+without holding the write lock for long.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+
+from sqlalchemy import delete, insert, select
+from starlette.concurrency import run_in_threadpool
+
+from . import models
+
+logger = logging.getLogger(__name__)
+
+# Seconds between archiver runs in the application (0 disables it)
+ITEM_ARCHIVE_INTERVAL = float(os.getenv("ITEM_ARCHIVE_INTERVAL", "0"))
+
+# Number of rows moved per transaction
+ITEM_ARCHIVE_CHUNK_SIZE = int(os.getenv("ITEM_ARCHIVE_CHUNK_SIZE", "500"))
+
+# Columns copied from items to items_archive
+ARCHIVED_COLUMNS = ("id", "name", "description", "is_active", "created_at", "updated_at")
+
+
+def archive_chunk(db, chunk_size=ITEM_ARCHIVE_CHUNK_SIZE):
+    """
+    Move one chunk of inactive items to the archive table
+
+    Args:
+        db: Database session
+        chunk_size: Maximum number of items to move
+
+    Returns:
+        list: IDs of the items moved
+    """
+    item_ids = db.scalars(
+        select(models.Item.id)
+        .where(models.Item.is_active == False)  # noqa: E712
+        .order_by(models.Item.id)
+        .limit(chunk_size)
+    ).all()
+    if not item_ids:
+        return []
+    columns = [getattr(models.Item, column) for column in ARCHIVED_COLUMNS]
+    db.execute(
+        insert(models.ArchivedItem).from_select(
+            list(ARCHIVED_COLUMNS),
+            select(*columns).where(models.Item.id.in_(item_ids)),
+        )
+    )
+    db.execute(delete(models.Item).where(models.Item.id.in_(item_ids)))
+    db.commit()
+    return item_ids
+
+
+def archive_inactive_items(db, chunk_size=ITEM_ARCHIVE_CHUNK_SIZE, max_chunks=None, on_chunk=None):
+    """
+    Move inactive items to the archive table, one chunk per transaction
+
+    Args:
+        db: Database session
+        chunk_size: Number of items moved per transaction
+        max_chunks: Stop after this many chunks, or None to drain the table
+        on_chunk: Called with the IDs of each chunk after it is committed
+
+    Returns:
+        int: Number of items moved
+    """
+    moved = 0
+    chunks = 0
+    while max_chunks is None or chunks < max_chunks:
+        item_ids = archive_chunk(db, chunk_size)
+        if not item_ids:
+            break
+        moved += len(item_ids)
+        chunks += 1
+        if on_chunk is not None:
+            on_chunk(item_ids)
+    return moved
+
+
+class ItemArchiver:
+    """
+    Background task archiving inactive items at a fixed interval
+    """
+
+    def __init__(self, session_factory, interval=ITEM_ARCHIVE_INTERVAL,
+                 chunk_size=ITEM_ARCHIVE_CHUNK_SIZE, on_chunk=None):
+        """
+        Args:
+            session_factory: Callable returning a new blocking Session
+            interval: Seconds between runs
+            chunk_size: Number of items moved per transaction
+            on_chunk: Called with the IDs of each archived chunk
+        """
+        self.session_factory = session_factory
+        self.interval = interval
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+        self._task = None
+
+    def run_once(self):
+        """
+        Archive every inactive item
+
+        Returns:
+            int: Number of items moved
+        """
+        with self.session_factory() as db:
+            return archive_inactive_items(db, self.chunk_size, on_chunk=self.on_chunk)
+
+    def _run_logged(self):
+        """
+        Archive every inactive item, logging the outcome instead of raising
+        """
+        try:
+            moved = self.run_once()
+        except Exception:
+            logger.exception("Item archiving failed")
+        else:
+            if moved:
+                logger.info("Archived %d inactive items", moved)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await run_in_threadpool(self._run_logged)
+
+    def start(self):
+        """
+        Start archiving in the background of the running event loop
+        """
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def start_thread(self):
+        """
+        Start archiving from a daemon thread, for a process that does not
+        run an event loop, such as the supervisor of several workers
+
+        Returns:
+            threading.Event: Set it to stop after the current run
+        """
+        stopped = threading.Event()
+
+        def run():
+            while not stopped.wait(self.interval):
+                self._run_logged()
+
+        threading.Thread(target=run, name="item-archiver", daemon=True).start()
+        return stopped
+
+    async def stop(self):
+        """
+        Stop the background task, letting a running chunk finish
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
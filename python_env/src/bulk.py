@@ -0,0 +1,219 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Batched item ingestion helpers
+"""
+
+import json
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from . import models
+
+# Default number of rows inserted per transaction
+DEFAULT_CHUNK_SIZE = 1000
+
+# Longest NDJSON line buffered while waiting for its newline, in bytes
+MAX_LINE_BYTES = 1024 * 1024
+
+
+class LineTooLongError(ValueError):
+    """
+    Raised when an NDJSON line grows past the maximum line length
+    """
+
+
+def format_validation_error(exc):
+    """
+    Flatten a pydantic ValidationError into a single message
+
+    Args:
+        exc: ValidationError raised by the schema
+
+    Returns:
+        str: Human readable error message
+    """
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+class NDJSONSplitter:
+    """
+    Split a chunked byte stream into complete lines
+
+    Only the new chunk is searched for newlines; the partial line carried
+    over is kept as a list of pieces and joined once it is complete, so
+    the cost stays linear in the stream length however long the lines.
+    """
+
+    def __init__(self, max_line_bytes=MAX_LINE_BYTES):
+        """
+        Args:
+            max_line_bytes: Longest line accepted, in bytes
+        """
+        self.max_line_bytes = max_line_bytes
+        self._pending = []
+        self._pending_bytes = 0
+
+    def feed(self, chunk):
+        """
+        Add a chunk of the stream
+
+        Args:
+            chunk: Bytes received from the stream
+
+        Returns:
+            list: Lines completed by this chunk
+
+        Raises:
+            LineTooLongError: If a line exceeds max_line_bytes
+        """
+        *lines, rest = chunk.split(b"\n")
+        if lines and self._pending:
+            lines[0] = b"".join(self._pending) + lines[0]
+            self._pending, self._pending_bytes = [], 0
+        if rest:
+            self._pending.append(rest)
+            self._pending_bytes += len(rest)
+        if self._pending_bytes > self.max_line_bytes or any(
+                len(line) > self.max_line_bytes for line in lines):
+            raise LineTooLongError(f"Lines are limited to {self.max_line_bytes} bytes")
+        return lines
+
+    def close(self):
+        """
+        Flush the trailing line of the stream
+
+        Returns:
+            list: The last line, if the stream did not end with a newline
+        """
+        lines = [b"".join(self._pending)]
+        self._pending, self._pending_bytes = [], 0
+        return lines
+
+
+class BulkLoader:
+    """
+    Validate item payloads and insert them in chunked transactions
+
+    Each chunk is inserted with a single executemany INSERT ... RETURNING
+    in its own transaction. If a chunk fails, it is retried row by row so
+    only the offending rows are reported and the rest of the batch is kept.
+    """
+
+    def __init__(self, schema, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Args:
+            schema: Pydantic model used to validate each payload
+            chunk_size: Number of rows per transaction
+        """
+        self.schema = schema
+        self.chunk_size = chunk_size
+        self.ids = []
+        self.errors = []
+        self._count = 0
+        self._pending = []
+
+    @property
+    def full(self):
+        """
+        bool: Whether a chunk is ready to be flushed
+        """
+        return len(self._pending) >= self.chunk_size
+
+    def add(self, document):
+        """
+        Validate a decoded payload and queue it for insertion
+
+        Args:
+            document: Decoded JSON document
+
+        Returns:
+            bool: Whether the payload was valid
+        """
+        index = self._count
+        self._count += 1
+        if not isinstance(document, dict):
+            self.errors.append({"index": index, "error": "Expected a JSON object"})
+            return False
+        try:
+            item = self.schema(**document)
+        except ValidationError as exc:
+            self.errors.append({"index": index, "error": format_validation_error(exc)})
+            return False
+        self._pending.append((index, item.dict()))
+        return True
+
+    def add_line(self, line):
+        """
+        Decode one NDJSON line and queue it for insertion
+
+        Blank lines are ignored and do not count as payloads.
+
+        Args:
+            line: Raw line, bytes or str
+
+        Returns:
+            bool: Whether the line held a valid payload
+        """
+        if not line.strip():
+            return False
+        try:
+            document = json.loads(line)
+        except ValueError as exc:
+            self.errors.append({"index": self._count, "error": f"Invalid JSON: {exc}"})
+            self._count += 1
+            return False
+        return self.add(document)
+
+    def flush(self, db):
+        """
+        Insert all queued rows
+
+        Args:
+            db: Database session
+        """
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        statement = insert(models.Item).returning(
+            models.Item.id, sort_by_parameter_order=True
+        )
+        try:
+            ids = db.scalars(statement, [row for _, row in pending]).all()
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            self._flush_rows(db, pending)
+            return
+        self.ids.extend(ids)
+
+    def _flush_rows(self, db, pending):
+        """
+        Insert rows one at a time, recording the ones that fail
+        """
+        statement = insert(models.Item).returning(models.Item.id)
+        for index, row in pending:
+            try:
+                item_id = db.scalar(statement, row)
+                db.commit()
+            except SQLAlchemyError as exc:
+                db.rollback()
+                error = str(getattr(exc, "orig", None) or exc)
+                self.errors.append({"index": index, "error": error})
+                continue
+            self.ids.append(item_id)
+
+    def result(self):
+        """
+        Summarize the load
+
+        Returns:
+            dict: Inserted ids and per-row errors
+        """
+        self.errors.sort(key=lambda error: error["index"])
+        return {"created": len(self.ids), "ids": self.ids, "errors": self.errors}
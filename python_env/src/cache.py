@@ -0,0 +1,329 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Read-through cache for serialized item responses
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Maximum number of items kept by the in-process cache (0 disables caching)
+ITEM_CACHE_SIZE = int(os.getenv("ITEM_CACHE_SIZE", "10000"))
+
+# Seconds an entry stays valid; bounds staleness across worker processes
+ITEM_CACHE_TTL = float(os.getenv("ITEM_CACHE_TTL", "60"))
+
+# Recent invalidations remembered to reject stale fills; fills older than
+# the oldest one forgotten are dropped
+MAX_TOMBSTONES = 10000
+
+# Redis URL of a cache shared by all workers, e.g. redis://localhost:6379/0;
+# when unset each process keeps its own LRU cache
+ITEM_CACHE_URL = os.getenv("ITEM_CACHE_URL", "")
+
+
+class CacheBackend:
+    """
+    Storage interface for cached values
+    """
+
+    def get(self, key):
+        """
+        Get a value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bytes: The value, or None if absent or expired
+        """
+        raise NotImplementedError
+
+    def set(self, key, value):
+        """
+        Store a value
+
+        Args:
+            key: Cache key
+            value: Bytes to store
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        """
+        Remove a value if present
+
+        Args:
+            key: Cache key
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        """
+        Remove all values
+        """
+        raise NotImplementedError
+
+    def __len__(self):
+        return 0
+
+
+class NullBackend(CacheBackend):
+    """
+    Backend that stores nothing, used when caching is disabled
+    """
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+
+class LRUBackend(CacheBackend):
+    """
+    Bounded in-process cache with least-recently-used eviction and TTL
+    """
+
+    def __init__(self, maxsize=ITEM_CACHE_SIZE, ttl=ITEM_CACHE_TTL, clock=time.monotonic):
+        """
+        Args:
+            maxsize: Maximum number of entries
+            ttl: Seconds an entry stays valid
+            clock: Monotonic time source
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.evictions = 0
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SharedBackend(CacheBackend):
+    """
+    Backend shared by all workers, on top of a Redis-style client
+
+    Any client exposing `get(key)`, `set(key, value, ex=seconds)`,
+    `delete(*keys)` and `scan_iter(match=pattern)` works, e.g.
+    `redis.Redis`. Calls are made inline, so the client should be local
+    and fast.
+    """
+
+    def __init__(self, client, ttl=ITEM_CACHE_TTL, prefix="item:"):
+        """
+        Args:
+            client: Key/value store client
+            ttl: Seconds an entry stays valid
+            prefix: Namespace prepended to every key
+        """
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(f"{self.prefix}{key}")
+
+    def set(self, key, value):
+        self.client.set(f"{self.prefix}{key}", value, ex=max(1, int(self.ttl)))
+
+    def delete(self, key):
+        self.client.delete(f"{self.prefix}{key}")
+
+    def clear(self):
+        # Only the keys under our prefix, with glob characters escaped
+        pattern = "".join(f"\\{char}" if char in "*?[]\\" else char for char in self.prefix)
+        keys = []
+        for key in self.client.scan_iter(match=f"{pattern}*"):
+            keys.append(key)
+            if len(keys) >= 1000:
+                self.client.delete(*keys)
+                keys = []
+        if keys:
+            self.client.delete(*keys)
+
+
+class ItemCache:
+    """
+    Read-through cache of serialized ItemResponse bodies keyed by item id
+
+    Each entry holds the body and its ETag, stored together as
+    `etag + b"\\n" + body` so any bytes backend can hold them.
+
+    Writers call `invalidate` after committing, which leaves a tombstone
+    with the generation of the write. A reader that missed only stores
+    its result if the item got no tombstone while it was reading the
+    database, so a concurrent delete cannot be undone by a stale fill,
+    while writes to other items leave the fill alone.
+    """
+
+    def __init__(self, backend, max_tombstones=MAX_TOMBSTONES):
+        """
+        Args:
+            backend: CacheBackend storing the entries
+            max_tombstones: Number of recent invalidations remembered
+        """
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.max_tombstones = max_tombstones
+        self._generation = 0
+        # Generation of the last invalidation of each recently written item
+        self._tombstones = OrderedDict()
+        # Newest generation among the tombstones dropped to bound memory
+        self._forgotten = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self):
+        """
+        int: Counter bumped by every invalidation, to pass back to `set`
+        """
+        return self._generation
+
+    def get(self, item_id):
+        """
+        Look up a cached item, counting hits and misses
+
+        Args:
+            item_id: Item ID
+
+        Returns:
+            tuple: (etag, body) of the serialized item, or None on a miss
+        """
+        entry = self.backend.get(item_id)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        etag, _, body = entry.partition(b"\n")
+        return etag.decode("ascii"), body
+
+    def set(self, item_id, etag, body, generation):
+        """
+        Store an item read from the database
+
+        Args:
+            item_id: Item ID
+            etag: ETag of the item
+            body: Serialized item
+            generation: Value of `generation` taken before the read
+        """
+        with self._lock:
+            if generation < self._forgotten or self._tombstones.get(item_id, 0) > generation:
+                return
+        self.backend.set(item_id, etag.encode("ascii") + b"\n" + body)
+
+    def invalidate(self, *item_ids):
+        """
+        Drop items after they were written
+
+        Args:
+            *item_ids: IDs of the items that changed
+        """
+        with self._lock:
+            self._generation += 1
+            for item_id in item_ids:
+                self._tombstones[item_id] = self._generation
+                self._tombstones.move_to_end(item_id)
+            while len(self._tombstones) > self.max_tombstones:
+                _, generation = self._tombstones.popitem(last=False)
+                self._forgotten = max(self._forgotten, generation)
+        for item_id in item_ids:
+            self.backend.delete(item_id)
+
+    def clear(self):
+        """
+        Drop every entry and reset the counters
+        """
+        with self._lock:
+            self._generation += 1
+            self._tombstones.clear()
+            self._forgotten = self._generation
+        self.backend.clear()
+        self.hits = self.misses = 0
+
+    def stats(self):
+        """
+        Get the cache counters
+
+        Returns:
+            dict: Hits, misses, hit ratio, size and evictions
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "size": len(self.backend),
+            "evictions": getattr(self.backend, "evictions", 0),
+        }
+
+
+def create_backend(size=ITEM_CACHE_SIZE, url=ITEM_CACHE_URL):
+    """
+    Build the cache backend selected by the configuration
+
+    Args:
+        size: Maximum number of entries of the in-process cache, 0 to disable caching
+        url: Redis URL of a shared cache, or empty for the in-process cache
+
+    Returns:
+        CacheBackend: Backend for the item cache
+
+    Raises:
+        ImportError: If a shared cache is configured without the redis package
+    """
+    if size <= 0:
+        return NullBackend()
+    if url:
+        # Imported here so processes without a shared cache never load it
+        try:
+            import redis
+        except ImportError:
+            raise ImportError("ITEM_CACHE_URL requires the redis package")
+        return SharedBackend(redis.Redis.from_url(url))
+    return LRUBackend(maxsize=size)
+
+
+# Cache used by the application
+item_cache = ItemCache(create_backend())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Group commit of item creations
+
+SQLite serializes writers and every commit waits for its own sync, so
+concurrent creates committing one by one are capped at the commit rate.
+The coalescer queues the creates of concurrent requests and inserts them
+together, one transaction per batch, then hands each request its own row.
+"""
+
+import asyncio
+import os
+
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.concurrency import run_in_threadpool
+
+from . import crud
+
+# Coalesce POST /items/ writes instead of committing each one
+ITEM_WRITE_COALESCE = os.getenv("ITEM_WRITE_COALESCE", "").lower() in ("1", "true", "yes", "on")
+
+# Longest time a create waits for others to join its batch
+ITEM_WRITE_COALESCE_DELAY_MS = float(os.getenv("ITEM_WRITE_COALESCE_DELAY_MS", "5"))
+
+# Largest number of creates committed together
+ITEM_WRITE_COALESCE_MAX_ROWS = int(os.getenv("ITEM_WRITE_COALESCE_MAX_ROWS", "500"))
+
+
+class WriteCoalescer:
+    """
+    Batch concurrent item creations into shared transactions
+
+    A batch is flushed once it holds `max_rows` creates or `max_delay_ms`
+    after its first one arrived. Creates arriving while a batch is being
+    written wait for the next one, so batches grow with the load. If a
+    batch fails, its rows are retried one by one so only the callers whose
+    row is rejected get the error.
+    """
+
+    def __init__(self, session_factory, max_delay_ms=ITEM_WRITE_COALESCE_DELAY_MS,
+                 max_rows=ITEM_WRITE_COALESCE_MAX_ROWS):
+        """
+        Args:
+            session_factory: Callable returning a new blocking Session
+            max_delay_ms: Longest wait for a batch to fill, in milliseconds
+            max_rows: Largest batch
+        """
+        self.session_factory = session_factory
+        self.max_delay = max_delay_ms / 1000
+        self.max_rows = max_rows
+        self.batches = 0
+        self.rows = 0
+        self._pending = []
+        self._worker = None
+        self._closed = False
+
+    async def create_item(self, data):
+        """
+        Queue an item for insertion and wait for its batch to commit
+
+        Args:
+            data: Column values of the item
+
+        Returns:
+            Row: Created item, in ITEM_FIELDS order
+
+        Raises:
+            SQLAlchemyError: If the row itself was rejected
+            RuntimeError: If the coalescer is closed
+        """
+        if self._closed:
+            raise RuntimeError("Write coalescer is closed")
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._pending = []
+            self._ready = asyncio.Event()
+            self._full = asyncio.Event()
+            self._worker = loop.create_task(self._run())
+        future = loop.create_future()
+        self._pending.append((data, future))
+        self._ready.set()
+        if len(self._pending) >= self.max_rows:
+            self._full.set()
+        return await future
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            if not self._closed:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            batch = self._pending[:self.max_rows]
+            self._pending = self._pending[self.max_rows:]
+            if len(self._pending) < self.max_rows:
+                self._full.clear()
+            if not self._pending:
+                self._ready.clear()
+            # Callers that went away no longer need their row
+            batch = [(data, future) for data, future in batch if not future.done()]
+            if batch:
+                try:
+                    results = await run_in_threadpool(self._write, [data for data, _ in batch])
+                except Exception as exc:
+                    results = [exc] * len(batch)
+                for (_, future), result in zip(batch, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            if self._closed and not self._pending:
+                return
+
+    def _write(self, data):
+        """
+        Insert a batch, falling back to one transaction per row on failure
+
+        Args:
+            data: Column values of each item
+
+        Returns:
+            list: Created row or raised exception, per item
+        """
+        with self.session_factory() as db:
+            try:
+                results = crud.create_items(db, data)
+            except SQLAlchemyError:
+                db.rollback()
+                results = []
+                for row in data:
+                    try:
+                        results.append(crud.create_item(db, row))
+                    except SQLAlchemyError as exc:
+                        db.rollback()
+                        results.append(exc)
+        self.batches += 1
+        self.rows += len(data)
+        return results
+
+    async def close(self):
+        """
+        Write the creates still queued and stop the worker
+        """
+        self._closed = True
+        if self._worker is not None and not self._worker.done():
+            if self._worker.get_loop() is asyncio.get_running_loop():
+                self._ready.set()
+                self._full.set()
+                await self._worker
+            else:
+                self._worker.cancel()
+        self._worker = None
+
+    def stats(self):
+        """
+        Get the batching counters
+
+        Returns:
+            dict: Batches written, rows written and mean batch size
+        """
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_size": self.rows / self.batches if self.batches else 0.0,
+        }
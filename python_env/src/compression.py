@@ -0,0 +1,342 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Negotiated response compression
+
+CompressionMiddleware encodes responses with the best encoding the client
+accepts among brotli (when installed), gzip and deflate. Bodies below a
+size threshold are sent as they are, since compressing them costs more
+CPU than the bytes it saves. Streamed responses are compressed chunk by
+chunk as they are produced, without being buffered.
+"""
+
+import functools
+import importlib.util
+import os
+import zlib
+
+# Compress responses; when off the middleware is not installed
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "1").lower() in ("1", "true", "yes", "on")
+
+# Smallest complete body worth compressing, in bytes
+COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
+
+# zlib level for gzip and deflate (1-9) and brotli quality (0-11). On item
+# pages (scripts/bench_compression.py) gzip 4 is within 2% of the size of
+# gzip 6 for two thirds of the CPU, and brotli 4 matches it; higher levels
+# cost several times the CPU for a few percent
+COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", "4"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Media types worth compressing; others (images, archives) already are
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+)
+
+# brotli is only looked up here and imported on first use
+BROTLI_AVAILABLE = importlib.util.find_spec("brotli") is not None
+
+# Encodings in server preference order
+ENCODINGS = ("br", "gzip", "deflate") if BROTLI_AVAILABLE else ("gzip", "deflate")
+
+
+@functools.lru_cache(maxsize=None)
+def get_brotli():
+    """
+    Import brotli on first use, keeping it off the application import path
+
+    Returns:
+        module: brotli, or None when it is not installed
+    """
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def parse_accept_encoding(header):
+    """
+    Parse an Accept-Encoding header
+
+    Args:
+        header: Header value, e.g. `gzip;q=0.8, br`
+
+    Returns:
+        dict: Quality by lower-case coding name
+    """
+    qualities = {}
+    for part in header.split(","):
+        coding, *params = part.strip().split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def negotiate_encoding(header, encodings=ENCODINGS):
+    """
+    Pick the response encoding for an Accept-Encoding header
+
+    The client's highest quality wins; ties go to the server preference
+    order of `encodings`.
+
+    Args:
+        header: Accept-Encoding value, or None
+        encodings: Supported encodings, preferred first
+
+    Returns:
+        str: Chosen encoding, or None to send the body as is
+    """
+    if not header:
+        return None
+    qualities = parse_accept_encoding(header)
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = qualities.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+class Compressor:
+    """
+    Incremental encoder for one response body
+    """
+
+    def __init__(self, encoding, level=COMPRESSION_LEVEL, brotli_quality=COMPRESSION_BROTLI_QUALITY):
+        """
+        Args:
+            encoding: `br`, `gzip` or `deflate`
+            level: zlib compression level
+            brotli_quality: brotli quality
+        """
+        if encoding == "br":
+            self._brotli = get_brotli().Compressor(quality=brotli_quality)
+            self._zlib = None
+        else:
+            wbits = zlib.MAX_WBITS | 16 if encoding == "gzip" else zlib.MAX_WBITS
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data):
+        """
+        Encode a chunk of the body
+
+        Args:
+            data: Bytes of the body
+
+        Returns:
+            bytes: Encoded bytes ready to send, possibly empty
+        """
+        if self._zlib is not None:
+            return self._zlib.compress(data)
+        return self._brotli.process(data)
+
+    def finish(self):
+        """
+        End the body
+
+        Returns:
+            bytes: Remaining encoded bytes
+        """
+        if self._zlib is not None:
+            return self._zlib.flush()
+        return self._brotli.finish()
+
+
+def compress(data, encoding, level=COMPRESSION_LEVEL, brotli_quality=COMPRESSION_BROTLI_QUALITY):
+    """
+    Encode a complete body
+
+    Args:
+        data: Bytes of the body
+        encoding: `br`, `gzip` or `deflate`
+        level: zlib compression level
+        brotli_quality: brotli quality
+
+    Returns:
+        bytes: Encoded body
+    """
+    compressor = Compressor(encoding, level, brotli_quality)
+    return compressor.compress(data) + compressor.finish()
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses the client can decode
+
+    Responses already encoded, without a body (204, 304, HEAD) or of a
+    media type that does not compress are passed through. Compressed
+    responses get `Vary: Accept-Encoding`, and their ETag is made weak
+    since the bytes differ from the identity representation. A 304
+    answering that weak ETag carries it back in the same form.
+    """
+
+    def __init__(self, app, minimum_size=COMPRESSION_MINIMUM_SIZE, level=COMPRESSION_LEVEL,
+                 brotli_quality=COMPRESSION_BROTLI_QUALITY):
+        """
+        Args:
+            app: ASGI application to wrap
+            minimum_size: Smallest complete body compressed, in bytes
+            level: zlib compression level for gzip and deflate
+            brotli_quality: brotli quality
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        accept_encoding = None
+        validators = None
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+            elif name == b"if-none-match":
+                validators = value
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None and validators is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+        compressor = None
+
+        async def send_compressed(message):
+            nonlocal start, compressor
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            if start is not None:
+                # First body message: decide whether to compress
+                response_start, start = start, None
+                body = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if response_start["status"] == 304 and validators is not None:
+                    headers = _revalidated_headers(response_start["headers"], validators)
+                    await send(dict(response_start, headers=headers))
+                    await send(message)
+                    return
+                if encoding is None or not self._compressible(response_start) or (
+                        not more_body and len(body) < self.minimum_size):
+                    await send(response_start)
+                    await send(message)
+                    return
+                compressor = Compressor(encoding, self.level, self.brotli_quality)
+                headers = self._compressed_headers(response_start["headers"], encoding)
+                if more_body:
+                    data = compressor.compress(body)
+                else:
+                    data = compressor.compress(body) + compressor.finish()
+                    headers.append((b"content-length", str(len(data)).encode("latin-1")))
+                await send(dict(response_start, headers=headers))
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+            if compressor is None:
+                await send(message)
+                return
+            data = compressor.compress(message.get("body", b""))
+            more_body = message.get("more_body", False)
+            if not more_body:
+                data += compressor.finish()
+            if data or not more_body:
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
+        if start is not None:
+            # The application sent no body message
+            await send(start)
+
+    @staticmethod
+    def _compressible(start):
+        """
+        Check whether a response should be compressed, from its start message
+        """
+        if start["status"] < 200 or start["status"] in (204, 304):
+            return False
+        content_type = b""
+        for name, value in start["headers"]:
+            if name == b"content-encoding":
+                return False
+            if name == b"content-type":
+                content_type = value
+        return content_type.decode("latin-1").lower().startswith(COMPRESSIBLE_TYPES)
+
+    @staticmethod
+    def _compressed_headers(headers, encoding):
+        """
+        Rewrite response headers for an encoded body, without its length
+        """
+        rewritten = []
+        vary = []
+        for name, value in headers:
+            if name == b"content-length":
+                continue
+            if name == b"vary":
+                vary.append(value)
+                continue
+            rewritten.append((name, value))
+        if b"accept-encoding" not in b",".join(vary).lower():
+            vary.append(b"Accept-Encoding")
+        rewritten.append((b"vary", b", ".join(vary)))
+        rewritten.append((b"content-encoding", encoding.encode("latin-1")))
+        return _weak_etag(rewritten)
+
+
+def _revalidated_headers(headers, validators):
+    """
+    Rewrite the headers of a 304 to carry the ETag the client holds
+
+    A compressed 200 gave the client the weak form of the ETag, which it
+    sends back in If-None-Match. The 304 then repeats that weak ETag and
+    the Vary of the compressed response, so the validator it stores does
+    not change; an identity copy validated by the strong ETag keeps it.
+
+    Args:
+        headers: Headers of the 304 response
+        validators: Value of the If-None-Match request header
+
+    Returns:
+        list: Rewritten headers
+    """
+    held = {validator.strip() for validator in validators.split(b",")}
+    etag = next((value for name, value in headers if name == b"etag"), None)
+    if etag is None or etag.startswith(b"W/") or b"W/" + etag not in held:
+        return headers
+    vary = [value for name, value in headers if name == b"vary"]
+    rewritten = [(name, value) for name, value in headers if name != b"vary"]
+    if b"accept-encoding" not in b",".join(vary).lower():
+        vary.append(b"Accept-Encoding")
+    rewritten.append((b"vary", b", ".join(vary)))
+    return _weak_etag(rewritten)
+
+
+def _weak_etag(headers):
+    """
+    Mark the ETag of a response weak, since encoded bytes differ from the
+    identity representation it was computed for
+    """
+    return [
+        (name, b"W/" + value if name == b"etag" and not value.startswith(b"W/") else value)
+        for name, value in headers
+    ]
@@ -0,0 +1,316 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Item queries shared by the sync and async request paths
+
+Every function takes a plain Session as its first argument and is run
+through `database.run_db`, which drives it either in the threadpool or,
+in async mode, on the event loop through `AsyncSession.run_sync`.
+"""
+
+import weakref
+from datetime import timezone
+
+from sqlalchemy import String, delete, func, insert, inspect, select, type_coerce, update
+
+from . import models
+from .pagination import paginate
+from .serialization import ITEM_FIELDS
+
+# Maximum number of IDs accepted by one bulk delete, well below SQLite's
+# bound parameter limit
+MAX_DELETE_IDS = 10000
+
+# Engines known to have the table_versions counter, so the schema is only
+# inspected until the table is first found
+_versioned_engines = weakref.WeakSet()
+
+
+def resolve_order_by(order_by=None, name_prefix=None, created_range=False):
+    """
+    Pick the ordering of a filtered listing
+
+    Only combinations an index can serve in order are allowed: a name
+    prefix is listed by name and a creation time range by created_at, so
+    the filter and the ordering share one index. is_active combines with
+    every ordering.
+
+    Args:
+        order_by: Requested ordering, or None to infer it from the filters
+        name_prefix: Name prefix filter
+        created_range: Whether a created_at range filter is set
+
+    Returns:
+        str: Ordering key
+
+    Raises:
+        ValueError: If the filters and the ordering cannot share an index
+    """
+    if name_prefix is not None and created_range:
+        raise ValueError("name_prefix cannot be combined with a created_at range")
+    required = "name" if name_prefix is not None else "created_at" if created_range else None
+    if order_by is None:
+        return required or "id"
+    if required is not None and order_by != required:
+        raise ValueError(f"This filter requires order_by={required}")
+    return order_by
+
+
+def _as_stored(value):
+    """
+    Format a datetime the way SQLite stores created_at, for text comparison
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(sep=" ")
+
+
+def _prefix_upper_bound(prefix):
+    """
+    Get the smallest string greater than every string starting with prefix,
+    or None if there is none
+    """
+    prefix = prefix.rstrip(chr(0x10FFFF))
+    if not prefix:
+        return None
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def item_filters(is_active=None, created_after=None, created_before=None, name_prefix=None):
+    """
+    Build the WHERE conditions of the item filters
+
+    Args:
+        is_active: Only items with this active flag
+        created_after: Only items created at or after this time
+        created_before: Only items created before this time
+        name_prefix: Only items whose name starts with this (case-sensitive)
+
+    Returns:
+        list: SQL conditions, all of which must hold
+    """
+    conditions = []
+    if is_active is not None:
+        conditions.append(models.Item.is_active == is_active)
+    # created_at is compared as stored text, like the pagination keyset
+    created_at = type_coerce(models.Item.created_at, String)
+    if created_after is not None:
+        conditions.append(created_at >= _as_stored(created_after))
+    if created_before is not None:
+        conditions.append(created_at < _as_stored(created_before))
+    if name_prefix:
+        # A range rather than LIKE, so the name index is used
+        conditions.append(models.Item.name >= name_prefix)
+        upper_bound = _prefix_upper_bound(name_prefix)
+        if upper_bound is not None:
+            conditions.append(models.Item.name < upper_bound)
+    return conditions
+
+
+def list_items(db, order_by="id", limit=100, skip=0, after=None, before=None,
+               descending=False, is_active=None, created_after=None,
+               created_before=None, name_prefix=None, fields=ITEM_FIELDS):
+    """
+    Get one page of items as plain row tuples
+
+    Only the columns of `fields` are selected; the keyset columns needed
+    for the cursors are added by the pagination and stripped again.
+
+    Args:
+        db: Database session
+        order_by: Ordering key
+        limit: Maximum number of items to return
+        skip: Number of items to skip (offset mode only)
+        after: Cursor of the item preceding the page
+        before: Cursor of the item following the page
+        descending: Whether to order from the largest key down
+        is_active: Only items with this active flag
+        created_after: Only items created at or after this time
+        created_before: Only items created before this time
+        name_prefix: Only items whose name starts with this (case-sensitive)
+        fields: Item fields to select
+
+    Returns:
+        tuple: (rows, next_cursor, prev_cursor), rows in `fields` order
+    """
+    columns = [getattr(models.Item, field) for field in fields]
+    query = db.query(*columns).filter(
+        *item_filters(is_active, created_after, created_before, name_prefix)
+    )
+    return paginate(
+        query, order_by=order_by, limit=limit, skip=skip,
+        after=after, before=before, descending=descending
+    )
+
+
+def create_item(db, data):
+    """
+    Insert an item
+
+    A single INSERT ... RETURNING reads back the generated id and
+    timestamps, instead of a commit followed by a refresh SELECT.
+
+    Args:
+        db: Database session
+        data: Column values of the item
+
+    Returns:
+        Row: Created item, in ITEM_FIELDS order
+    """
+    columns = [getattr(models.Item, field) for field in ITEM_FIELDS]
+    row = db.execute(insert(models.Item).values(**data).returning(*columns)).one()
+    db.commit()
+    return row
+
+
+def create_items(db, data):
+    """
+    Insert several items in one transaction
+
+    Args:
+        db: Database session
+        data: Column values of each item
+
+    Returns:
+        list: Created items, in ITEM_FIELDS order and in the order of `data`
+    """
+    columns = [getattr(models.Item, field) for field in ITEM_FIELDS]
+    rows = db.execute(
+        insert(models.Item).returning(*columns, sort_by_parameter_order=True), data
+    ).all()
+    db.commit()
+    return rows
+
+
+def get_item(db, item_id):
+    """
+    Get an item by ID
+
+    Args:
+        db: Database session
+        item_id: Item ID
+
+    Returns:
+        Item: The item, or None if it does not exist
+    """
+    return db.query(models.Item).filter(models.Item.id == item_id).first()
+
+
+def get_item_fields(db, item_id, fields):
+    """
+    Get some fields of an item by ID, with the timestamps of its version
+
+    Args:
+        db: Database session
+        item_id: Item ID
+        fields: Item fields to select
+
+    Returns:
+        tuple: (row, created_at, updated_at), row in `fields` order, or None
+        if the item does not exist
+    """
+    columns = [getattr(models.Item, field) for field in fields]
+    result = db.execute(
+        select(*columns, models.Item.created_at, models.Item.updated_at)
+        .where(models.Item.id == item_id)
+    ).first()
+    if result is None:
+        return None
+    return tuple(result[:-2]), result[-2], result[-1]
+
+
+def get_item_version(db, item_id):
+    """
+    Get the timestamps identifying the current version of an item
+
+    Reads two columns instead of loading the whole row.
+
+    Args:
+        db: Database session
+        item_id: Item ID
+
+    Returns:
+        tuple: (created_at, updated_at), or None if the item does not exist
+    """
+    return db.execute(
+        select(models.Item.created_at, models.Item.updated_at)
+        .where(models.Item.id == item_id)
+    ).first()
+
+
+def get_table_version(db, name="items"):
+    """
+    Get the change counter of a table
+
+    Args:
+        db: Database session
+        name: Table name
+
+    Returns:
+        int: Version, bumped by every write to the table, or None if the
+        table is not versioned on this database
+    """
+    engine = db.get_bind()
+    if engine not in _versioned_engines:
+        if not inspect(db.connection()).has_table(models.TableVersion.__tablename__):
+            return None
+        _versioned_engines.add(engine)
+    return db.scalar(
+        select(models.TableVersion.version).where(models.TableVersion.name == name)
+    )
+
+
+def delete_items(db, conditions, soft=False):
+    """
+    Delete or deactivate every item matching some conditions
+
+    Runs as a single set-based DELETE or UPDATE, without loading the
+    items. A soft delete clears `is_active` and only touches items that
+    were still active; the archiver later moves them out of the table.
+
+    Args:
+        db: Database session
+        conditions: SQL conditions selecting the items
+        soft: Whether to deactivate the items instead of deleting them
+
+    Returns:
+        list: IDs of the items deleted or deactivated
+    """
+    if soft:
+        statement = (
+            update(models.Item)
+            .where(*conditions, models.Item.is_active == True)  # noqa: E712
+            .values(is_active=False, updated_at=func.now())
+        )
+    else:
+        statement = delete(models.Item).where(*conditions)
+    item_ids = db.scalars(
+        statement.returning(models.Item.id).execution_options(synchronize_session=False)
+    ).all()
+    db.commit()
+    return item_ids
+
+
+def delete_item(db, item_id, soft=False):
+    """
+    Delete an item by ID
+
+    Args:
+        db: Database session
+        item_id: Item ID
+        soft: Whether to deactivate the item instead of deleting it
+
+    Returns:
+        bool: Whether the item existed
+    """
+    if soft:
+        statement = (
+            update(models.Item)
+            .where(models.Item.id == item_id)
+            .values(is_active=False, updated_at=func.now())
+        )
+    else:
+        statement = delete(models.Item).where(models.Item.id == item_id)
+    deleted = db.execute(statement.execution_options(synchronize_session=False)).rowcount
+    db.commit()
+    return deleted > 0
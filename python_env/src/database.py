@@ -4,29 +4,306 @@
 SQLAlchemy database configuration
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import os
+import threading
+from typing import TYPE_CHECKING, Union
 
-# SQLite database URL
-SQLALCHEMY_DATABASE_URL = "sqlite:///./interview.db"
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
+from starlette.concurrency import run_in_threadpool
+
+# The asyncio extension is only imported in async mode, keeping it off the
+# import path of sync workers
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+from .metrics import METRICS_ENABLED, instrument_engine
+
+# Database URL, overridable through the environment
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./interview.db")
+
+# Create the schema on application startup; turn off when the schema is
+# managed by `alembic upgrade head`
+DATABASE_CREATE_SCHEMA = os.getenv("DATABASE_CREATE_SCHEMA", "1").lower() in ("1", "true", "yes", "on")
+
+# Serve requests through AsyncSession instead of the blocking Session
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "").lower() in ("1", "true", "yes", "on")
+
+# Connection pool sizing for file and server databases
+DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+
+# Async drivers for the backends we support
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# PRAGMAs applied to every new SQLite connection, by profile. The
+# performance profile trades durability on power loss (not on process
+# crash) for throughput: WAL lets readers proceed while a writer commits,
+# synchronous=NORMAL only fsyncs at checkpoints, and the page cache, mmap
+# and in-memory temp tables keep hot pages out of read() calls.
+SQLITE_PROFILES = {
+    "default": {
+        "busy_timeout": 5000,
+    },
+    "performance": {
+        "busy_timeout": 5000,
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+    },
+}
+
+# Selected profile, plus per-PRAGMA overrides such as
+# SQLITE_PRAGMAS="synchronous=FULL,cache_size=-20000"
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance")
+SQLITE_PRAGMAS = os.getenv("SQLITE_PRAGMAS", "")
+
+
+def to_async_url(url):
+    """
+    Get the async driver equivalent of a database URL
+
+    Args:
+        url: Database URL using a blocking driver
+
+    Returns:
+        URL: Same database, addressed through its async driver
+    """
+    url = make_url(url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.get_backend_name(), url.drivername))
+
+
+def sqlite_pragmas(profile=SQLITE_PROFILE, overrides=SQLITE_PRAGMAS):
+    """
+    Resolve the PRAGMAs for a profile and its overrides
+
+    Args:
+        profile: Name of a profile in SQLITE_PROFILES
+        overrides: Comma separated `name=value` pairs
+
+    Returns:
+        dict: PRAGMA values by name
+
+    Raises:
+        ValueError: If the profile is unknown or an override is malformed
+    """
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile: {profile}")
+    pragmas = dict(SQLITE_PROFILES[profile])
+    for override in filter(None, (part.strip() for part in overrides.split(","))):
+        name, sep, value = override.partition("=")
+        if not sep or not name.strip().isidentifier():
+            raise ValueError(f"Invalid SQLite PRAGMA override: {override}")
+        pragmas[name.strip().lower()] = value.strip()
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """
+    Set PRAGMAs on every connection the engine opens
+
+    Args:
+        engine: Engine to configure; for an AsyncEngine pass its sync_engine
+        pragmas: PRAGMA values by name
+    """
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def engine_options(url, is_async=False):
+    """
+    Build create_engine keyword arguments for a database URL
+
+    File and server databases get an explicitly sized queue pool;
+    in-memory SQLite keeps the single-connection pool SQLAlchemy picks.
+
+    Args:
+        url: Database URL
+        is_async: Whether the options are for an AsyncEngine
+
+    Returns:
+        dict: Keyword arguments for create_engine/create_async_engine
+    """
+    url = make_url(url)
+    options = {}
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            return options
+    if is_async:
+        from sqlalchemy.pool import AsyncAdaptedQueuePool
+    options.update(
+        poolclass=AsyncAdaptedQueuePool if is_async else QueuePool,
+        pool_size=DATABASE_POOL_SIZE,
+        max_overflow=DATABASE_MAX_OVERFLOW,
+        pool_timeout=DATABASE_POOL_TIMEOUT,
+    )
+    return options
+
+
+def create_db_engine(url=SQLALCHEMY_DATABASE_URL):
+    """
+    Create the blocking engine with pooling, SQLite PRAGMAs and statement
+    metrics applied
+
+    Args:
+        url: Database URL
+
+    Returns:
+        Engine: Configured engine
+    """
+    db_engine = create_engine(url, **engine_options(url))
+    if db_engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(db_engine, sqlite_pragmas())
+    if METRICS_ENABLED:
+        instrument_engine(db_engine)
+    return db_engine
+
+
+def create_async_db_engine(url=SQLALCHEMY_DATABASE_URL):
+    """
+    Create the async engine with pooling, SQLite PRAGMAs and statement
+    metrics applied
+
+    Args:
+        url: Database URL using a blocking driver
+
+    Returns:
+        AsyncEngine: Configured async engine
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = to_async_url(url)
+    db_engine = create_async_engine(url, **engine_options(url, is_async=True))
+    if db_engine.dialect.name == "sqlite":
+        apply_sqlite_pragmas(db_engine.sync_engine, sqlite_pragmas())
+    if METRICS_ENABLED:
+        instrument_engine(db_engine.sync_engine)
+    return db_engine
+
+
+# Engines are built on first use rather than at import, so importing the
+# application stays cheap and no connection pool exists before a server
+# worker process starts
+_engine = None
+_async_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """
+    Get the application engine, creating it on first use
+
+    Returns:
+        Engine: Engine for SQLALCHEMY_DATABASE_URL
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_db_engine()
+    return _engine
+
+
+def get_async_engine():
+    """
+    Get the application async engine, creating it on first use
+
+    Only called in async mode, since it needs the async driver (aiosqlite)
+    to be installed.
+
+    Returns:
+        AsyncEngine: Async engine for SQLALCHEMY_DATABASE_URL
+    """
+    global _async_engine
+    if _async_engine is None:
+        with _engine_lock:
+            if _async_engine is None:
+                _async_engine = create_async_db_engine()
+    return _async_engine
+
+
+def _discard_inherited_pools():
+    """
+    Drop the pooled connections a forked child inherited from its parent
+
+    The connections stay open for the parent (close=False); the child
+    opens its own on first use, so no SQLite handle is shared across fork.
+    """
+    if _engine is not None:
+        _engine.dispose(close=False)
+    if _async_engine is not None:
+        _async_engine.sync_engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_discard_inherited_pools)
+
+
+class LazySessionmaker(sessionmaker):
+    """
+    Session factory bound to the application engine when first called
+    """
+
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+
+class LazyAsyncSessionmaker:
+    """
+    Async session factory bound to the application async engine when
+    first called
+
+    The underlying async_sessionmaker is only built then, so the asyncio
+    extension is never imported in sync mode.
+    """
+
+    def __init__(self, **kw):
+        """
+        Args:
+            **kw: Keyword arguments for async_sessionmaker
+        """
+        self.kw = kw
+        self._factory = None
+
+    def __call__(self, **local_kw):
+        if self._factory is None:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+
+            self._factory = async_sessionmaker(bind=get_async_engine(), **self.kw)
+        return self._factory(**local_kw)
 
-# Create SQLAlchemy engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = LazySessionmaker(autocommit=False, autoflush=False)
+
+# Async sessions, used when async mode is enabled
+AsyncSessionLocal = LazyAsyncSessionmaker(autoflush=False, expire_on_commit=False)
+
+# Session type handed to request handlers in either mode
+AnySession = Union[Session, "AsyncSession"]
 
 # Create Base class
 Base = declarative_base()
 
-
-def get_db():
+def get_sync_db():
     """
     Dependency for getting database session
-    
+
     Yields:
         db: Database session
     """
@@ -35,3 +312,40 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency for getting an async database session
+
+    Yields:
+        db: Async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Dependency used by the application, selected by DATABASE_ASYNC
+get_db = get_async_db if DATABASE_ASYNC else get_sync_db
+
+
+async def run_db(db, fn, *args, **kwargs):
+    """
+    Run blocking database code against either kind of session
+
+    With an AsyncSession, `fn` runs on the event loop through
+    `AsyncSession.run_sync` and its IO is awaited by the async driver, so
+    no thread is held. With a plain Session it runs in the threadpool.
+
+    Args:
+        db: Session or AsyncSession
+        fn: Callable taking a Session as its first argument
+        *args: Extra positional arguments for fn
+        **kwargs: Extra keyword arguments for fn
+
+    Returns:
+        The value returned by fn
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(fn, db, *args, **kwargs)
+    return await db.run_sync(fn, *args, **kwargs)
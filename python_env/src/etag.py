@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+ETag helpers for conditional GET on item endpoints
+"""
+
+import hashlib
+
+
+def _digest(*parts):
+    """
+    Hash the parts identifying a representation into a short token
+    """
+    data = "\x1f".join(str(part) for part in parts).encode("utf-8")
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+
+def item_etag(item_id, created_at, updated_at):
+    """
+    Build the strong ETag of a single item
+
+    Args:
+        item_id: Item ID
+        created_at: Creation time of the item
+        updated_at: Last update time of the item, if any
+
+    Returns:
+        str: Quoted ETag
+    """
+    return f'"{item_id}-{_digest(created_at, updated_at)}"'
+
+
+def partial_etag(etag, fields):
+    """
+    Build the ETag of a field selection of a representation
+
+    Args:
+        etag: Quoted ETag of the full representation
+        fields: Selected fields, or None for all of them
+
+    Returns:
+        str: Quoted ETag, unchanged when every field is selected
+    """
+    if fields is None:
+        return etag
+    return f'{etag[:-1]}-{_digest(*fields)}"'
+
+
+def list_etag(version, query):
+    """
+    Build the strong ETag of an item listing
+
+    Args:
+        version: Items table version the listing was read at
+        query: Query string selecting the page
+
+    Returns:
+        str: Quoted ETag
+    """
+    return f'"v{version}-{_digest(query)}"'
+
+
+def if_none_match(header, etag):
+    """
+    Check an If-None-Match header against the current ETag
+
+    Uses the weak comparison RFC 7232 prescribes for If-None-Match.
+
+    Args:
+        header: Value of the If-None-Match header, or None
+        etag: Current ETag of the resource
+
+    Returns:
+        bool: Whether the client already holds the current representation
+    """
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (candidate.strip() for candidate in header.split(","))
+    return etag in (candidate[2:] if candidate.startswith("W/") else candidate
+                    for candidate in candidates)
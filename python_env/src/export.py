@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Streaming export of the items table
+"""
+
+import csv
+import io
+import json
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from . import models
+
+# Columns written by the export, in output order
+EXPORT_COLUMNS = ("id", "name", "description", "is_active", "created_at", "updated_at")
+
+# Default number of rows fetched from the cursor at a time
+DEFAULT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _statement(batch_size):
+    """
+    Build the export query, selecting columns rather than ORM entities and
+    streaming through a server-side cursor
+    """
+    return (
+        select(*[getattr(models.Item, column) for column in EXPORT_COLUMNS])
+        .order_by(models.Item.id)
+        .execution_options(stream_results=True, yield_per=batch_size)
+    )
+
+
+def iter_batches(db, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Read the items table in batches of plain row tuples
+
+    Only one batch is held in memory at a time.
+
+    Args:
+        db: Database session
+        batch_size: Number of rows per batch
+
+    Yields:
+        list: Row tuples in EXPORT_COLUMNS order
+    """
+    result = db.execute(_statement(batch_size))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+async def aiter_batches(db, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Async counterpart of iter_batches for an AsyncSession
+
+    Args:
+        db: Async database session
+        batch_size: Number of rows per batch
+
+    Yields:
+        list: Row tuples in EXPORT_COLUMNS order
+    """
+    result = await db.stream(_statement(batch_size))
+    try:
+        async for partition in result.partitions():
+            yield partition
+    finally:
+        await result.close()
+
+
+def _plain(value):
+    """
+    Convert a column value to something JSON and CSV can write
+    """
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def encode_ndjson(batch):
+    """
+    Encode a batch of rows as newline-delimited JSON
+
+    Args:
+        batch: Row tuples in EXPORT_COLUMNS order
+
+    Returns:
+        bytes: One JSON document per row
+    """
+    lines = [
+        json.dumps(dict(zip(EXPORT_COLUMNS, map(_plain, row))), ensure_ascii=False)
+        for row in batch
+    ]
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+def encode_csv(batch):
+    """
+    Encode a batch of rows as CSV records
+
+    Args:
+        batch: Row tuples in EXPORT_COLUMNS order
+
+    Returns:
+        bytes: One CSV record per row
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_plain(value) for value in row] for row in batch)
+    return buffer.getvalue().encode("utf-8")
+
+
+# Header and batch encoder for each format
+ENCODERS = {
+    "ndjson": (b"", encode_ndjson),
+    "csv": (encode_csv([EXPORT_COLUMNS]), encode_csv),
+}
+
+
+def _encode(batches, fmt):
+    """
+    Encode row batches, preceded by the format header
+    """
+    header, encode = ENCODERS[fmt]
+    if header:
+        yield header
+    for batch in batches:
+        yield encode(batch)
+
+
+async def _aencode(batches, fmt):
+    """
+    Encode async row batches, preceded by the format header
+    """
+    header, encode = ENCODERS[fmt]
+    if header:
+        yield header
+    async for batch in batches:
+        yield encode(batch)
+
+
+def export_items(db, fmt="ndjson", batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Stream the whole items table in the requested format
+
+    Args:
+        db: Session, or AsyncSession in async mode
+        fmt: Output format, one of ENCODERS
+        batch_size: Number of rows fetched per batch
+
+    Returns:
+        Iterator[bytes] or AsyncIterator[bytes]: Encoded export chunks
+    """
+    if isinstance(db, Session):
+        return _encode(iter_batches(db, batch_size), fmt)
+    return _aencode(aiter_batches(db, batch_size), fmt)
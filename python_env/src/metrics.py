@@ -0,0 +1,398 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Request and database metrics in the Prometheus text format
+
+MetricsMiddleware records the latency, status and in-flight count of
+every request by route template. Engines instrumented with
+`instrument_engine` record the count and duration of every SQL statement,
+also attributed to the request that ran it, so a route issuing one query
+per item shows up in `db_statements_per_request`.
+"""
+
+import bisect
+import math
+import os
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+# Record metrics; when off the middleware and engine hooks are not installed
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() in ("1", "true", "yes", "on")
+
+# Histogram buckets, in seconds for durations
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Route label of requests that matched no route, so unknown paths cannot
+# create new series
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Statements run by the request being served, when there is one
+_request_statements = ContextVar("request_statements", default=None)
+
+
+def _escape(value):
+    """
+    Escape a label value for the text format
+    """
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()):
+    """
+    Render a label set, e.g. `{method="GET",route="/"}`
+    """
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    """
+    Render a sample value
+    """
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """
+    Family of samples sharing a name and label names
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels, in order
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """
+        Drop every sample
+        """
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        """
+        Render the family in the Prometheus text format
+
+        Returns:
+            list: Lines of text
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.extend(self._render_sample(labels, value))
+        return lines
+
+    def _render_sample(self, labels, value):
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"]
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing count
+    """
+
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        """
+        Add to the count of a label set
+
+        Args:
+            *labels: Label values, in `labelnames` order
+            amount: Amount added
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        """
+        Get the count of a label set
+        """
+        return self._values.get(labels, 0)
+
+
+class Gauge(Metric):
+    """
+    Value that goes up and down
+    """
+
+    kind = "gauge"
+
+    def inc(self, *labels, amount=1):
+        """
+        Add to the value of a label set
+
+        Args:
+            *labels: Label values, in `labelnames` order
+            amount: Amount added
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels, amount=1):
+        """
+        Subtract from the value of a label set
+
+        Args:
+            *labels: Label values, in `labelnames` order
+            amount: Amount subtracted
+        """
+        self.inc(*labels, amount=-amount)
+
+    def value(self, *labels):
+        """
+        Get the value of a label set
+        """
+        return self._values.get(labels, 0)
+
+
+class Histogram(Metric):
+    """
+    Distribution of observations over cumulative buckets
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        """
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Names of the labels, in order
+            buckets: Upper bounds of the buckets, ascending
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+
+    def observe(self, value, *labels):
+        """
+        Record an observation
+
+        Args:
+            value: Observed value
+            *labels: Label values, in `labelnames` order
+        """
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            state[0][bisect.bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def count(self, *labels):
+        """
+        Get the number of observations of a label set
+        """
+        state = self._values.get(labels)
+        return state[2] if state is not None else 0
+
+    def sum(self, *labels):
+        """
+        Get the sum of the observations of a label set
+        """
+        state = self._values.get(labels)
+        return state[1] if state is not None else 0.0
+
+    def _render_sample(self, labels, state):
+        counts, total, count = state
+        base = _format_labels(self.labelnames, labels)
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            bucket_labels = _format_labels(
+                self.labelnames, labels, [("le", _format_value(bound))]
+            )
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{self.name}_sum{base} {_format_value(total)}")
+        lines.append(f"{self.name}_count{base} {count}")
+        return lines
+
+
+class Registry:
+    """
+    Collection of metric families rendered together
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        """
+        Add a metric family
+
+        Args:
+            metric: Metric to add
+
+        Returns:
+            Metric: The metric, for assignment
+        """
+        self.metrics.append(metric)
+        return metric
+
+    def clear(self):
+        """
+        Drop the samples of every family
+        """
+        for metric in self.metrics:
+            metric.clear()
+
+    def render(self):
+        """
+        Render every family in the Prometheus text format
+
+        Returns:
+            bytes: Exposition body
+        """
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+registry = Registry()
+
+http_requests_total = registry.register(Counter(
+    "http_requests_total", "HTTP requests served.", ("method", "route", "status"),
+))
+http_request_duration_seconds = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency in seconds.", ("method", "route"),
+))
+http_requests_in_progress = registry.register(Gauge(
+    "http_requests_in_progress", "HTTP requests being served.", ("method",),
+))
+db_statements_total = registry.register(Counter(
+    "db_statements_total", "SQL statements executed.", ("operation",),
+))
+db_statement_duration_seconds = registry.register(Histogram(
+    "db_statement_duration_seconds", "SQL statement execution time in seconds.",
+    ("operation",), buckets=STATEMENT_BUCKETS,
+))
+db_statements_per_request = registry.register(Histogram(
+    "db_statements_per_request", "SQL statements executed per HTTP request.",
+    ("method", "route"), buckets=COUNT_BUCKETS,
+))
+
+
+def statement_operation(statement):
+    """
+    Get the operation of a SQL statement, e.g. SELECT or INSERT
+
+    Args:
+        statement: SQL text
+
+    Returns:
+        str: Upper-case first keyword
+    """
+    keyword = statement.lstrip().split(None, 1)[:1]
+    return keyword[0].upper() if keyword else "UNKNOWN"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("metrics_start")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    operation = statement_operation(statement)
+    db_statements_total.inc(operation)
+    db_statement_duration_seconds.observe(elapsed, operation)
+    statements = _request_statements.get()
+    if statements is not None:
+        statements[0] += 1
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("metrics_start"):
+        connection.info["metrics_start"].pop()
+
+
+def instrument_engine(engine):
+    """
+    Record the count and duration of every statement an engine executes
+
+    Args:
+        engine: Engine to instrument; for an AsyncEngine pass its sync_engine
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status and concurrency per route
+
+    Requests are labelled with the template of the route they matched,
+    e.g. `/items/{item_id}`, and timed until the response body is sent,
+    so streamed responses are measured in full.
+    """
+
+    def __init__(self, app):
+        """
+        Args:
+            app: ASGI application to wrap
+        """
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        statements = [0]
+        token = _request_statements.set(statements)
+        http_requests_in_progress.inc(method)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - start
+            http_requests_in_progress.dec(method)
+            _request_statements.reset(token)
+            route = scope.get("route")
+            route = getattr(route, "path", None) or UNMATCHED_ROUTE
+            http_requests_total.inc(method, route, str(status[0]))
+            http_request_duration_seconds.observe(elapsed, method, route)
+            db_statements_per_request.observe(statements[0], method, route)
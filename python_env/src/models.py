@@ -4,7 +4,7 @@
 SQLAlchemy models for the interview application
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, Index, DDL, event, text
 from sqlalchemy.sql import func
 
 from .database import Base
@@ -23,5 +23,116 @@ class Item(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # Keyset for cursor pagination ordered by creation time
+        Index("ix_items_created_at_id", "created_at", "id"),
+        # Listings filtered on is_active, one per supported ordering
+        Index("ix_items_is_active_id", "is_active", "id"),
+        Index("ix_items_is_active_created_at_id", "is_active", "created_at", "id"),
+        Index("ix_items_is_active_name_id", "is_active", "name", "id"),
+    )
+
     def __repr__(self):
         return f"<Item(id={self.id}, name='{self.name}')>"
+
+
+class ArchivedItem(Base):
+    """
+    Soft-deleted item moved out of the items table by the archiver
+    """
+    __tablename__ = "items_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(100))
+    description = Column(Text, nullable=True)
+    is_active = Column(Boolean)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<ArchivedItem(id={self.id}, name='{self.name}')>"
+
+
+class TableVersion(Base):
+    """
+    Per-table change counter, bumped by triggers on every write
+    """
+    __tablename__ = "table_versions"
+
+    name = Column(String(64), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion(name='{self.name}', version={self.version})>"
+
+
+# Triggers keeping the items version current whatever path writes the
+# table (ORM, Core bulk inserts or raw SQL). They are attached to the
+# metadata so they are also added to databases whose tables already exist.
+ITEMS_VERSION_DDL = [
+    "INSERT OR IGNORE INTO table_versions (name, version) VALUES ('items', 0)",
+] + [
+    f"""CREATE TRIGGER IF NOT EXISTS items_version_{operation.lower()}
+    AFTER {operation} ON items
+    BEGIN
+        UPDATE table_versions SET version = version + 1 WHERE name = 'items';
+    END"""
+    for operation in ("INSERT", "UPDATE", "DELETE")
+]
+
+for statement in ITEMS_VERSION_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+
+# Full-text index over item names and descriptions. It is an external
+# content FTS5 table, so it stores only the index and reads the text back
+# from items; triggers keep it in sync with every write.
+ITEMS_FTS_DDL = """CREATE VIRTUAL TABLE items_fts USING fts5(
+    name, description,
+    content='items', content_rowid='id',
+    prefix='2 3', tokenize='unicode61 remove_diacritics 2'
+)"""
+
+ITEMS_FTS_TRIGGERS_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS items_fts_insert AFTER INSERT ON items
+    BEGIN
+        INSERT INTO items_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS items_fts_delete AFTER DELETE ON items
+    BEGIN
+        INSERT INTO items_fts (items_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS items_fts_update AFTER UPDATE OF name, description ON items
+    BEGIN
+        INSERT INTO items_fts (items_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO items_fts (rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END""",
+]
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_search_index(target, connection, **kw):
+    """
+    Create the items full-text index, indexing existing rows the first time
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'items_fts'"
+    )).first()
+    if not exists:
+        connection.execute(text(ITEMS_FTS_DDL))
+        connection.execute(text("INSERT INTO items_fts (items_fts) VALUES ('rebuild')"))
+    for statement in ITEMS_FTS_TRIGGERS_DDL:
+        connection.execute(text(statement))
+
+
+event.listen(
+    Base.metadata, "before_drop",
+    DDL("DROP TABLE IF EXISTS items_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Keyset (cursor) pagination helpers for item listings
+"""
+
+import base64
+import json
+import math
+
+from sqlalchemy import String, tuple_, type_coerce
+
+from . import models
+
+# Supported orderings; each maps to the columns forming the keyset
+ORDERINGS = {
+    "id": ("id",),
+    "created_at": ("created_at", "id"),
+    "name": ("name", "id"),
+}
+
+# Range of the ids a cursor may carry, that of a signed 64-bit integer
+ID_MIN, ID_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+class CursorError(ValueError):
+    """
+    Raised when a pagination cursor cannot be decoded
+    """
+
+
+def encode_cursor(order_by, values):
+    """
+    Build an opaque cursor from the keyset values of a row
+
+    Args:
+        order_by: Ordering the cursor belongs to
+        values: Keyset values, in ORDERINGS order
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    payload = json.dumps({"o": order_by, "k": list(values)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _valid_id(value):
+    """
+    Check that a cursor value is an id SQLite can bind
+    """
+    return isinstance(value, int) and not isinstance(value, bool) and ID_MIN <= value <= ID_MAX
+
+
+def _valid_text(value):
+    """
+    Check that a cursor value is a name or a stored created_at
+    """
+    return isinstance(value, str)
+
+
+def _valid_rank(value):
+    """
+    Check that a cursor value is a finite search rank
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+# Check of the cursor values, by keyset column
+KEYSET_CHECKS = {
+    "id": _valid_id,
+    "name": _valid_text,
+    "created_at": _valid_text,
+    "rank": _valid_rank,
+}
+
+
+def decode_cursor(token, order_by, columns=None):
+    """
+    Decode a cursor produced by encode_cursor
+
+    Every value is checked against its keyset column, so a forged cursor
+    is rejected here rather than failing when bound to the query.
+
+    Args:
+        token: Cursor token
+        order_by: Ordering the cursor is expected to belong to, prefixed
+            with "-" when descending
+        columns: Keyset columns, by default those of ORDERINGS[order_by]
+
+    Returns:
+        list: Keyset values
+
+    Raises:
+        CursorError: If the token is malformed or belongs to another ordering
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values = payload["k"]
+        cursor_order = payload["o"]
+    except (ValueError, TypeError, KeyError):
+        raise CursorError("Invalid cursor")
+    if columns is None:
+        columns = ORDERINGS[order_by.lstrip("-")]
+    if cursor_order != order_by or not isinstance(values, list) or len(values) != len(columns):
+        raise CursorError("Cursor does not match the requested ordering")
+    for column, value in zip(columns, values):
+        check = KEYSET_CHECKS.get(column)
+        if check is not None and not check(value):
+            raise CursorError("Invalid cursor")
+    return values
+
+
+def _keyset_columns(order_by):
+    """
+    Get the SQL expressions forming the keyset for an ordering
+
+    created_at is compared as its stored text so cursor values round-trip
+    exactly, whatever datetime format the row was written with.
+    """
+    columns = []
+    for name in ORDERINGS[order_by]:
+        column = getattr(models.Item, name)
+        if name == "created_at":
+            column = type_coerce(column, String)
+        columns.append(column)
+    return columns
+
+
+def _keyset(columns, values):
+    """
+    Pair keyset columns with cursor values as row values SQLite can seek on
+    """
+    if len(columns) == 1:
+        return columns[0], values[0]
+    return tuple_(*columns), tuple_(*values)
+
+
+def paginate(query, order_by="id", limit=100, skip=0, after=None, before=None,
+             descending=False):
+    """
+    Fetch one page of items ordered by a keyset
+
+    With `after`/`before` the page starts right after/before the row the
+    cursor was taken from, so the cost does not depend on the page depth.
+    Without a cursor, `skip` falls back to an OFFSET scan.
+
+    Args:
+        query: Query selecting the item columns to return
+        order_by: Ordering key, one of ORDERINGS
+        limit: Maximum number of items to return
+        skip: Number of items to skip (offset mode only)
+        after: Cursor of the row preceding the page
+        before: Cursor of the row following the page
+        descending: Whether to order from the largest key down
+
+    Returns:
+        tuple: (rows, next_cursor, prev_cursor), rows holding the columns
+        selected by `query`
+
+    Raises:
+        CursorError: If a cursor is invalid
+    """
+    columns = _keyset_columns(order_by)
+    width = len(columns)
+    key = f"-{order_by}" if descending else order_by
+    query = query.add_columns(*columns)
+
+    def seek(cursor, forward):
+        keyset, values = _keyset(columns, decode_cursor(cursor, key, ORDERINGS[order_by]))
+        return keyset > values if forward != descending else keyset < values
+
+    def ordered(forward):
+        if forward != descending:
+            return query.order_by(*columns)
+        return query.order_by(*[column.desc() for column in columns])
+
+    if before is not None:
+        query = query.filter(seek(before, forward=False))
+        rows = list(reversed(ordered(forward=False).limit(limit + 1).all()))
+        has_prev = len(rows) > limit
+        rows = rows[1:] if has_prev else rows
+        has_next = True
+    else:
+        if after is not None:
+            query = query.filter(seek(after, forward=True))
+        query = ordered(forward=True)
+        if after is None:
+            query = query.offset(skip)
+        rows = query.limit(limit + 1).all()
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        has_prev = after is not None or skip > 0
+
+    items = [tuple(row[:-width]) for row in rows]
+    next_cursor = prev_cursor = None
+    if rows and has_next:
+        next_cursor = encode_cursor(key, rows[-1][-width:])
+    if rows and has_prev:
+        prev_cursor = encode_cursor(key, rows[0][-width:])
+    return items, next_cursor, prev_cursor
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Full-text search over item names and descriptions
+
+Queries run against the `items_fts` FTS5 index (see models.py), ranked by
+BM25 with name matches weighted above description matches.
+"""
+
+from sqlalchemy import Integer, column, func, literal_column, select, table, tuple_
+
+from . import models
+from .pagination import decode_cursor, encode_cursor
+from .serialization import ITEM_FIELDS
+
+# BM25 weights of the indexed columns, in index order
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+items_fts = table("items_fts", column("rowid", Integer))
+
+
+def build_match_query(q, prefix=True):
+    """
+    Turn user input into a safe FTS5 query
+
+    Every whitespace separated term is quoted, so FTS5 operators in the
+    input are matched literally. All terms must match; with `prefix` the
+    last term also matches as a prefix, for search-as-you-type.
+
+    Args:
+        q: User search input
+        prefix: Whether the last term matches as a prefix
+
+    Returns:
+        str: FTS5 MATCH expression, or None if the input has no terms
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in q.split()]
+    if not terms:
+        return None
+    if prefix:
+        terms[-1] += "*"
+    return " ".join(terms)
+
+
+def search_items(db, q, limit=20, after=None, prefix=True, fields=ITEM_FIELDS):
+    """
+    Get one page of items matching a search, best matches first
+
+    Pages are walked with a keyset cursor on (rank, id), so deeper pages
+    do not re-read the rows of earlier ones.
+
+    Args:
+        db: Database session
+        q: User search input
+        limit: Maximum number of items to return
+        after: Cursor of the item preceding the page
+        prefix: Whether the last term matches as a prefix
+        fields: Item fields to select
+
+    Returns:
+        tuple: (rows, next_cursor), rows in `fields` order
+
+    Raises:
+        CursorError: If the cursor is invalid
+    """
+    match = build_match_query(q, prefix)
+    if match is None:
+        return [], None
+    rank = func.bm25(literal_column("items_fts"), NAME_WEIGHT, DESCRIPTION_WEIGHT)
+    statement = (
+        select(*[getattr(models.Item, field) for field in fields], models.Item.id, rank)
+        .select_from(items_fts.join(models.Item, models.Item.id == items_fts.c.rowid))
+        .where(literal_column("items_fts").op("MATCH")(match))
+        .order_by(rank, models.Item.id)
+        .limit(limit + 1)
+    )
+    if after is not None:
+        after_rank, after_id = decode_cursor(after, "rank", ("rank", "id"))
+        statement = statement.where(tuple_(rank, models.Item.id) > tuple_(after_rank, after_id))
+    rows = db.execute(statement).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor("rank", [rows[-1][-1], rows[-1][-2]])
+    return [tuple(row[:-2]) for row in rows], next_cursor
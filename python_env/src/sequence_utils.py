@@ -4,6 +4,491 @@
 序列处理工具模块
 """
 
+import os
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, combinations, islice
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 自动模式下完整 DP 表允许的最大单元格数，超过则改用 Hirschberg 算法
+# 完整表每个单元格至少占 8 字节指针，100 万个单元格约 8 MB
+LCS_TABLE_MAX_CELLS = 1000000
+
+# Hirschberg 递归到子问题不超过该单元格数时，直接用 DP 表求解
+_HIRSCHBERG_LEAF_CELLS = 4096
+
+# 位并行算法允许的最大公共字母表大小
+# 每个公共元素需要一个 len(seq2) 位的掩码，字母表越大内存越多
+LCS_BITPARALLEL_MAX_ALPHABET = 1024
+
+# 批量计算时每个任务包含的字符串对数量
+LCS_BATCH_CHUNK_SIZE = 64
+
+# 批量计算时每个进程最多同时排队的任务数，限制未取走结果占用的内存
+_BATCH_TASKS_PER_WORKER = 2
+
+# 把二进制字符串的 "0"/"1" 转换为字节 0/1
+_BIT_VALUES = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _lcs_table(seq1, seq2):
+    """
+    用完整 DP 表计算最长公共子序列，占用 O(m*n) 内存
+    
+    Args:
+        seq1: 第一个序列
+        seq2: 第二个序列
+    
+    Returns:
+        list: 最长公共子序列的元素
+    """
+    # 获取两个序列的长度
+    m, n = len(seq1), len(seq2)
+    
+    # 创建一个二维数组来存储子问题的解
+    # dp[i][j] 表示 seq1[0...i-1] 和 seq2[0...j-1] 的最长公共子序列长度
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    
+    # 填充 dp 数组
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            if seq1[i - 1] == seq2[j - 1]:
+                # 如果当前元素相同，则最长公共子序列长度加1
+                dp[i][j] = dp[i - 1][j - 1] + 1
+            else:
+                # 否则，取两种可能情况的最大值
+                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
+    
+    # 重建最长公共子序列
+    lcs = []
+    i, j = m, n
+    while i > 0 and j > 0:
+        if seq1[i - 1] == seq2[j - 1]:
+            # 当前元素是LCS的一部分
+            lcs.append(seq1[i - 1])
+            i -= 1
+            j -= 1
+        elif dp[i - 1][j] > dp[i][j - 1]:
+            # 向上移动
+            i -= 1
+        else:
+            # 向左移动
+            j -= 1
+    
+    # 因为我们是从后向前构建的，所以需要反转
+    lcs.reverse()
+    return lcs
+
+
+def _encode_numpy(str1, str2):
+    """
+    把两个字符串编码为 NumPy 整数数组，相同字符得到相同的值
+    
+    Args:
+        str1: 第一个字符串或可哈希元素的序列
+        str2: 第二个字符串或可哈希元素的序列
+    
+    Returns:
+        tuple: 两个一维整数数组
+    """
+    if isinstance(str1, str) and isinstance(str2, str):
+        # UTF-32 中每个字符正好占 4 字节，即其码位
+        return (np.frombuffer(str1.encode("utf-32-le"), dtype=np.uint32),
+                np.frombuffer(str2.encode("utf-32-le"), dtype=np.uint32))
+    codes1, codes2 = _intern(str1, str2)
+    return np.array(codes1, dtype=np.int64), np.array(codes2, dtype=np.int64)
+
+
+def _lcs_table_numpy(str1, str2):
+    """
+    用 NumPy 逐行向量化填充 DP 表并重建最长公共子序列
+    
+    第 i 行先取 max(dp[i-1][j], dp[i-1][j-1] + 匹配)，由于每行单调不减，
+    再做一次累计最大值即得到 dp[i][j]，每行只需几次数组运算。回溯规则
+    与 _lcs_table 相同，因此结果完全一致。表中元素用 16 位或 32 位整数，
+    内存约为列表 DP 表的 1/4 到 1/2。
+    
+    Args:
+        str1: 第一个序列
+        str2: 第二个序列
+    
+    Returns:
+        list: 最长公共子序列的元素
+    
+    Raises:
+        ImportError: 如果没有安装 NumPy
+    """
+    if np is None:
+        raise ImportError("numpy 方法需要安装 NumPy")
+    m, n = len(str1), len(str2)
+    codes1, codes2 = _encode_numpy(str1, str2)
+    dtype = np.uint16 if min(m, n) < 2 ** 16 else np.uint32
+    dp = np.zeros((m + 1, n + 1), dtype=dtype)
+    for i in range(1, m + 1):
+        prev, row = dp[i - 1], dp[i]
+        np.maximum(prev[1:], prev[:-1] + (codes2 == codes1[i - 1]), out=row[1:])
+        np.maximum.accumulate(row, out=row)
+    
+    # 按 _lcs_table 的规则回溯
+    lcs = []
+    i, j = m, n
+    while i > 0 and j > 0:
+        if str1[i - 1] == str2[j - 1]:
+            lcs.append(str1[i - 1])
+            i -= 1
+            j -= 1
+        elif dp.item(i - 1, j) > dp.item(i, j - 1):
+            i -= 1
+        else:
+            j -= 1
+    lcs.reverse()
+    return lcs
+
+
+def _lcs_row_dp(seq1, seq2):
+    """
+    用滚动的两行数组计算 seq1 与 seq2 每个前缀的最长公共子序列长度
+    
+    Args:
+        seq1: 第一个序列
+        seq2: 第二个序列
+    
+    Returns:
+        array: 长度为 len(seq2) + 1，第 j 项为 seq1 与 seq2[:j] 的 LCS 长度
+    """
+    prev = array('l', bytes(array('l').itemsize * (len(seq2) + 1)))
+    row = array('l', prev)
+    for x in seq1:
+        left = 0
+        for j, y in enumerate(seq2):
+            if x == y:
+                left = prev[j] + 1
+            elif prev[j + 1] > left:
+                left = prev[j + 1]
+            row[j + 1] = left
+        prev, row = row, prev
+    return prev
+
+
+def _match_masks(seq1, seq2):
+    """
+    为同时出现在两个序列中的元素构建 seq2 中的位置掩码
+    
+    Args:
+        seq1: 第一个序列
+        seq2: 第二个序列
+    
+    Returns:
+        dict: 元素到掩码的映射，掩码第 j 位表示 seq2[j] 是否等于该元素；
+        公共元素超过 LCS_BITPARALLEL_MAX_ALPHABET 个时返回 None
+    """
+    common = set(seq1).intersection(seq2)
+    if len(common) > LCS_BITPARALLEL_MAX_ALPHABET:
+        return None
+    positions = {x: [] for x in common}
+    for j, y in enumerate(seq2):
+        if y in positions:
+            positions[y].append(j)
+    size = len(seq2) // 8 + 1
+    masks = {}
+    for x, indexes in positions.items():
+        bits = bytearray(size)
+        for j in indexes:
+            bits[j >> 3] |= 1 << (j & 7)
+        masks[x] = int.from_bytes(bits, "little")
+    return masks
+
+
+def _lcs_bitparallel(seq1, seq2, masks):
+    """
+    用位并行算法（Allison-Dix / Hyyrö）扫描 seq1
+    
+    向量 V 的每一位对应 seq2 的一个位置，V 的低 j 位中 0 的个数就是
+    seq1 与 seq2[:j] 的 LCS 长度。每个元素只需几次大整数运算，
+    即可一次处理 seq2 的全部位置。
+    
+    Args:
+        seq1: 第一个序列
+        seq2: 第二个序列
+        masks: _match_masks 构建的位置掩码
+    
+    Returns:
+        int: 扫描完 seq1 后的向量 V
+    """
+    full = (1 << len(seq2)) - 1
+    v = full
+    for x in seq1:
+        mask = masks.get(x)
+        if mask:
+            u = v & mask
+            v = ((v + u) | (v - u)) & full
+    return v
+
+
+def _lcs_last_row(seq1, seq2):
+    """
+    计算 seq1 与 seq2 每个前缀的最长公共子序列长度，占用 O(len(seq2)) 内存
+    
+    公共字母表不超过 LCS_BITPARALLEL_MAX_ALPHABET 时使用位并行算法，
+    否则使用两行数组。
+    
+    Args:
+        seq1: 第一个序列
+        seq2: 第二个序列
+    
+    Returns:
+        Sequence: 长度为 len(seq2) + 1，第 j 项为 seq1 与 seq2[:j] 的 LCS 长度
+    """
+    masks = _match_masks(seq1, seq2)
+    if masks is None:
+        return _lcs_row_dp(seq1, seq2)
+    n = len(seq2)
+    if n == 0:
+        return [0]
+    v = _lcs_bitparallel(seq1, seq2, masks)
+    # V 的第 j 位为 0 时记 1，前缀和即为各前缀的 LCS 长度
+    zeros = format(~v & ((1 << n) - 1), f"0{n}b")[::-1].encode("ascii").translate(_BIT_VALUES)
+    return list(accumulate(zeros, initial=0))
+
+
+def _lcs_hirschberg(seq1, seq2):
+    """
+    用 Hirschberg 分治算法计算最长公共子序列，占用 O(m+n) 内存
+    
+    把 seq1 从中间切开，分别正向、反向计算两半与 seq2 的 LCS 长度行，
+    找到使两半之和最大的 seq2 切分点，再对两个子问题递归。递归只传递
+    下标区间；计算长度行时会临时切片复制当前区间（反向时再反转），
+    这些副本不超过 O(m+n)，用完即释放。
+    
+    Args:
+        seq1: 第一个序列
+        seq2: 第二个序列
+    
+    Returns:
+        list: 最长公共子序列的元素
+    """
+    lcs = []
+    
+    def solve(i0, i1, j0, j1):
+        if (i1 - i0) * (j1 - j0) <= _HIRSCHBERG_LEAF_CELLS or i1 - i0 <= 1:
+            lcs.extend(_lcs_table(seq1[i0:i1], seq2[j0:j1]))
+            return
+        mid = (i0 + i1) // 2
+        upper = _lcs_last_row(seq1[i0:mid], seq2[j0:j1])
+        lower = _lcs_last_row(seq1[mid:i1][::-1], seq2[j0:j1][::-1])
+        n = j1 - j0
+        # upper[k] + lower[n - k] 是 seq2 在 j0 + k 处切分时的 LCS 长度
+        split = max(range(n + 1), key=lambda k: upper[k] + lower[n - k])
+        del upper, lower
+        solve(i0, mid, j0, j0 + split)
+        solve(mid, i1, j0 + split, j1)
+    
+    solve(0, len(seq1), 0, len(seq2))
+    return lcs
+
+
+def _intern(seq1, seq2):
+    """
+    把两个序列的元素映射为整数编号，相同元素得到相同编号，使比较只需比较整数
+    
+    Args:
+        seq1: 第一个序列
+        seq2: 第二个序列
+    
+    Returns:
+        tuple: 两个整数列表
+    """
+    codes = {}
+    return ([codes.setdefault(x, len(codes)) for x in seq1],
+            [codes.setdefault(y, len(codes)) for y in seq2])
+
+
+def _myers_middle_snake(a, b, left, top, right, bottom):
+    """
+    在编辑图的一个矩形区域中查找 Myers 算法的中间蛇
+    
+    从左上角正向、从右下角反向同时扩展 D 条路径，两者相遇处的那段
+    路径（至多一次编辑加一段对角线）位于某条最短编辑路径的中间。
+    
+    Args:
+        a: 第一个序列
+        b: 第二个序列
+        left: 区域在 a 中的起始下标
+        top: 区域在 b 中的起始下标
+        right: 区域在 a 中的结束下标
+        bottom: 区域在 b 中的结束下标
+    
+    Returns:
+        tuple: 中间段的起点与终点 (x0, y0, x1, y1)
+    """
+    delta = (right - left) - (bottom - top)
+    odd = delta & 1
+    max_d = (right - left + bottom - top + 1) // 2
+    # 对角线编号可为负，利用 Python 的负下标，长度足以避免冲突
+    vf = [0] * (2 * max_d + 2)
+    vb = [0] * (2 * max_d + 2)
+    vf[1] = left
+    vb[1] = bottom
+    for d in range(max_d + 1):
+        # 正向：k 为相对左上角的对角线 x - y
+        for k in range(d, -d - 1, -2):
+            if k == -d or (k != d and vf[k - 1] < vf[k + 1]):
+                x = px = vf[k + 1]
+            else:
+                px = vf[k - 1]
+                x = px + 1
+            y = top + (x - left) - k
+            py = y if d == 0 or x != px else y - 1
+            while x < right and y < bottom and a[x] == b[y]:
+                x += 1
+                y += 1
+            vf[k] = x
+            c = k - delta
+            if odd and -(d - 1) <= c <= d - 1 and y >= vb[c]:
+                return px, py, x, y
+        # 反向：c 为相对右下角的对角线
+        for c in range(d, -d - 1, -2):
+            if c == -d or (c != d and vb[c - 1] > vb[c + 1]):
+                y = py = vb[c + 1]
+            else:
+                py = vb[c - 1]
+                y = py - 1
+            k = c + delta
+            x = left + (y - top) + k
+            px = x if d == 0 or y != py else x + 1
+            while x > left and y > top and a[x - 1] == b[y - 1]:
+                x -= 1
+                y -= 1
+            vb[c] = y
+            if not odd and -d <= k <= d and x <= vf[k]:
+                return x, y, px, py
+    raise AssertionError("未找到中间蛇")
+
+
+def _myers_matching_blocks(a, b):
+    """
+    用线性空间的 Myers 算法找出最短编辑脚本保留的公共片段
+    
+    时间为 O((m+n)*D)，D 为最少插入与删除次数之和，内存为 O(m+n)。
+    
+    Args:
+        a: 第一个序列
+        b: 第二个序列
+    
+    Returns:
+        list: 按顺序排列的公共片段 (i, j, size)，a[i:i+size] == b[j:j+size]
+    """
+    blocks = []
+    
+    def equal(i, j, size):
+        if size == 0:
+            return
+        if blocks and blocks[-1][0] + blocks[-1][2] == i and blocks[-1][1] + blocks[-1][2] == j:
+            i, j, size = blocks[-1][0], blocks[-1][1], blocks.pop()[2] + size
+        blocks.append((i, j, size))
+    
+    def solve(left, top, right, bottom):
+        # 去掉公共前缀和公共后缀
+        start_x, start_y = left, top
+        while left < right and top < bottom and a[left] == b[top]:
+            left += 1
+            top += 1
+        equal(start_x, start_y, left - start_x)
+        end_x, end_y = right, bottom
+        while left < right and top < bottom and a[right - 1] == b[bottom - 1]:
+            right -= 1
+            bottom -= 1
+        if left < right and top < bottom:
+            x0, y0, x1, y1 = _myers_middle_snake(a, b, left, top, right, bottom)
+            solve(left, top, x0, y0)
+            solve(x0, y0, x1, y1)
+            solve(x1, y1, right, bottom)
+        equal(right, bottom, end_x - right)
+    
+    solve(0, 0, len(a), len(b))
+    return blocks
+
+
+def _lcs_chunk(pairs, method):
+    """
+    在工作进程中计算一组字符串对的最长公共子序列
+    """
+    return [SequenceUtils.longest_common_subsequence(str1, str2, method=method)
+            for str1, str2 in pairs]
+
+
+# lcs_matrix 工作进程中的字符串列表，由 _init_matrix_worker 设置
+_matrix_strings = None
+
+
+def _init_matrix_worker(strings):
+    """
+    在每个工作进程启动时保存一次字符串列表，任务只需传递下标
+    """
+    global _matrix_strings
+    _matrix_strings = strings
+
+
+def _lcs_length_chunk(index_pairs, method):
+    """
+    在工作进程中计算一组下标对所指字符串的最长公共子序列长度
+    """
+    return [SequenceUtils.lcs_length(_matrix_strings[i], _matrix_strings[j], method=method)
+            for i, j in index_pairs]
+
+
+def _run_chunks(func, items, args, workers, chunksize, initializer=None, initargs=()):
+    """
+    把 items 分块交给进程池执行，并按输入顺序逐个产出结果
+    
+    任务按需提交，同时排队的任务不超过 workers * _BATCH_TASKS_PER_WORKER
+    个，因此 items 可以是很长甚至无限的迭代器，内存只与排队的任务有关。
+    
+    Args:
+        func: 处理一个分块的模块级函数，参数为 (chunk, *args)，返回结果列表
+        items: 输入的可迭代对象
+        args: 传给 func 的其余参数
+        workers: 进程数，为 1 时在当前进程中执行
+        chunksize: 每个分块的元素数
+        initializer: 工作进程启动时调用的函数
+        initargs: initializer 的参数
+    
+    Yields:
+        func 对每个元素的结果，顺序与 items 相同
+    
+    Raises:
+        ValueError: 如果 workers 或 chunksize 小于 1
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1 or chunksize < 1:
+        raise ValueError("workers 和 chunksize 必须至少为 1")
+    items = iter(items)
+    chunks = iter(lambda: list(islice(items, chunksize)), [])
+    if workers == 1:
+        if initializer is not None:
+            initializer(*initargs)
+        for chunk in chunks:
+            yield from func(chunk, *args)
+        return
+    pool = ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs)
+    try:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(func, chunk, *args))
+            if len(pending) >= workers * _BATCH_TASKS_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # 提前停止迭代时取消尚未开始的任务
+        pool.shutdown(wait=True, cancel_futures=True)
+
 
 class SequenceUtils:
     """
@@ -11,49 +496,199 @@ class SequenceUtils:
     """
 
     @staticmethod
-    def longest_common_subsequence(str1, str2):
+    def longest_common_subsequence(str1, str2, method="auto"):
         """
         计算两个字符串的最长公共子序列
         
+        默认在 DP 表不超过 LCS_TABLE_MAX_CELLS 个单元格时使用完整 DP 表，
+        更大的输入自动改用 Hirschberg 算法，内存占用从 O(m*n) 降到 O(m+n)，
+        时间复杂度仍为 O(m*n)。两种方法得到的子序列长度相同；
+        存在多个最长公共子序列时，选出的可能不同。
+        
         Args:
             str1 (str): 第一个字符串
             str2 (str): 第二个字符串
-            
+            method (str): "auto"、"table"（完整 DP 表）、"numpy"（用 NumPy
+                向量化填充的 DP 表，结果与 "table" 完全相同）、"hirschberg"
+                或 "myers"（时间与差异大小成正比，见 diff）
+        
         Returns:
             str: 最长公共子序列
+        
+        Raises:
+            ValueError: 如果 method 不受支持
+            ImportError: 如果 method 为 "numpy" 但没有安装 NumPy
         """
-        # 获取两个字符串的长度
-        m, n = len(str1), len(str2)
-        
-        # 创建一个二维数组来存储子问题的解
-        # dp[i][j] 表示 str1[0...i-1] 和 str2[0...j-1] 的最长公共子序列长度
-        dp = [[0] * (n + 1) for _ in range(m + 1)]
-        
-        # 填充 dp 数组
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if str1[i - 1] == str2[j - 1]:
-                    # 如果当前字符相同，则最长公共子序列长度加1
-                    dp[i][j] = dp[i - 1][j - 1] + 1
-                else:
-                    # 否则，取两种可能情况的最大值
-                    dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
-        
-        # 重建最长公共子序列
-        lcs = []
-        i, j = m, n
-        while i > 0 and j > 0:
-            if str1[i - 1] == str2[j - 1]:
-                # 当前字符是LCS的一部分
-                lcs.append(str1[i - 1])
-                i -= 1
-                j -= 1
-            elif dp[i - 1][j] > dp[i][j - 1]:
-                # 向上移动
-                i -= 1
-            else:
-                # 向左移动
-                j -= 1
+        if method == "auto":
+            cells = (len(str1) + 1) * (len(str2) + 1)
+            method = "table" if cells <= LCS_TABLE_MAX_CELLS else "hirschberg"
+        if method == "table":
+            lcs = _lcs_table(str1, str2)
+        elif method == "numpy":
+            lcs = _lcs_table_numpy(str1, str2)
+        elif method == "hirschberg":
+            lcs = _lcs_hirschberg(str1, str2)
+        elif method == "myers":
+            lcs = [str1[i + offset]
+                   for i, _, size in _myers_matching_blocks(*_intern(str1, str2))
+                   for offset in range(size)]
+        else:
+            raise ValueError(f"不支持的方法: {method}")
+        return ''.join(lcs)
+
+    @staticmethod
+    def diff(seq1, seq2):
+        """
+        计算把 seq1 变为 seq2 的最短编辑脚本
+        
+        使用线性空间的 Myers 差分算法，时间为 O((m+n)*D)，D 为差异大小
+        （插入与删除的元素总数），内存为 O(m+n)，适合差异较少的长序列，
+        例如大文件的行列表。序列元素可以是任意可哈希对象。
+        
+        编辑脚本的格式与 difflib.SequenceMatcher.get_opcodes() 相同：
+        每一项为 (tag, i1, i2, j1, j2)，tag 为 "equal"、"delete"、
+        "insert" 或 "replace"，表示 seq1[i1:i2] 对应 seq2[j1:j2]。
+        "equal" 片段组成一个最长公共子序列。
+        
+        Args:
+            seq1: 原序列，例如字符串或行列表
+            seq2: 目标序列
+        
+        Returns:
+            list: 覆盖两个序列全部元素的编辑操作
+        
+        Raises:
+            TypeError: 如果序列元素不可哈希
+        """
+        a, b = _intern(seq1, seq2)
+        opcodes = []
+        i = j = 0
+        for block_i, block_j, size in _myers_matching_blocks(a, b) + [(len(a), len(b), 0)]:
+            if i < block_i and j < block_j:
+                opcodes.append(("replace", i, block_i, j, block_j))
+            elif i < block_i:
+                opcodes.append(("delete", i, block_i, j, j))
+            elif j < block_j:
+                opcodes.append(("insert", i, i, j, block_j))
+            if size:
+                opcodes.append(("equal", block_i, block_i + size, block_j, block_j + size))
+            i, j = block_i + size, block_j + size
+        return opcodes
+
+    @staticmethod
+    def lcs_length(str1, str2, method="auto"):
+        """
+        计算两个字符串的最长公共子序列长度，不重建子序列
+        
+        "dp" 使用滚动的两行数组，O(m*n) 时间、O(min(m, n)) 内存；
+        "bitparallel" 使用位并行算法，每个字符只需几次大整数运算，
+        在长字符串上快几个数量级，但每个公共字符需要一个掩码。默认在
+        公共字母表不超过 LCS_BITPARALLEL_MAX_ALPHABET 时使用位并行算法。
+        
+        Args:
+            str1 (str): 第一个字符串
+            str2 (str): 第二个字符串
+            method (str): "auto"、"dp" 或 "bitparallel"
+        
+        Returns:
+            int: 最长公共子序列的长度
+        
+        Raises:
+            ValueError: 如果 method 不受支持，或 "bitparallel" 的公共字母表过大
+        """
+        if method not in ("auto", "dp", "bitparallel"):
+            raise ValueError(f"不支持的方法: {method}")
+        if method == "dp":
+            # 数组建在较短的字符串上
+            if len(str2) > len(str1):
+                str1, str2 = str2, str1
+            return _lcs_row_dp(str1, str2)[-1]
+        # 掩码建在较长的字符串上，外层循环次数更少
+        if len(str1) > len(str2):
+            str1, str2 = str2, str1
+        masks = _match_masks(str1, str2)
+        if masks is None:
+            if method == "bitparallel":
+                raise ValueError("公共字母表过大，无法使用位并行算法")
+            return _lcs_row_dp(str2, str1)[-1]
+        v = _lcs_bitparallel(str1, str2, masks)
+        return len(str2) - bin(v).count("1")
+
+    @staticmethod
+    def lcs_batch(pairs, workers=None, chunksize=LCS_BATCH_CHUNK_SIZE, method="auto"):
+        """
+        用多个进程批量计算字符串对的最长公共子序列
+        
+        字符串对按 chunksize 分块交给 ProcessPoolExecutor，结果以生成器
+        按输入顺序逐个返回。任务按需提交，排队的任务数与进程数成正比，
+        所以大批量（甚至无限的）输入不会把全部结果留在内存中。
+        
+        Args:
+            pairs: (str1, str2) 字符串对的可迭代对象
+            workers (int): 进程数，默认为 CPU 核数；为 1 时在当前进程中计算
+            chunksize (int): 每个任务包含的字符串对数量
+            method (str): 传给 longest_common_subsequence 的方法
+        
+        Yields:
+            str: 每一对的最长公共子序列，顺序与 pairs 相同
+        
+        Raises:
+            ValueError: 如果 workers 或 chunksize 小于 1
+        """
+        return _run_chunks(_lcs_chunk, pairs, (method,), workers, chunksize)
+
+    @staticmethod
+    def lcs_matrix(strings, workers=None, chunksize=256, method="auto"):
+        """
+        用多个进程计算一组字符串两两之间的最长公共子序列长度
+        
+        LCS 长度是对称的，所以只计算 i < j 的一半，再镜像到另一半，
+        对角线直接取字符串长度。字符串列表在每个工作进程启动时只传递
+        一次，任务中只包含下标对。
         
-        # 因为我们是从后向前构建的，所以需要反转
-        return ''.join(reversed(lcs))
+        Args:
+            strings (list): 字符串列表
+            workers (int): 进程数，默认为 CPU 核数；为 1 时在当前进程中计算
+            chunksize (int): 每个任务包含的字符串对数量
+            method (str): 传给 lcs_length 的方法
+        
+        Returns:
+            list: n x n 矩阵，第 i 行第 j 列为 strings[i] 与 strings[j] 的 LCS 长度
+        
+        Raises:
+            ValueError: 如果 workers 或 chunksize 小于 1
+        """
+        strings = list(strings)
+        n = len(strings)
+        matrix = [[0] * n for _ in range(n)]
+        for i in range(n):
+            matrix[i][i] = len(strings[i])
+        index_pairs = combinations(range(n), 2)
+        lengths = _run_chunks(
+            _lcs_length_chunk, index_pairs, (method,), workers, chunksize,
+            initializer=_init_matrix_worker, initargs=(strings,),
+        )
+        for (i, j), length in zip(combinations(range(n), 2), lengths):
+            matrix[i][j] = matrix[j][i] = length
+        return matrix
+
+    @staticmethod
+    def lcs_similarity(str1, str2, method="auto"):
+        """
+        计算两个字符串基于最长公共子序列的相似度
+        
+        相似度为 2 * LCS 长度 / 两个字符串的总长度，取值范围与
+        difflib.SequenceMatcher.ratio() 相同。
+        
+        Args:
+            str1 (str): 第一个字符串
+            str2 (str): 第二个字符串
+            method (str): 传给 lcs_length 的方法
+        
+        Returns:
+            float: 0.0 到 1.0 之间的相似度，两个空字符串为 1.0
+        """
+        total = len(str1) + len(str2)
+        if total == 0:
+            return 1.0
+        return 2 * SequenceUtils.lcs_length(str1, str2, method=method) / total
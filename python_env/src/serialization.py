@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Fast JSON serialization of item rows
+
+Listings select the response columns as plain tuples and encode them
+straight to JSON bytes, instead of loading ORM objects, validating each
+through ItemResponse and re-encoding with jsonable_encoder. orjson is used
+when installed, with the standard library as fallback; both produce the
+same bytes as FastAPI's default JSONResponse.
+
+Clients may select a subset of the fields with `fields=`; only those
+columns are then read and encoded.
+"""
+
+import functools
+import json
+
+from fastapi.responses import JSONResponse
+
+# ItemResponse fields in their serialized order
+ITEM_FIELDS = ("name", "description", "is_active", "id", "created_at", "updated_at")
+
+
+def _default(value):
+    """
+    Encode values the JSON encoder does not know, matching jsonable_encoder
+    """
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+@functools.lru_cache(maxsize=None)
+def get_orjson():
+    """
+    Import orjson on first use, keeping it off the application import path
+
+    Returns:
+        module: orjson, or None when it is not installed
+    """
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def dumps(content):
+    """
+    Encode content as compact UTF-8 JSON
+
+    Args:
+        content: JSON-compatible value; datetimes are written in ISO format
+
+    Returns:
+        bytes: Encoded JSON
+    """
+    orjson = get_orjson()
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_default,
+    ).encode("utf-8")
+
+
+def parse_fields(value):
+    """
+    Parse a `fields=` selection of item fields
+
+    Args:
+        value: Comma separated field names, or None for every field
+
+    Returns:
+        tuple: Selected fields in ITEM_FIELDS order
+
+    Raises:
+        ValueError: If a field is unknown or none is selected
+    """
+    if value is None:
+        return ITEM_FIELDS
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = names.difference(ITEM_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    if not names:
+        raise ValueError("No fields selected")
+    return tuple(field for field in ITEM_FIELDS if field in names)
+
+
+def rows_to_dicts(rows, fields=ITEM_FIELDS):
+    """
+    Pair row tuples with their field names
+
+    Args:
+        rows: Row tuples in `fields` order
+        fields: Field names
+
+    Returns:
+        list: One dict per row
+    """
+    return [dict(zip(fields, row)) for row in rows]
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson when available
+    """
+
+    def render(self, content):
+        return dumps(content)
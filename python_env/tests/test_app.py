@@ -4,15 +4,29 @@
 Tests for FastAPI application
 """
 
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
+import src.app as app_module
+from src import crud
 from src.app import app
+from src.bulk import MAX_LINE_BYTES
+from src.cache import item_cache
+from src.coalescer import WriteCoalescer
 from src.database import Base, get_db
 from src.models import Item
+from src.pagination import encode_cursor
 
 
 # Create in-memory SQLite database for testing
@@ -52,6 +66,9 @@ def test_client():
     # Create the database tables
     Base.metadata.create_all(bind=engine)
     
+    # Start from an empty item cache, since ids restart with each database
+    item_cache.clear()
+    
     # Create a test client
     client = TestClient(app)
     
@@ -164,3 +181,663 @@ def test_delete_item(test_client):
     # Try to get the deleted item
     response = test_client.get(f"/items/{item_id}")
     assert response.status_code == 404
+
+
+def test_create_item_coalesced(test_client, monkeypatch):
+    """
+    Test creating items through the write coalescer
+    
+    Args:
+        test_client: FastAPI test client
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    coalescer = WriteCoalescer(TestingSessionLocal, max_delay_ms=1)
+    monkeypatch.setattr(app_module, "write_coalescer", coalescer)
+    
+    response = test_client.post("/items/", json={"name": "Coalesced", "description": "Text"})
+    assert response.status_code == 201
+    item = response.json()
+    assert item["name"] == "Coalesced" and item["is_active"] is True
+    assert test_client.get(f"/items/{item['id']}").json() == item
+    assert coalescer.stats()["rows"] == 1
+
+
+def test_soft_delete_item(test_client):
+    """
+    Test deactivating an item instead of deleting it
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    item_id = test_client.post("/items/", json={"name": "Item"}).json()["id"]
+    assert test_client.get(f"/items/{item_id}").json()["is_active"] is True
+    
+    response = test_client.delete(f"/items/{item_id}", params={"soft": True})
+    assert response.status_code == 204
+    assert test_client.get(f"/items/{item_id}").json()["is_active"] is False
+
+
+def test_delete_items_bulk(test_client):
+    """
+    Test deleting items by id list and by filter
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    ids = test_client.post(
+        "/items/bulk", json=[{"name": f"Item {i}"} for i in range(6)]
+    ).json()["ids"]
+    # Cache one item so the delete has to invalidate it
+    test_client.get(f"/items/{ids[0]}")
+    
+    response = test_client.request("DELETE", "/items/", json=ids[:2] + [999])
+    assert response.status_code == 200
+    assert response.json() == {"deleted": 2, "soft": False}
+    assert test_client.get(f"/items/{ids[0]}").status_code == 404
+    
+    # The largest id list allowed is accepted, one more is refused
+    many = list(range(10 ** 6, 10 ** 6 + crud.MAX_DELETE_IDS))
+    response = test_client.request("DELETE", "/items/", json=many)
+    assert response.json() == {"deleted": 0, "soft": False}
+    response = test_client.request("DELETE", "/items/", json=many + [1])
+    assert response.status_code == 400
+    
+    response = test_client.delete("/items/", params={"name_prefix": "Item 2", "soft": True})
+    assert response.json() == {"deleted": 1, "soft": True}
+    response = test_client.get("/items/", params={"is_active": False})
+    assert [item["id"] for item in response.json()] == [ids[2]]
+    
+    response = test_client.delete("/items/", params={"is_active": True})
+    assert response.json() == {"deleted": 3, "soft": False}
+    assert len(test_client.get("/items/").json()) == 1
+    
+    # A selection is required
+    assert test_client.delete("/items/").status_code == 400
+
+
+def test_read_items_cursor_pagination(test_client):
+    """
+    Test walking the item list with keyset cursors in both orderings
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    for i in range(5):
+        test_client.post("/items/", json={"name": f"Item {i}"})
+    
+    for order_by in ("id", "created_at"):
+        # Walk forward with the after cursor
+        names = []
+        cursor = None
+        pages = 0
+        while True:
+            params = {"limit": 2, "order_by": order_by}
+            if cursor:
+                params["after"] = cursor
+            response = test_client.get("/items/", params=params)
+            assert response.status_code == 200
+            names.extend(item["name"] for item in response.json())
+            pages += 1
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+        assert names == [f"Item {i}" for i in range(5)]
+        assert pages == 3
+        
+        # Walk back from the last page with the before cursor
+        prev_cursor = response.headers["X-Prev-Cursor"]
+        response = test_client.get(
+            "/items/", params={"limit": 2, "order_by": order_by, "before": prev_cursor}
+        )
+        assert [item["name"] for item in response.json()] == ["Item 2", "Item 3"]
+        assert "X-Next-Cursor" in response.headers
+        assert 'rel="next"' in response.headers["Link"]
+
+
+def test_read_items_invalid_cursor(test_client):
+    """
+    Test that malformed or mismatched cursors are rejected
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    test_client.post("/items/", json={"name": "Item 1"})
+    test_client.post("/items/", json={"name": "Item 2"})
+    cursor = test_client.get("/items/", params={"limit": 1}).headers["X-Next-Cursor"]
+    
+    response = test_client.get("/items/", params={"after": "not-a-cursor"})
+    assert response.status_code == 400
+    
+    response = test_client.get("/items/", params={"after": cursor, "order_by": "created_at"})
+    assert response.status_code == 400
+    
+    response = test_client.get("/items/", params={"after": cursor, "skip": 1})
+    assert response.status_code == 400
+    
+    # Forged cursors with values of the wrong type or out of range
+    forged = [
+        ("name", [{"a": 1}, 1]),
+        ("created_at", [[1], 1]),
+        ("name", ["Item 1", True]),
+        ("id", [10 ** 30]),
+        ("id", ["1"]),
+    ]
+    for order_by, values in forged:
+        response = test_client.get("/items/", params={
+            "after": encode_cursor(order_by, values), "order_by": order_by,
+        })
+        assert response.status_code == 400, (order_by, values)
+
+
+def test_create_items_bulk_json(test_client):
+    """
+    Test bulk creation from a JSON array with an invalid item
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    payload = [
+        {"name": "Bulk 0"},
+        {"description": "missing name"},
+        {"name": "Bulk 2", "is_active": False},
+        "not an object",
+        {"name": "Bulk 4"},
+    ]
+    response = test_client.post("/items/bulk", params={"chunk_size": 2}, json=payload)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 3
+    assert [error["index"] for error in data["errors"]] == [1, 3]
+    
+    names = [test_client.get(f"/items/{item_id}").json()["name"] for item_id in data["ids"]]
+    assert names == ["Bulk 0", "Bulk 2", "Bulk 4"]
+
+
+def test_create_items_bulk_ndjson(test_client):
+    """
+    Test bulk creation from a streamed NDJSON body
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    def body():
+        yield b'{"name": "Line 0"}\n{"name": '
+        yield b'"Line 1"}\n\n{broken\n'
+        yield b'{"name": "Line 3"}'
+    
+    response = test_client.post(
+        "/items/bulk",
+        params={"chunk_size": 2},
+        content=body(),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 3
+    assert len(data["errors"]) == 1
+    assert data["errors"][0]["index"] == 2
+    assert len(test_client.get("/items/").json()) == 3
+    
+    # A line longer than the limit is refused instead of buffered
+    def long_line():
+        yield b'{"name": "Line 4"}\n{"name": "'
+        for _ in range(MAX_LINE_BYTES // 65536 + 1):
+            yield b"x" * 65536
+    
+    response = test_client.post(
+        "/items/bulk", content=long_line(), headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 413
+
+
+def test_create_items_bulk_rejects_non_array(test_client):
+    """
+    Test that a JSON body which is not an array is rejected
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    response = test_client.post("/items/bulk", json={"name": "Not a list"})
+    assert response.status_code == 400
+
+
+def test_export_items_ndjson(test_client):
+    """
+    Test exporting items as NDJSON
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    for i in range(5):
+        test_client.post("/items/", json={"name": f"Item {i}", "description": f"Line {i}"})
+    
+    response = test_client.get("/items/export", params={"batch_size": 2})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["name"] for row in rows] == [f"Item {i}" for i in range(5)]
+    assert rows[0]["description"] == "Line 0"
+    assert rows[0]["is_active"] is True
+    assert rows[0]["created_at"]
+
+
+def test_export_items_csv(test_client):
+    """
+    Test exporting items as CSV
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    test_client.post("/items/", json={"name": "Comma, item", "description": "Two\nlines"})
+    test_client.post("/items/", json={"name": "Plain"})
+    
+    response = test_client.get("/items/export", params={"format": "csv", "batch_size": 1})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["name"] for row in rows] == ["Comma, item", "Plain"]
+    assert rows[0]["description"] == "Two\nlines"
+    assert rows[1]["description"] == ""
+
+
+@pytest.fixture(scope="function")
+def async_test_client(tmp_path, monkeypatch):
+    """
+    Create a test client serving requests through an AsyncSession
+    
+    Args:
+        tmp_path: Temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+        
+    Returns:
+        TestClient: FastAPI test client using the aiosqlite driver
+    """
+    database_path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+    
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    AsyncTestingSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+    
+    async def override_get_async_db():
+        async with AsyncTestingSessionLocal() as db:
+            yield db
+    
+    app.dependency_overrides[get_db] = override_get_async_db
+    item_cache.clear()
+    # The schema was created above; the lifespan must not touch the
+    # application database
+    monkeypatch.setattr(app_module, "DATABASE_CREATE_SCHEMA", False)
+    with TestClient(app) as client:
+        yield client
+        client.portal.call(async_engine.dispose)
+    app.dependency_overrides[get_db] = override_get_db
+
+
+def test_async_session_endpoints(async_test_client):
+    """
+    Test the item endpoints when served through an AsyncSession
+    
+    Args:
+        async_test_client: FastAPI test client in async mode
+    """
+    response = async_test_client.post("/items/", json={"name": "Async Item"})
+    assert response.status_code == 201
+    item_id = response.json()["id"]
+    
+    response = async_test_client.post(
+        "/items/bulk", json=[{"name": "Bulk 1"}, {"name": "Bulk 2"}]
+    )
+    assert response.json()["created"] == 2
+    
+    response = async_test_client.get("/items/", params={"limit": 2})
+    assert [item["name"] for item in response.json()] == ["Async Item", "Bulk 1"]
+    response = async_test_client.get(
+        "/items/", params={"after": response.headers["X-Next-Cursor"]}
+    )
+    assert [item["name"] for item in response.json()] == ["Bulk 2"]
+    
+    response = async_test_client.get("/items/export")
+    assert len(response.text.splitlines()) == 3
+    
+    assert async_test_client.get(f"/items/{item_id}").json()["name"] == "Async Item"
+    assert async_test_client.delete(f"/items/{item_id}").status_code == 204
+    assert async_test_client.get(f"/items/{item_id}").status_code == 404
+
+
+def test_read_item_cache(test_client):
+    """
+    Test that repeat reads are served from the cache and writes invalidate it
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    item_id = test_client.post("/items/", json={"name": "Cached"}).json()["id"]
+    
+    first = test_client.get(f"/items/{item_id}")
+    second = test_client.get(f"/items/{item_id}")
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert first.json()["name"] == "Cached"
+    stats = test_client.get("/cache/stats").json()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+    
+    test_client.delete(f"/items/{item_id}")
+    assert test_client.get(f"/items/{item_id}").status_code == 404
+    assert test_client.get("/cache/stats").json()["size"] == 0
+
+
+def test_read_item_conditional_get(test_client):
+    """
+    Test ETag and If-None-Match on a single item, with and without the cache
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    item_id = test_client.post("/items/", json={"name": "Tagged"}).json()["id"]
+    
+    response = test_client.get(f"/items/{item_id}")
+    etag = response.headers["ETag"]
+    
+    response = test_client.get(f"/items/{item_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    
+    # Without a cached copy the version lookup answers on its own
+    item_cache.clear()
+    response = test_client.get(f"/items/{item_id}", headers={"If-None-Match": f'W/{etag}'})
+    assert response.status_code == 304
+    assert item_cache.stats()["size"] == 0
+    
+    response = test_client.get(f"/items/{item_id}", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+    assert response.headers["ETag"] == etag
+    
+    test_client.delete(f"/items/{item_id}")
+    response = test_client.get(f"/items/{item_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 404
+
+
+def test_read_items_conditional_get(test_client):
+    """
+    Test that the list ETag follows the table version and the page
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    test_client.post("/items/", json={"name": "Item 1"})
+    
+    response = test_client.get("/items/", params={"limit": 10})
+    etag = response.headers["ETag"]
+    response = test_client.get(
+        "/items/", params={"limit": 10}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    
+    # Another page of the same table version is a different representation
+    response = test_client.get(
+        "/items/", params={"limit": 5}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    
+    # Any write, including bulk inserts, changes the version
+    test_client.post("/items/bulk", json=[{"name": "Item 2"}])
+    response = test_client.get(
+        "/items/", params={"limit": 10}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["ETag"] != etag
+
+
+def test_search_items(test_client):
+    """
+    Test ranked full-text search with prefixes and cursor pagination
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    test_client.post("/items/bulk", json=[
+        {"name": "Red apple", "description": "A crisp fruit"},
+        {"name": "Green pear", "description": "Tastes a bit like apple"},
+        {"name": "Apple pie", "description": "Baked with apples"},
+        {"name": "Banana", "description": "Yellow fruit"},
+    ])
+    
+    response = test_client.get("/items/search", params={"q": "apple", "prefix": False})
+    assert response.status_code == 200
+    names = [item["name"] for item in response.json()]
+    # Name matches rank above the description-only match
+    assert set(names[:2]) == {"Red apple", "Apple pie"}
+    assert names[2] == "Green pear"
+    
+    response = test_client.get("/items/search", params={"q": "ban"})
+    assert [item["name"] for item in response.json()] == ["Banana"]
+    
+    response = test_client.get("/items/search", params={"q": "fruit yellow"})
+    assert [item["name"] for item in response.json()] == ["Banana"]
+    
+    # FTS5 syntax in the input is matched literally
+    response = test_client.get("/items/search", params={"q": 'apple" OR "banana'})
+    assert response.status_code == 200
+    
+    # Walk the results one per page
+    names = []
+    params = {"q": "appl", "limit": 1}
+    while True:
+        response = test_client.get("/items/search", params=params)
+        names.extend(item["name"] for item in response.json())
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["after"] = response.headers["X-Next-Cursor"]
+    assert len(names) == 3
+    assert set(names) == {"Red apple", "Apple pie", "Green pear"}
+
+
+def test_search_items_tracks_writes(test_client):
+    """
+    Test that the search index follows inserts and deletes
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    item_id = test_client.post("/items/", json={"name": "Searchable widget"}).json()["id"]
+    response = test_client.get("/items/search", params={"q": "widget"})
+    assert [item["id"] for item in response.json()] == [item_id]
+    
+    test_client.delete(f"/items/{item_id}")
+    response = test_client.get("/items/search", params={"q": "widget"})
+    assert response.json() == []
+    
+    response = test_client.get("/items/search", params={"q": "widget", "after": "bad"})
+    assert response.status_code == 400
+
+
+def test_read_items_filters_and_sorting(test_client):
+    """
+    Test filtering and sorting the item list
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    test_client.post("/items/bulk", json=[
+        {"name": "Banana"},
+        {"name": "Apple", "is_active": False},
+        {"name": "Apricot"},
+        {"name": "Cherry"},
+    ])
+    
+    response = test_client.get("/items/", params={"order_by": "name", "order": "desc"})
+    assert [item["name"] for item in response.json()] == ["Cherry", "Banana", "Apricot", "Apple"]
+    
+    response = test_client.get("/items/", params={"name_prefix": "Ap"})
+    assert [item["name"] for item in response.json()] == ["Apple", "Apricot"]
+    
+    response = test_client.get("/items/", params={"name_prefix": "Ap", "is_active": True})
+    assert [item["name"] for item in response.json()] == ["Apricot"]
+    
+    response = test_client.get("/items/", params={"is_active": False})
+    assert [item["name"] for item in response.json()] == ["Apple"]
+    
+    response = test_client.get("/items/", params={"created_after": "2000-01-01T00:00:00"})
+    assert len(response.json()) == 4
+    response = test_client.get("/items/", params={"created_before": "2000-01-01T00:00:00Z"})
+    assert response.json() == []
+    
+    # Cursor links keep the filters
+    response = test_client.get("/items/", params={"name_prefix": "Ap", "limit": 1})
+    assert "name_prefix=Ap" in response.headers["Link"]
+    response = test_client.get(
+        "/items/", params={"name_prefix": "Ap", "after": response.headers["X-Next-Cursor"]}
+    )
+    assert [item["name"] for item in response.json()] == ["Apricot"]
+    
+    # Filters that cannot share an index with the ordering are rejected
+    response = test_client.get("/items/", params={"name_prefix": "Ap", "order_by": "id"})
+    assert response.status_code == 400
+    response = test_client.get(
+        "/items/", params={"name_prefix": "Ap", "created_after": "2000-01-01T00:00:00"}
+    )
+    assert response.status_code == 400
+
+
+def test_read_items_fields(test_client):
+    """
+    Test partial responses selected with fields= on the item endpoints
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    test_client.post("/items/bulk", json=[
+        {"name": "Narrow 1", "description": "long " * 100},
+        {"name": "Narrow 2", "description": "long " * 100},
+    ])
+    
+    response = test_client.get("/items/", params={"fields": "name,id", "name_prefix": "Narrow"})
+    assert response.status_code == 200
+    items = response.json()
+    assert [list(item) for item in items] == [["name", "id"], ["name", "id"]]
+    assert [item["name"] for item in items] == ["Narrow 1", "Narrow 2"]
+    full = test_client.get("/items/", params={"name_prefix": "Narrow"})
+    assert full.headers["ETag"] != response.headers["ETag"]
+    
+    response = test_client.get("/items/search", params={"q": "narrow", "fields": "id", "limit": 1})
+    assert list(response.json()[0]) == ["id"]
+    assert "X-Next-Cursor" in response.headers
+    
+    # The same selection, read from the database and then from the cache
+    item_id = items[0]["id"]
+    uncached = test_client.get(f"/items/{item_id}", params={"fields": "id,is_active"})
+    assert uncached.json() == {"is_active": True, "id": item_id}
+    test_client.get(f"/items/{item_id}")
+    cached = test_client.get(f"/items/{item_id}", params={"fields": "id,is_active"})
+    assert cached.content == uncached.content
+    assert cached.headers["ETag"] == uncached.headers["ETag"]
+    response = test_client.get(f"/items/{item_id}", params={"fields": "id,is_active"},
+                               headers={"If-None-Match": cached.headers["ETag"]})
+    assert response.status_code == 304
+    
+    response = test_client.get("/items/", params={"fields": "id,secret"})
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
+
+
+def test_read_items_compressed(test_client):
+    """
+    Test that large item pages are compressed for clients accepting gzip
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    test_client.post("/items/bulk", json=[
+        {"name": f"Item {i}", "description": "lorem ipsum dolor sit amet " * 20}
+        for i in range(20)
+    ])
+    
+    response = test_client.get("/items/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(response.content) / 5
+    assert len(response.json()) == 20
+    
+    response = test_client.get("/items/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+
+
+def test_metrics_endpoint(test_client):
+    """
+    Test that requests show up at /metrics by route template
+    
+    Args:
+        test_client: FastAPI test client
+    """
+    test_client.get("/items/12345")
+    
+    response = test_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="GET",route="/items/{item_id}",status="404"}' in response.text
+    assert "# TYPE http_request_duration_seconds histogram" in response.text
+
+
+def test_lifespan_creates_schema(tmp_path, monkeypatch):
+    """
+    Test that the schema is created on startup rather than at import
+    
+    Args:
+        tmp_path: Temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    startup_engine = create_engine(f"sqlite:///{tmp_path / 'startup.db'}")
+    monkeypatch.setattr(app_module, "get_engine", lambda: startup_engine)
+    monkeypatch.setattr(app_module, "DATABASE_CREATE_SCHEMA", True)
+    
+    assert not inspect(startup_engine).has_table("items")
+    with TestClient(app):
+        assert inspect(startup_engine).has_table("items")
+    startup_engine.dispose()
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run")
+def test_import_time_within_budget():
+    """
+    Test that importing the application stays within its cold start
+    budget and does not touch the database
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, os.path.join(project_root, "scripts", "bench_import.py"),
+         "--json", "--runs", "3"],
+        capture_output=True, text=True,
+    )
+    report = json.loads(result.stdout)
+    assert not report["touched_database"]
+    assert report["within_budget"], report
+
+
+def test_bench_api_smoke(tmp_path):
+    """
+    Test that the HTTP load test runs against a served app and saves its
+    results
+    
+    Args:
+        tmp_path: Temporary directory
+    """
+    pytest.importorskip("aiohttp")
+    pytest.importorskip("uvicorn")
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output = tmp_path / "bench.json"
+    subprocess.run(
+        [sys.executable, os.path.join(project_root, "scripts", "bench_api.py"),
+         "--requests", "60", "--concurrency", "4", "--seed-rows", "50",
+         "--output", str(output)],
+        capture_output=True, text=True, check=True, timeout=120,
+    )
+    result = json.loads(output.read_text())
+    assert result["total"]["requests"] == 60
+    assert result["total"]["errors"] == 0
+    assert set(result["operations"]) == {"list", "get", "create", "delete"}
+    assert result["total"]["p50_ms"] <= result["total"]["p99_ms"]
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for item archiving
+"""
+
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.archive import ItemArchiver, archive_inactive_items
+from src.database import Base
+from src.models import ArchivedItem, Item
+
+
+@pytest.fixture
+def session_factory():
+    """
+    Create a session factory on a database with active and inactive items
+    
+    Returns:
+        sessionmaker: Session factory
+    """
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.execute(insert(Item), [
+            {"name": f"Item {i}", "description": f"word{i}", "is_active": i % 2 == 0}
+            for i in range(25)
+        ])
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+def test_archive_inactive_items(session_factory):
+    """
+    Test that inactive items are moved in chunks and active ones stay
+    
+    Args:
+        session_factory: Session factory
+    """
+    chunks = []
+    with session_factory() as db:
+        moved = archive_inactive_items(db, chunk_size=5, on_chunk=chunks.append)
+        
+        assert moved == 12
+        assert [len(chunk) for chunk in chunks] == [5, 5, 2]
+        assert db.scalar(text("SELECT count(*) FROM items WHERE is_active = 0")) == 0
+        assert db.scalar(text("SELECT count(*) FROM items")) == 13
+        archived = db.execute(select(ArchivedItem.id, ArchivedItem.name, ArchivedItem.archived_at)
+                              .order_by(ArchivedItem.id)).all()
+        assert [row.id for row in archived] == [i + 1 for i in range(25) if i % 2]
+        assert archived[0].name == "Item 1" and archived[0].archived_at is not None
+        # Archived items leave the full-text index
+        assert db.scalar(text("SELECT count(*) FROM items_fts WHERE items_fts MATCH 'word1'")) == 0
+        
+        assert archive_inactive_items(db) == 0
+
+
+def test_archive_max_chunks(session_factory):
+    """
+    Test that a run can be bounded to a number of chunks
+    
+    Args:
+        session_factory: Session factory
+    """
+    with session_factory() as db:
+        assert archive_inactive_items(db, chunk_size=5, max_chunks=1) == 5
+
+
+def test_item_archiver_background(session_factory):
+    """
+    Test the background task archives and stops cleanly
+    
+    Args:
+        session_factory: Session factory
+    """
+    archived = []
+    archiver = ItemArchiver(session_factory, interval=0.01, on_chunk=archived.extend)
+    
+    async def run():
+        archiver.start()
+        for _ in range(200):
+            if len(archived) == 12:
+                break
+            await asyncio.sleep(0.01)
+        await archiver.stop()
+    
+    asyncio.run(run())
+    assert len(archived) == 12
+
+
+def test_item_archiver_thread(session_factory):
+    """
+    Test archiving from a daemon thread, as the multi-worker supervisor does
+    
+    Args:
+        session_factory: Session factory
+    """
+    archived = []
+    archiver = ItemArchiver(session_factory, interval=0.01, on_chunk=archived.extend)
+    stopped = archiver.start_thread()
+    for _ in range(200):
+        if len(archived) == 12:
+            break
+        time.sleep(0.01)
+    stopped.set()
+    assert len(archived) == 12
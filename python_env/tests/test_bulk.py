@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for batched item ingestion helpers
+"""
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.app import ItemCreate
+from src.bulk import BulkLoader, LineTooLongError, NDJSONSplitter
+from src.database import Base
+from src.models import Item
+
+
+@pytest.fixture(scope="function")
+def db():
+    """
+    Create a session bound to a fresh in-memory database
+    
+    Returns:
+        Session: Database session
+    """
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_ndjson_splitter():
+    """
+    Test that lines split across chunks are reassembled
+    """
+    splitter = NDJSONSplitter()
+    assert splitter.feed(b'{"a": 1}\n{"b"') == [b'{"a": 1}']
+    assert splitter.feed(b': 2}\n') == [b'{"b": 2}']
+    assert splitter.feed(b'{"c": 3}') == []
+    assert splitter.close() == [b'{"c": 3}']
+    
+    # A line spread over many chunks is joined once
+    splitter = NDJSONSplitter()
+    for _ in range(1000):
+        assert splitter.feed(b"x" * 10) == []
+    assert splitter.feed(b"\n\ny") == [b"x" * 10000, b""]
+    assert splitter.close() == [b"y"]
+
+
+def test_ndjson_splitter_rejects_long_lines():
+    """
+    Test that a line over the limit is rejected, complete or still pending
+    """
+    splitter = NDJSONSplitter(max_line_bytes=8)
+    assert splitter.feed(b"12345678\n1234") == [b"12345678"]
+    with pytest.raises(LineTooLongError):
+        splitter.feed(b"56789")
+    
+    with pytest.raises(LineTooLongError):
+        NDJSONSplitter(max_line_bytes=8).feed(b"123456789\n")
+
+
+def test_bulk_loader_chunks(db):
+    """
+    Test that rows are inserted one transaction per chunk
+    
+    Args:
+        db: Database session
+    """
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(1))
+    
+    loader = BulkLoader(ItemCreate, chunk_size=3)
+    for i in range(7):
+        loader.add({"name": f"Item {i}"})
+        if loader.full:
+            loader.flush(db)
+    loader.flush(db)
+    
+    result = loader.result()
+    assert result["created"] == 7
+    assert result["errors"] == []
+    assert len(commits) == 3
+    names = [db.get(Item, item_id).name for item_id in result["ids"]]
+    assert names == [f"Item {i}" for i in range(7)]
+
+
+def test_bulk_loader_isolates_failing_rows(db):
+    """
+    Test that a failing chunk is retried row by row
+    
+    Args:
+        db: Database session
+    """
+    db.execute(text(
+        "CREATE TRIGGER reject_item BEFORE INSERT ON items WHEN NEW.name = 'Rejected' "
+        "BEGIN SELECT RAISE(ABORT, 'item rejected'); END"
+    ))
+    db.commit()
+    
+    loader = BulkLoader(ItemCreate, chunk_size=10)
+    loader.add({"name": "First"})
+    loader.add({"name": "Rejected"})
+    loader.add({"name": "Third"})
+    loader.flush(db)
+    
+    result = loader.result()
+    assert result["created"] == 2
+    assert [error["index"] for error in result["errors"]] == [1]
+    assert result["errors"][0]["error"] == "item rejected"
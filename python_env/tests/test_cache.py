@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the item cache
+"""
+
+import fnmatch
+import sys
+
+import pytest
+
+from src.cache import ItemCache, LRUBackend, NullBackend, SharedBackend, create_backend
+
+
+class FakeClock:
+    """
+    Manually advanced time source
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """
+    Minimal Redis-style client storing values in a dict
+    """
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match="*"):
+        return [key for key in list(self.data) if fnmatch.fnmatchcase(key, match)]
+
+
+def test_lru_backend_evicts_least_recently_used():
+    """
+    Test that the oldest unused entry is evicted first
+    """
+    backend = LRUBackend(maxsize=2, ttl=60)
+    backend.set(1, b"one")
+    backend.set(2, b"two")
+    assert backend.get(1) == b"one"
+    backend.set(3, b"three")
+    assert backend.get(2) is None
+    assert backend.get(1) == b"one"
+    assert backend.get(3) == b"three"
+    assert backend.evictions == 1
+    assert len(backend) == 2
+
+
+def test_lru_backend_expires_entries():
+    """
+    Test that entries expire after the TTL
+    """
+    clock = FakeClock()
+    backend = LRUBackend(maxsize=10, ttl=5, clock=clock)
+    backend.set(1, b"one")
+    clock.now = 4.9
+    assert backend.get(1) == b"one"
+    clock.now = 5.0
+    assert backend.get(1) is None
+    assert len(backend) == 0
+
+
+def test_item_cache_counters():
+    """
+    Test hit and miss counting
+    """
+    cache = ItemCache(LRUBackend(maxsize=10, ttl=60))
+    assert cache.get(1) is None
+    cache.set(1, '"1-a"', b"one", cache.generation)
+    assert cache.get(1) == ('"1-a"', b"one")
+    assert cache.get(1) == ('"1-a"', b"one")
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == pytest.approx(2 / 3)
+
+
+def test_item_cache_ignores_fill_raced_by_invalidation():
+    """
+    Test that a fill started before an invalidation is dropped
+    """
+    cache = ItemCache(LRUBackend(maxsize=10, ttl=60))
+    generation = cache.generation
+    cache.invalidate(1)
+    cache.set(1, '"1-a"', b"stale", generation)
+    assert cache.get(1) is None
+    
+    cache.set(1, '"1-b"', b"fresh", cache.generation)
+    cache.invalidate(1)
+    assert cache.get(1) is None
+
+
+def test_item_cache_keeps_fill_raced_by_other_writes():
+    """
+    Test that writes to other items do not drop a concurrent fill
+    """
+    cache = ItemCache(LRUBackend(maxsize=10, ttl=60), max_tombstones=2)
+    generation = cache.generation
+    cache.invalidate(2)
+    cache.invalidate(3)
+    cache.set(1, '"1-a"', b"one", generation)
+    assert cache.get(1) == ('"1-a"', b"one")
+    
+    # Once the tombstone of an item is forgotten, older fills are dropped
+    generation = cache.generation
+    cache.invalidate(5)
+    cache.invalidate(6, 7)
+    cache.set(5, '"5-a"', b"stale", generation)
+    assert cache.get(5) is None
+    cache.set(5, '"5-b"', b"fresh", cache.generation)
+    assert cache.get(5) == ('"5-b"', b"fresh")
+
+
+def test_shared_and_null_backends():
+    """
+    Test the shared backend key namespace and the disabled backend
+    """
+    client = FakeRedis()
+    cache = ItemCache(SharedBackend(client, ttl=30, prefix="item:"))
+    cache.set(7, '"7-a"', b"seven", cache.generation)
+    assert client.data == {"item:7": b'"7-a"\nseven'}
+    assert cache.get(7) == ('"7-a"', b"seven")
+    cache.invalidate(7)
+    assert client.data == {}
+    
+    cache = ItemCache(NullBackend())
+    cache.set(7, '"7-a"', b"seven", cache.generation)
+    assert cache.get(7) is None
+
+
+def test_shared_backend_clear():
+    """
+    Test that clearing the shared backend only drops keys under its prefix
+    """
+    client = FakeRedis()
+    client.data["session:1"] = b"other"
+    cache = ItemCache(SharedBackend(client, prefix="item:"))
+    for item_id in range(1500):
+        cache.set(item_id, '"a"', b"body", cache.generation)
+    cache.clear()
+    assert client.data == {"session:1": b"other"}
+
+
+def test_create_backend(monkeypatch):
+    """
+    Test the backend selection from the configuration
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    assert isinstance(create_backend(size=0, url="redis://localhost"), NullBackend)
+    assert create_backend(size=5, url="").maxsize == 5
+    
+    # A None entry makes `import redis` fail as if it were not installed
+    monkeypatch.setitem(sys.modules, "redis", None)
+    with pytest.raises(ImportError):
+        create_backend(size=5, url="redis://localhost")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for group commit of item creations
+"""
+
+import asyncio
+import os
+import time
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from src import crud
+from src.coalescer import WriteCoalescer
+from src.database import Base
+from src.serialization import ITEM_FIELDS
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """
+    Create a session factory on an empty file database
+    
+    Args:
+        tmp_path: Temporary directory
+        
+    Returns:
+        sessionmaker: Session factory
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'items.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def test_concurrent_creates_share_batches(session_factory):
+    """
+    Test that concurrent creates are committed together and each caller
+    gets its own row
+    
+    Args:
+        session_factory: Session factory
+    """
+    coalescer = WriteCoalescer(session_factory, max_delay_ms=20, max_rows=10)
+    
+    async def run():
+        rows = await asyncio.gather(*[
+            coalescer.create_item({"name": f"Item {i}"}) for i in range(25)
+        ])
+        await coalescer.close()
+        return rows
+    
+    rows = asyncio.run(run())
+    items = [dict(zip(ITEM_FIELDS, row)) for row in rows]
+    assert [item["name"] for item in items] == [f"Item {i}" for i in range(25)]
+    assert sorted(item["id"] for item in items) == list(range(1, 26))
+    assert all(item["created_at"] is not None for item in items)
+    assert coalescer.stats()["rows"] == 25
+    assert coalescer.stats()["batches"] == 3
+    with session_factory() as db:
+        assert db.scalar(text("SELECT count(*) FROM items")) == 25
+
+
+def test_rejected_row_fails_only_its_caller(session_factory):
+    """
+    Test that a failing batch is retried row by row
+    
+    Args:
+        session_factory: Session factory
+    """
+    with session_factory() as db:
+        db.execute(text(
+            "CREATE TRIGGER reject_bad BEFORE INSERT ON items WHEN new.name = 'bad' "
+            "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        ))
+        db.commit()
+    coalescer = WriteCoalescer(session_factory, max_delay_ms=20)
+    
+    async def run():
+        results = await asyncio.gather(
+            coalescer.create_item({"name": "good 1"}),
+            coalescer.create_item({"name": "bad"}),
+            coalescer.create_item({"name": "good 2"}),
+            return_exceptions=True,
+        )
+        await coalescer.close()
+        return results
+    
+    good_1, bad, good_2 = asyncio.run(run())
+    assert isinstance(bad, SQLAlchemyError)
+    assert good_1[0] == "good 1" and good_2[0] == "good 2"
+    with session_factory() as db:
+        assert db.scalar(text("SELECT count(*) FROM items")) == 2
+
+
+def test_close_flushes_and_rejects_new_creates(session_factory):
+    """
+    Test that closing writes the queued creates
+    
+    Args:
+        session_factory: Session factory
+    """
+    coalescer = WriteCoalescer(session_factory, max_delay_ms=10000)
+    
+    async def run():
+        pending = asyncio.ensure_future(coalescer.create_item({"name": "Item"}))
+        await asyncio.sleep(0)
+        await coalescer.close()
+        with pytest.raises(RuntimeError):
+            await coalescer.create_item({"name": "Late"})
+        return await pending
+    
+    assert asyncio.run(run())[0] == "Item"
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run")
+def test_coalescing_benchmark(session_factory):
+    """
+    Compare the throughput of concurrent creates committed one by one and
+    through the coalescer
+    
+    Args:
+        session_factory: Session factory
+    """
+    creates = 200
+    
+    def create_alone(data):
+        with session_factory() as db:
+            return crud.create_item(db, data)
+    
+    async def one_by_one():
+        await asyncio.gather(*[
+            run_in_threadpool(create_alone, {"name": f"Item {i}"}) for i in range(creates)
+        ])
+    
+    async def coalesced():
+        coalescer = WriteCoalescer(session_factory, max_delay_ms=2)
+        await asyncio.gather(*[
+            coalescer.create_item({"name": f"Item {i}"}) for i in range(creates)
+        ])
+        await coalescer.close()
+    
+    rates = {}
+    for label, run in (("one by one", one_by_one), ("coalesced", coalesced)):
+        start = time.perf_counter()
+        asyncio.run(run())
+        rates[label] = creates / (time.perf_counter() - start)
+    
+    print(", ".join(f"{label}: {rate:.0f} creates/s" for label, rate in rates.items()))
+    # One commit per batch instead of per create is 20-30x faster on a
+    # file database; 2x still fails if creates stop being batched
+    assert rates["coalesced"] > rates["one by one"] * 2
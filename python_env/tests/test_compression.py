@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for response compression
+"""
+
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.compression import CompressionMiddleware, compress, negotiate_encoding
+
+BODY = b'{"description": "' + b"lorem ipsum dolor sit amet " * 200 + b'"}'
+
+
+@pytest.fixture
+def client():
+    """
+    Create a client of an app serving a few kinds of responses
+    
+    Returns:
+        TestClient: Client of the compressed app
+    """
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+    
+    @app.get("/large")
+    def large():
+        return Response(BODY, media_type="application/json", headers={"ETag": '"v1"'})
+    
+    @app.get("/small")
+    def small():
+        return Response(b'{"ok": true}', media_type="application/json")
+    
+    @app.get("/image")
+    def image():
+        return Response(BODY, media_type="image/png")
+    
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(BODY), media_type="application/json",
+                        headers={"Content-Encoding": "gzip"})
+    
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(
+            (b"line %d " % i + b"x" * 50 + b"\n" for i in range(500)),
+            media_type="application/x-ndjson",
+        )
+    
+    @app.get("/not-modified")
+    def not_modified():
+        return Response(status_code=304, headers={"ETag": '"v1"'})
+    
+    return TestClient(app)
+
+
+def test_negotiate_encoding():
+    """
+    Test picking an encoding from Accept-Encoding
+    """
+    encodings = ("br", "gzip", "deflate")
+    assert negotiate_encoding(None, encodings) is None
+    assert negotiate_encoding("identity", encodings) is None
+    assert negotiate_encoding("gzip, deflate", encodings) == "gzip"
+    assert negotiate_encoding("gzip, deflate, br", encodings) == "br"
+    assert negotiate_encoding("br;q=0.5, gzip;q=0.9", encodings) == "gzip"
+    assert negotiate_encoding("br;q=0, *", encodings) == "gzip"
+    assert negotiate_encoding("gzip;q=0", encodings) is None
+    assert negotiate_encoding("DEFLATE;Q=1", encodings) == "deflate"
+    assert negotiate_encoding("gzip;q=bad, deflate", encodings) == "deflate"
+    assert negotiate_encoding("br", ("gzip", "deflate")) is None
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+def test_compress_roundtrip(encoding):
+    """
+    Test that encoded bodies decode with the standard library
+    
+    Args:
+        encoding: Content encoding
+    """
+    data = compress(BODY, encoding, level=1)
+    assert len(data) < len(BODY)
+    wbits = zlib.MAX_WBITS | 16 if encoding == "gzip" else zlib.MAX_WBITS
+    assert zlib.decompress(data, wbits) == BODY
+
+
+def test_compress_brotli():
+    """
+    Test brotli encoding when the module is installed
+    """
+    brotli = pytest.importorskip("brotli")
+    assert brotli.decompress(compress(BODY, "br")) == BODY
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+def test_large_response_compressed(client, encoding):
+    """
+    Test that large bodies are compressed with the negotiated encoding
+    
+    Args:
+        client: Test client
+        encoding: Accepted encoding
+    """
+    response = client.get("/large", headers={"Accept-Encoding": encoding})
+    assert response.headers["content-encoding"] == encoding
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert response.content == BODY
+
+
+def test_responses_passed_through(client):
+    """
+    Test responses that must not be compressed
+    
+    Args:
+        client: Test client
+    """
+    headers = {"Accept-Encoding": "gzip"}
+    for path in ("/small", "/image"):
+        response = client.get(path, headers=headers)
+        assert "content-encoding" not in response.headers
+    
+    response = client.get("/encoded", headers=headers)
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
+    
+    response = client.get("/not-modified", headers=headers)
+    assert response.status_code == 304
+    assert response.headers["etag"] == '"v1"'
+    
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == '"v1"'
+
+
+def test_not_modified_keeps_weak_etag(client):
+    """
+    Test that a 304 repeats the weak ETag a compressed response gave out
+    
+    Args:
+        client: Test client
+    """
+    headers = {"Accept-Encoding": "gzip"}
+    etag = client.get("/large", headers=headers).headers["etag"]
+    assert etag == 'W/"v1"'
+    
+    response = client.get("/not-modified", headers=dict(headers, **{"If-None-Match": etag}))
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.headers["vary"] == "Accept-Encoding"
+    
+    # A client holding the identity representation keeps its strong ETag
+    response = client.get("/not-modified", headers={"If-None-Match": '"v1"'})
+    assert response.headers["etag"] == '"v1"'
+    assert "vary" not in response.headers
+
+
+def test_streaming_response_compressed(client):
+    """
+    Test that streamed bodies are compressed as they are produced
+    
+    Args:
+        client: Test client
+    """
+    with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    expected = b"".join(b"line %d " % i + b"x" * 50 + b"\n" for i in range(500))
+    assert gzip.decompress(raw) == expected
+    assert len(raw) < len(expected) / 5
+
@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for item queries
+"""
+
+import itertools
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import Session
+
+from src import crud
+from src.database import Base
+from src.models import Item
+from src.serialization import ITEM_FIELDS
+
+# Filter sets supported by GET /items/, with the orderings they allow
+FILTERS = {
+    "none": {},
+    "is_active": {"is_active": True},
+    "created_range": {
+        "created_after": datetime(2024, 1, 1, 0, 10),
+        "created_before": datetime(2024, 1, 1, 2, 0),
+    },
+    "name_prefix": {"name_prefix": "Item 1"},
+    "is_active+created_range": {
+        "is_active": False,
+        "created_after": datetime(2024, 1, 1, 0, 10),
+    },
+    "is_active+name_prefix": {"is_active": True, "name_prefix": "Item"},
+}
+
+ORDERINGS = ("id", "created_at", "name")
+
+
+def supported_combinations():
+    """
+    List every filter set, ordering and direction GET /items/ accepts
+    """
+    for (label, filters), order_by, descending in itertools.product(
+            FILTERS.items(), ORDERINGS, (False, True)):
+        try:
+            crud.resolve_order_by(
+                order_by, filters.get("name_prefix"),
+                created_range="created_after" in filters or "created_before" in filters,
+            )
+        except ValueError:
+            continue
+        yield pytest.param(filters, order_by, descending,
+                           id=f"{label}-{order_by}-{'desc' if descending else 'asc'}")
+
+
+@pytest.fixture(scope="module")
+def db():
+    """
+    Create a session on a populated, analyzed database
+    
+    Returns:
+        Session: Database session
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    start = datetime(2024, 1, 1)
+    with Session(engine) as session:
+        session.execute(insert(Item), [
+            {
+                "name": f"Item {i}",
+                "is_active": i % 3 != 0,
+                "created_at": start + timedelta(minutes=i),
+            }
+            for i in range(300)
+        ])
+        session.execute(text("ANALYZE"))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def test_resolve_order_by():
+    """
+    Test ordering inference and rejection of unindexed combinations
+    """
+    assert crud.resolve_order_by() == "id"
+    assert crud.resolve_order_by(name_prefix="a") == "name"
+    assert crud.resolve_order_by(created_range=True) == "created_at"
+    assert crud.resolve_order_by("created_at", created_range=True) == "created_at"
+    with pytest.raises(ValueError):
+        crud.resolve_order_by("id", name_prefix="a")
+    with pytest.raises(ValueError):
+        crud.resolve_order_by(name_prefix="a", created_range=True)
+
+
+def test_list_items_filters(db):
+    """
+    Test that the filters select the expected rows
+    
+    Args:
+        db: Database session
+    """
+    rows, _, _ = crud.list_items(db, order_by="name", name_prefix="Item 29", limit=100)
+    assert [row[0] for row in rows] == ["Item 29"] + [f"Item {i}" for i in range(290, 300)]
+    
+    rows, _, _ = crud.list_items(
+        db, order_by="created_at", limit=100, is_active=True,
+        created_after=datetime(2024, 1, 1, 0, 3), created_before=datetime(2024, 1, 1, 0, 9),
+    )
+    assert [row[0] for row in rows] == ["Item 4", "Item 5", "Item 7", "Item 8"]
+    
+    rows, next_cursor, _ = crud.list_items(db, order_by="id", limit=2, descending=True)
+    assert [row[0] for row in rows] == ["Item 299", "Item 298"]
+    rows, _, _ = crud.list_items(db, order_by="id", limit=2, descending=True, after=next_cursor)
+    assert [row[0] for row in rows] == ["Item 297", "Item 296"]
+
+
+@pytest.mark.parametrize("filters,order_by,descending", list(supported_combinations()))
+def test_list_items_uses_index(db, filters, order_by, descending):
+    """
+    Test with EXPLAIN QUERY PLAN that every supported listing is served by
+    an index, for the first page and for cursor pages in both directions
+    
+    Args:
+        db: Database session
+        filters: Filter arguments of the listing
+        order_by: Ordering key
+        descending: Whether the ordering is descending
+    """
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+    
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        _, next_cursor, _ = crud.list_items(
+            db, order_by=order_by, limit=2, descending=descending, **filters)
+        assert next_cursor is not None
+        _, _, prev_cursor = crud.list_items(
+            db, order_by=order_by, limit=2, descending=descending, after=next_cursor, **filters)
+        crud.list_items(
+            db, order_by=order_by, limit=2, descending=descending, before=prev_cursor, **filters)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    
+    assert len(statements) == 3
+    for statement, parameters in statements:
+        plan = [row[3] for row in connection.exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", parameters)]
+        assert not any("TEMP B-TREE" in detail for detail in plan), plan
+        if filters:
+            assert any("USING INDEX" in detail or "USING COVERING INDEX" in detail
+                       for detail in plan), plan
+        else:
+            # Unfiltered listings walk the index or the rowid b-tree in order
+            assert all(detail.startswith(("SCAN items", "SEARCH items")) for detail in plan), plan
+
+
+def test_list_items_selects_fields(db):
+    """
+    Test that a field selection narrows the SELECT and keeps cursors working
+    
+    Args:
+        db: Database session
+    """
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        rows, next_cursor, _ = crud.list_items(
+            db, order_by="name", limit=2, name_prefix="Item 1", fields=("id",))
+        next_rows, _, _ = crud.list_items(
+            db, order_by="name", limit=2, name_prefix="Item 1", fields=("id",),
+            after=next_cursor)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    
+    assert rows == [(2,), (11,)]
+    assert next_rows == [(101,), (102,)]
+    assert len(statements) == 2
+    selected = statements[0].split("FROM")[0]
+    assert "description" not in selected and "is_active" not in selected
+    
+    row, created_at, updated_at = crud.get_item_fields(db, 2, ("name", "is_active"))
+    assert row == ("Item 1", True)
+    assert created_at == datetime(2024, 1, 1, 0, 1)
+    assert crud.get_item_fields(db, 10000, ("name",)) is None
+
+
+@pytest.fixture
+def empty_db():
+    """
+    Create a session on an empty database
+    
+    Returns:
+        Session: Database session
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_delete_items(empty_db):
+    """
+    Test set-based hard and soft deletes
+    
+    Args:
+        empty_db: Database session
+    """
+    empty_db.execute(insert(Item), [{"name": f"Item {i}"} for i in range(10)])
+    empty_db.commit()
+    
+    deleted = crud.delete_items(empty_db, [Item.id.in_([1, 2, 99])])
+    assert sorted(deleted) == [1, 2]
+    
+    deactivated = crud.delete_items(empty_db, crud.item_filters(name_prefix="Item 3"), soft=True)
+    assert deactivated == [4]
+    # Items already inactive are not counted again
+    assert crud.delete_items(empty_db, [Item.id == 4], soft=True) == []
+    
+    rows = empty_db.execute(text("SELECT id, is_active, updated_at FROM items WHERE id = 4")).one()
+    assert rows[1] == 0 and rows[2] is not None
+    assert empty_db.scalar(text("SELECT count(*) FROM items")) == 8
+
+
+def test_get_table_version(empty_db):
+    """
+    Test the items change counter, and its absence on unversioned databases
+    
+    Args:
+        empty_db: Database session
+    """
+    version = crud.get_table_version(empty_db)
+    crud.create_item(empty_db, {"name": "Item 0"})
+    assert crud.get_table_version(empty_db) == version + 1
+    assert crud.get_table_version(empty_db, "unknown") is None
+    
+    engine = create_engine("sqlite:///:memory:")
+    Item.__table__.create(bind=engine)
+    with Session(engine) as session:
+        assert crud.get_table_version(session) is None
+    engine.dispose()
+
+
+def test_delete_item(empty_db):
+    """
+    Test deleting a single item without loading it
+    
+    Args:
+        empty_db: Database session
+    """
+    empty_db.execute(insert(Item), [{"name": "Item 0"}, {"name": "Item 1"}])
+    empty_db.commit()
+    
+    assert crud.delete_item(empty_db, 1)
+    assert not crud.delete_item(empty_db, 1)
+    assert crud.delete_item(empty_db, 2, soft=True)
+    assert empty_db.scalar(text("SELECT is_active FROM items WHERE id = 2")) == 0
+
+
+def legacy_create_item(db, data):
+    """
+    Insert an item the way create_item used to: commit, then refresh
+    """
+    db_item = Item(**data)
+    db.add(db_item)
+    db.commit()
+    db.refresh(db_item)
+    return db_item
+
+
+def test_create_item_single_statement(empty_db):
+    """
+    Test that an item is created and read back by one statement
+    
+    Args:
+        empty_db: Database session
+    """
+    statements = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    engine = empty_db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        row = crud.create_item(empty_db, {"name": "Item", "description": "Text"})
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    
+    assert len(statements) == 1
+    assert statements[0].lstrip().startswith("INSERT") and "RETURNING" in statements[0]
+    item = dict(zip(ITEM_FIELDS, row))
+    assert item["id"] == 1 and item["name"] == "Item" and item["is_active"] is True
+    assert isinstance(item["created_at"], datetime)
+
+
+@pytest.mark.skipif(not os.getenv("RUN_BENCHMARKS"), reason="set RUN_BENCHMARKS=1 to run")
+def test_create_item_benchmark(tmp_path):
+    """
+    Micro-benchmark inserts/sec of INSERT ... RETURNING against
+    commit + refresh, on a file database
+    
+    Args:
+        tmp_path: Temporary directory
+    """
+    inserts = 300
+    rates = {}
+    for label, create in (("commit+refresh", legacy_create_item), ("returning", crud.create_item)):
+        engine = create_engine(f"sqlite:///{tmp_path / label}.db")
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            session.execute(text("PRAGMA synchronous = OFF"))
+            start = time.perf_counter()
+            for i in range(inserts):
+                create(session, {"name": f"Item {i}"})
+            rates[label] = inserts / (time.perf_counter() - start)
+        engine.dispose()
+    
+    print(", ".join(f"{label}: {rate:.0f} inserts/s" for label, rate in rates.items()))
+    # Saving the refresh SELECT is about 1.8x faster here; 1.2x still fails
+    # if create_item goes back to a second round trip
+    assert rates["returning"] > rates["commit+refresh"] * 1.2
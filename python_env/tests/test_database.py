@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for database configuration
+"""
+
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src import database
+from src.database import (
+    create_async_db_engine,
+    create_db_engine,
+    engine_options,
+    sqlite_pragmas,
+    to_async_url,
+)
+
+
+def test_sqlite_pragmas_profiles():
+    """
+    Test resolving PRAGMA profiles and overrides
+    """
+    pragmas = sqlite_pragmas("performance", "")
+    assert pragmas["journal_mode"] == "WAL"
+    assert pragmas["synchronous"] == "NORMAL"
+    
+    pragmas = sqlite_pragmas("performance", "synchronous=FULL, Cache_Size=-2000")
+    assert pragmas["synchronous"] == "FULL"
+    assert pragmas["cache_size"] == "-2000"
+    
+    assert "journal_mode" not in sqlite_pragmas("default", "")
+    
+    with pytest.raises(ValueError):
+        sqlite_pragmas("unknown", "")
+    with pytest.raises(ValueError):
+        sqlite_pragmas("performance", "synchronous")
+    with pytest.raises(ValueError):
+        sqlite_pragmas("performance", "x; DROP TABLE items=1")
+
+
+def test_engine_options_pooling():
+    """
+    Test that file databases get a sized pool and in-memory ones do not
+    """
+    options = engine_options("sqlite:///./test.db")
+    assert options["poolclass"] is QueuePool
+    assert options["pool_size"] > 0
+    assert engine_options("sqlite:///./test.db", is_async=True)["poolclass"] is AsyncAdaptedQueuePool
+    assert "poolclass" not in engine_options("sqlite:///:memory:")
+    assert "poolclass" not in engine_options("sqlite://")
+
+
+def test_to_async_url():
+    """
+    Test mapping URLs to their async drivers
+    """
+    assert to_async_url("sqlite:///./interview.db").drivername == "sqlite+aiosqlite"
+    assert to_async_url("postgresql://localhost/db").drivername == "postgresql+asyncpg"
+
+
+def test_pragmas_applied_on_connect(tmp_path):
+    """
+    Test that every new connection gets the performance profile
+    
+    Args:
+        tmp_path: Temporary directory
+    """
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'perf.db'}")
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert connection.execute(text("PRAGMA temp_store")).scalar() == 2
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+    engine.dispose()
+
+
+def test_pragmas_applied_on_async_connect(tmp_path):
+    """
+    Test that the async engine applies the same PRAGMAs
+    
+    Args:
+        tmp_path: Temporary directory
+    """
+    async def read_pragmas():
+        engine = create_async_db_engine(f"sqlite:///{tmp_path / 'perf.db'}")
+        async with engine.connect() as connection:
+            journal_mode = (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+            cache_size = (await connection.execute(text("PRAGMA cache_size"))).scalar()
+        await engine.dispose()
+        return journal_mode, cache_size
+    
+    assert asyncio.run(read_pragmas()) == ("wal", -64000)
+
+
+def test_engine_created_on_first_session(tmp_path, monkeypatch):
+    """
+    Test that the application engine is only built when first needed
+    
+    Args:
+        tmp_path: Temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    url = f"sqlite:///{tmp_path / 'lazy.db'}"
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "SQLALCHEMY_DATABASE_URL", url)
+    monkeypatch.setattr(database, "create_db_engine", lambda: create_db_engine(url))
+    session_factory = database.LazySessionmaker()
+    assert database._engine is None
+    
+    with session_factory() as db:
+        assert db.execute(text("SELECT 1")).scalar() == 1
+    assert database._engine is not None
+    assert database.get_engine() is database._engine
+    assert session_factory.kw["bind"] is database._engine
+    database._engine.dispose()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_forked_child_does_not_reuse_pooled_connections(tmp_path, monkeypatch):
+    """
+    Test that a forked process drops the connections pooled by its parent
+    
+    Args:
+        tmp_path: Temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    url = f"sqlite:///{tmp_path / 'fork.db'}"
+    monkeypatch.setattr(database, "_engine", create_db_engine(url))
+    with database.get_engine().connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert database.get_engine().pool.checkedin() == 1
+    
+    pid = os.fork()
+    if pid == 0:
+        os._exit(0 if database.get_engine().pool.checkedin() == 0 else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    # The parent keeps its connection
+    assert database.get_engine().pool.checkedin() == 1
+    database.get_engine().dispose()
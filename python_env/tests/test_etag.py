@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for ETag helpers
+"""
+
+from datetime import datetime
+
+from src.etag import if_none_match, item_etag, list_etag, partial_etag
+
+
+def test_item_etag_tracks_version():
+    """
+    Test that item ETags change with the item and its timestamps
+    """
+    created = datetime(2024, 1, 1, 12, 0, 0)
+    etag = item_etag(1, created, None)
+    assert etag.startswith('"1-') and etag.endswith('"')
+    assert item_etag(1, created, None) == etag
+    assert item_etag(2, created, None) != etag
+    assert item_etag(1, created, datetime(2024, 1, 2)) != etag
+
+
+def test_partial_etag_tracks_fields():
+    """
+    Test that each field selection gets its own ETag
+    """
+    etag = item_etag(1, datetime(2024, 1, 1), None)
+    assert partial_etag(etag, None) == etag
+    partial = partial_etag(etag, ("name", "id"))
+    assert partial.startswith(etag[:-1]) and partial.endswith('"')
+    assert partial != etag
+    assert partial_etag(etag, ("name", "id")) == partial
+    assert partial_etag(etag, ("id",)) != partial
+
+
+def test_list_etag_tracks_version_and_query():
+    """
+    Test that list ETags change with the table version and the query
+    """
+    etag = list_etag(3, [("limit", "10")])
+    assert list_etag(3, [("limit", "10")]) == etag
+    assert list_etag(4, [("limit", "10")]) != etag
+    assert list_etag(3, [("limit", "5")]) != etag
+
+
+def test_if_none_match():
+    """
+    Test If-None-Match parsing with lists, weak tags and wildcards
+    """
+    assert if_none_match('"a"', '"a"')
+    assert if_none_match('"b", W/"a"', '"a"')
+    assert if_none_match("*", '"a"')
+    assert not if_none_match('"b"', '"a"')
+    assert not if_none_match(None, '"a"')
+    assert not if_none_match("", '"a"')
@@ -0,0 +1,36 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the streaming items export
+"""
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from src.database import Base
+from src.export import EXPORT_COLUMNS, export_items, iter_batches
+from src.models import Item
+
+
+def test_iter_batches_yields_bounded_batches():
+    """
+    Test that rows are read in batches of at most batch_size tuples
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        db.execute(insert(Item), [{"name": f"Item {i}"} for i in range(7)])
+        db.commit()
+        
+        batches = list(iter_batches(db, batch_size=3))
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert len(batches[0][0]) == len(EXPORT_COLUMNS)
+        
+        chunks = list(export_items(db, "ndjson", batch_size=3))
+        assert len(chunks) == 3
+        assert b"".join(chunks).count(b"\n") == 7
+        
+        chunks = list(export_items(db, "csv", batch_size=3))
+        assert len(chunks) == 4
+        assert chunks[0] == b"id,name,description,is_active,created_at,updated_at\r\n"
+    engine.dispose()
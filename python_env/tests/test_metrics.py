@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for request and database metrics
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
+
+from src import metrics
+from src.metrics import Counter, Histogram, MetricsMiddleware, instrument_engine
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    """
+    Start every test from empty metrics
+    """
+    metrics.registry.clear()
+    yield
+    metrics.registry.clear()
+
+
+def test_counter_render():
+    """
+    Test the text format of a counter, with escaped label values
+    """
+    counter = Counter("jobs_total", "Jobs run.", ("queue",))
+    counter.inc('a"b')
+    counter.inc('a"b', amount=2)
+    assert counter.render() == [
+        "# HELP jobs_total Jobs run.",
+        "# TYPE jobs_total counter",
+        'jobs_total{queue="a\\"b"} 3',
+    ]
+
+
+def test_histogram_render():
+    """
+    Test that histogram buckets are cumulative and end with +Inf
+    """
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/")
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{route="/",le="0.1"} 2',
+        'latency_seconds_bucket{route="/",le="1"} 3',
+        'latency_seconds_bucket{route="/",le="+Inf"} 4',
+        'latency_seconds_sum{route="/"} 3.65',
+        'latency_seconds_count{route="/"} 4',
+    ]
+
+
+def test_statement_operation():
+    """
+    Test classifying SQL statements
+    """
+    assert metrics.statement_operation("  select 1") == "SELECT"
+    assert metrics.statement_operation("INSERT INTO items") == "INSERT"
+    assert metrics.statement_operation("") == "UNKNOWN"
+
+
+def test_instrumented_engine():
+    """
+    Test that statements are counted and timed, failed ones included
+    """
+    engine = create_engine("sqlite:///:memory:")
+    instrument_engine(engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        connection.execute(text("SELECT 2"))
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM missing"))
+        connection.execute(text("CREATE TABLE t (x)"))
+        assert connection.info["metrics_start"] == []
+    engine.dispose()
+    
+    assert metrics.db_statements_total.value("SELECT") == 2
+    assert metrics.db_statements_total.value("CREATE") == 1
+    assert metrics.db_statement_duration_seconds.count("SELECT") == 2
+
+
+def test_middleware_per_route():
+    """
+    Test latency, status and statements per request by route template
+    """
+    engine = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    instrument_engine(engine)
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    
+    @app.get("/things/{thing_id}")
+    def read_thing(thing_id: int):
+        # One query per id, the N+1 shape the metrics should expose
+        with engine.connect() as connection:
+            for i in range(thing_id):
+                connection.execute(text("SELECT :i"), {"i": i})
+        return {"id": thing_id}
+    
+    client = TestClient(app)
+    client.get("/things/3")
+    client.get("/things/5")
+    client.get("/missing/path")
+    engine.dispose()
+    
+    route = ("GET", "/things/{thing_id}")
+    assert metrics.http_requests_total.value(*route, "200") == 2
+    assert metrics.http_requests_total.value("GET", metrics.UNMATCHED_ROUTE, "404") == 1
+    assert metrics.http_request_duration_seconds.count(*route) == 2
+    assert metrics.db_statements_per_request.sum(*route) == 8
+    assert metrics.http_requests_in_progress.value("GET") == 0
+    
+    body = metrics.registry.render().decode()
+    assert 'db_statements_per_request_bucket{method="GET",route="/things/{thing_id}",le="5"} 2' in body
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the Alembic migrations
+"""
+
+import os
+
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import sessionmaker
+
+import src.app as app_module
+from src.app import app
+from src.cache import item_cache
+from src.database import get_db
+from src.models import Item
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def alembic_config(url):
+    """
+    Build an Alembic configuration pointing at a database
+    
+    Args:
+        url: Database URL
+        
+    Returns:
+        Config: Alembic configuration
+    """
+    config = Config(os.path.join(PROJECT_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(PROJECT_ROOT, "migrations"))
+    config.set_main_option("sqlalchemy.url", url)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def item_indexes(url):
+    """
+    Get the indexes of the items table
+    
+    Args:
+        url: Database URL
+        
+    Returns:
+        dict: Indexed columns by index name
+    """
+    engine = create_engine(url)
+    indexes = {
+        index["name"]: index["column_names"]
+        for index in inspect(engine).get_indexes("items")
+    }
+    engine.dispose()
+    return indexes
+
+
+def test_upgrade_matches_models(tmp_path):
+    """
+    Test that migrating an empty database yields the model indexes
+    
+    Args:
+        tmp_path: Temporary directory
+    """
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    command.upgrade(alembic_config(url), "head")
+    
+    expected = {
+        index.name: [column.name for column in index.columns]
+        for index in Item.__table__.indexes
+    }
+    assert item_indexes(url) == expected
+    
+    engine = create_engine(url)
+    assert inspect(engine).has_table("items_archive")
+    engine.dispose()
+
+
+def test_upgrade_existing_database_and_downgrade(tmp_path):
+    """
+    Test adopting a database created before migrations, then rolling back
+    
+    Args:
+        tmp_path: Temporary directory
+    """
+    url = f"sqlite:///{tmp_path / 'existing.db'}"
+    engine = create_engine(url)
+    Item.__table__.create(bind=engine)
+    engine.dispose()
+    
+    config = alembic_config(url)
+    command.upgrade(config, "head")
+    assert "ix_items_is_active_name_id" in item_indexes(url)
+    
+    command.downgrade(config, "0001")
+    assert set(item_indexes(url)) == {"ix_items_id", "ix_items_name"}
+
+
+def test_upgraded_database_serves_listing_and_search(tmp_path, monkeypatch):
+    """
+    Test the API on a database whose schema comes only from the migrations
+    
+    Args:
+        tmp_path: Temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    url = f"sqlite:///{tmp_path / 'served.db'}"
+    engine = create_engine(url)
+    # A row written before the upgrade must be indexed by the migration
+    Item.__table__.create(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(Item.__table__.insert().values(
+            name="Hello before", description="Existing row", is_active=True,
+        ))
+    command.upgrade(alembic_config(url), "head")
+    MigratedSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    
+    def override_get_migrated_db():
+        db = MigratedSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+    
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_migrated_db)
+    monkeypatch.setattr(app_module, "DATABASE_CREATE_SCHEMA", False)
+    item_cache.clear()
+    with TestClient(app) as client:
+        response = client.post("/items/", json={"name": "Hello after", "description": "New row"})
+        assert response.status_code == 201
+        
+        response = client.get("/items/")
+        assert response.status_code == 200
+        assert [item["name"] for item in response.json()] == ["Hello before", "Hello after"]
+        assert response.headers["etag"]
+        
+        response = client.get("/items/search", params={"q": "hello"})
+        assert response.status_code == 200
+        assert {item["name"] for item in response.json()} == {"Hello before", "Hello after"}
+    engine.dispose()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for full-text item search
+"""
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from src.database import Base
+from src.models import Item
+from src.pagination import CursorError, encode_cursor
+from src.search import build_match_query, search_items
+
+
+def test_build_match_query():
+    """
+    Test quoting of user input into an FTS5 expression
+    """
+    assert build_match_query("red apple") == '"red" "apple"*'
+    assert build_match_query("red apple", prefix=False) == '"red" "apple"'
+    assert build_match_query('say "hi" OR') == '"say" """hi""" "OR"*'
+    assert build_match_query("   ") is None
+
+
+def test_search_index_built_for_existing_rows(tmp_path):
+    """
+    Test that rows written before the index existed are indexed on creation
+    
+    Args:
+        tmp_path: Temporary directory
+    """
+    engine = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+    Item.__table__.create(bind=engine)
+    with Session(engine) as db:
+        db.execute(insert(Item), [{"name": "Old lamp"}, {"name": "Old chair"}])
+        db.commit()
+    
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        rows, next_cursor = search_items(db, "lamp")
+        assert [row[0] for row in rows] == ["Old lamp"]
+        assert next_cursor is None
+        
+        rows, next_cursor = search_items(db, "old", limit=1)
+        assert len(rows) == 1
+        assert next_cursor is not None
+        rows, next_cursor = search_items(db, "old", limit=1, after=next_cursor)
+        assert len(rows) == 1
+        assert next_cursor is None
+    engine.dispose()
+
+
+@pytest.mark.parametrize("values", [
+    [0.5, 10 ** 30],
+    [0.5, "1"],
+    [True, 1],
+    ["0.5", 1],
+    [float("nan"), 1],
+])
+def test_search_rejects_forged_cursor(values):
+    """
+    Test that cursors with values of the wrong type or out of range are rejected
+    
+    Args:
+        values: Forged keyset values
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        with pytest.raises(CursorError):
+            search_items(db, "lamp", after=encode_cursor("rank", values))
+    engine.dispose()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for the bulk data seeder
+"""
+
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
+
+from seed_db import generate_items, parse_count, seed_items  # noqa: E402
+
+
+def dump_items(url):
+    """
+    Read every item row of a database
+    
+    Args:
+        url: Database URL
+        
+    Returns:
+        list: Item rows ordered by id
+    """
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT * FROM items ORDER BY id")).all()
+    engine.dispose()
+    return rows
+
+
+def test_parse_count():
+    """
+    Test row counts with k and m suffixes
+    """
+    assert parse_count("1500") == 1500
+    assert parse_count("500k") == 500_000
+    assert parse_count("2.5M") == 2_500_000
+
+
+def test_generate_items_deterministic():
+    """
+    Test that a seed always yields the same items, within realistic bounds
+    """
+    items = list(generate_items(2000, seed=7))
+    assert items == list(generate_items(2000, seed=7))
+    assert items != list(generate_items(2000, seed=8))
+    
+    created = [item["created_at"] for item in items]
+    assert created == sorted(created)
+    assert all(len(item["name"]) <= 100 for item in items)
+    descriptions = [item["description"] for item in items if item["description"] is not None]
+    assert 0.75 < len(descriptions) / len(items) < 0.95
+    assert all(len(description) <= 2000 for description in descriptions)
+    assert 0.8 < sum(item["is_active"] for item in items) / len(items) < 0.97
+
+
+def test_seed_items(tmp_path):
+    """
+    Test seeding, reproducibility across databases and reset
+    
+    Args:
+        tmp_path: Temporary directory
+    """
+    first = f"sqlite:///{tmp_path / 'first.db'}"
+    second = f"sqlite:///{tmp_path / 'second.db'}"
+    seed_items(first, 3000, seed=1, batch_size=1000, synchronous_off=True)
+    seed_items(second, 3000, seed=1, batch_size=700)
+    assert dump_items(first) == dump_items(second)
+    
+    with pytest.raises(ValueError):
+        seed_items(first, 10, seed=1)
+    seed_items(first, 10, seed=2, reset=True)
+    assert [row.id for row in dump_items(first)] == list(range(1, 11))
+    
+    engine = create_engine(first)
+    with engine.connect() as connection:
+        # Indexes, triggers and statistics are in place after the load
+        indexes = connection.execute(text(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = 'items'"
+        )).scalar()
+        assert indexes == 6
+        connection.execute(text("INSERT INTO items (name) VALUES ('Needle')"))
+        assert connection.execute(text(
+            "SELECT count(*) FROM items_fts WHERE items_fts MATCH 'needle'"
+        )).scalar() == 1
+        assert connection.execute(text("SELECT count(*) FROM sqlite_stat1")).scalar() > 0
+    engine.dispose()
@@ -4,10 +4,37 @@
 测试序列处理工具模块
 """
 
+import itertools
+import random
+import tracemalloc
+import types
 import unittest
+from unittest import mock
+
+from src import sequence_utils
 from src.sequence_utils import SequenceUtils
 
 
+def is_subsequence(sub, seq):
+    """
+    判断 sub 是否为 seq 的子序列
+    """
+    it = iter(seq)
+    return all(ch in it for ch in sub)
+
+
+def peak_memory(func, *args, **kwargs):
+    """
+    运行函数并返回其分配内存的峰值（字节）
+    """
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
 class TestSequenceUtils(unittest.TestCase):
     """
     测试SequenceUtils类的功能
@@ -46,5 +73,273 @@ class TestSequenceUtils(unittest.TestCase):
                 "我爱中国", "我是中国人"), "我中国")
 
 
+    def test_longest_common_subsequence_hirschberg(self):
+        """
+        测试 Hirschberg 方法与完整 DP 表得到相同长度的最长公共子序列
+        """
+        for method in ("table", "hirschberg"):
+            self.assertEqual(
+                SequenceUtils.longest_common_subsequence("XMJYAUZ", "MZJAWXU", method=method),
+                "MJAU")
+            self.assertEqual(SequenceUtils.longest_common_subsequence("", "abc", method=method), "")
+        
+        rng = random.Random(7)
+        for _ in range(50):
+            str1 = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 120)))
+            str2 = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 120)))
+            expected = SequenceUtils.longest_common_subsequence(str1, str2, method="table")
+            lcs = SequenceUtils.longest_common_subsequence(str1, str2, method="hirschberg")
+            self.assertEqual(len(lcs), len(expected))
+            self.assertTrue(is_subsequence(lcs, str1) and is_subsequence(lcs, str2))
+        
+        with self.assertRaises(ValueError):
+            SequenceUtils.longest_common_subsequence("abc", "abc", method="quadratic")
+
+    def test_longest_common_subsequence_auto_method(self):
+        """
+        测试超过阈值时自动改用 Hirschberg 方法
+        """
+        with mock.patch.object(sequence_utils, "_lcs_hirschberg",
+                               wraps=sequence_utils._lcs_hirschberg) as hirschberg:
+            SequenceUtils.longest_common_subsequence("abc" * 10, "cab" * 10)
+            self.assertFalse(hirschberg.called)
+            with mock.patch.object(sequence_utils, "LCS_TABLE_MAX_CELLS", 100):
+                self.assertEqual(
+                    SequenceUtils.longest_common_subsequence("abcde" * 4, "ace" * 4),
+                    "ace" * 4)
+            self.assertTrue(hirschberg.called)
+
+    def test_longest_common_subsequence_hirschberg_memory(self):
+        """
+        测试 Hirschberg 方法的内存峰值随输入长度线性增长
+        """
+        rng = random.Random(11)
+        peaks = {}
+        for length in (300, 1200):
+            str1 = "".join(rng.choice("ACGT") for _ in range(length))
+            str2 = "".join(rng.choice("ACGT") for _ in range(length))
+            peaks[length] = peak_memory(
+                SequenceUtils.longest_common_subsequence, str1, str2, method="hirschberg")
+            # 每个输入字符不超过 64 字节
+            self.assertLess(peaks[length], 64 * 2 * length)
+        # 长度变为 4 倍，完整 DP 表会增长 16 倍
+        self.assertLess(peaks[1200], 8 * peaks[300])
+        table_peak = peak_memory(
+            SequenceUtils.longest_common_subsequence, str1[:300], str2[:300], method="table")
+        self.assertLess(peaks[300] * 10, table_peak)
+
+
+    def test_lcs_length(self):
+        """
+        测试两行数组与位并行方法计算的最长公共子序列长度
+        """
+        for method in ("auto", "dp", "bitparallel"):
+            self.assertEqual(SequenceUtils.lcs_length("XMJYAUZ", "MZJAWXU", method=method), 4)
+            self.assertEqual(SequenceUtils.lcs_length("我爱中国", "我是中国人", method=method), 3)
+            self.assertEqual(SequenceUtils.lcs_length("", "abc", method=method), 0)
+            self.assertEqual(SequenceUtils.lcs_length("abc", "", method=method), 0)
+            self.assertEqual(SequenceUtils.lcs_length("abc", "def", method=method), 0)
+            self.assertEqual(SequenceUtils.lcs_length("abcde", "abcde", method=method), 5)
+        
+        rng = random.Random(5)
+        for _ in range(100):
+            str1 = "".join(rng.choice("abcde") for _ in range(rng.randint(0, 150)))
+            str2 = "".join(rng.choice("abcde") for _ in range(rng.randint(0, 150)))
+            expected = len(SequenceUtils.longest_common_subsequence(str1, str2, method="table"))
+            self.assertEqual(SequenceUtils.lcs_length(str1, str2, method="dp"), expected)
+            self.assertEqual(SequenceUtils.lcs_length(str1, str2, method="bitparallel"), expected)
+        
+        with self.assertRaises(ValueError):
+            SequenceUtils.lcs_length("abc", "abc", method="table")
+
+    def test_lcs_length_large_alphabet(self):
+        """
+        测试公共字母表过大时自动改用两行数组
+        """
+        with mock.patch.object(sequence_utils, "LCS_BITPARALLEL_MAX_ALPHABET", 2):
+            self.assertEqual(SequenceUtils.lcs_length("abcde", "ace"), 3)
+            self.assertEqual(
+                SequenceUtils.longest_common_subsequence("abcde" * 300, "ace" * 300),
+                "ace" * 300)
+            with self.assertRaises(ValueError):
+                SequenceUtils.lcs_length("abcde", "ace", method="bitparallel")
+
+    def test_lcs_similarity(self):
+        """
+        测试基于最长公共子序列的相似度
+        """
+        self.assertEqual(SequenceUtils.lcs_similarity("", ""), 1.0)
+        self.assertEqual(SequenceUtils.lcs_similarity("abc", ""), 0.0)
+        self.assertEqual(SequenceUtils.lcs_similarity("abc", "abc"), 1.0)
+        self.assertAlmostEqual(SequenceUtils.lcs_similarity("abcde", "ace"), 0.75)
+        self.assertAlmostEqual(SequenceUtils.lcs_similarity("abcd", "bcda", method="dp"), 0.75)
+
+
+    @unittest.skipIf(sequence_utils.np is None, "需要安装 NumPy")
+    def test_longest_common_subsequence_numpy(self):
+        """
+        测试 NumPy 向量化方法与完整 DP 表的结果完全相同
+        """
+        self.assertEqual(
+            SequenceUtils.longest_common_subsequence("XMJYAUZ", "MZJAWXU", method="numpy"), "MJAU")
+        self.assertEqual(
+            SequenceUtils.longest_common_subsequence("我爱中国", "我是中国人", method="numpy"), "我中国")
+        self.assertEqual(SequenceUtils.longest_common_subsequence("", "abc", method="numpy"), "")
+        self.assertEqual(SequenceUtils.longest_common_subsequence("abc", "", method="numpy"), "")
+        
+        rng = random.Random(17)
+        for _ in range(100):
+            alphabet = rng.choice(["ab", "abcd", "我爱中国人ab"])
+            str1 = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+            str2 = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 80)))
+            self.assertEqual(
+                SequenceUtils.longest_common_subsequence(str1, str2, method="numpy"),
+                SequenceUtils.longest_common_subsequence(str1, str2, method="table"))
+        
+        # 非字符串序列先映射为整数编号
+        self.assertEqual(sequence_utils._lcs_table_numpy([1, (2,), 3], [(2,), 3, 1]), [(2,), 3])
+
+    def test_longest_common_subsequence_numpy_missing(self):
+        """
+        测试没有安装 NumPy 时 numpy 方法报错
+        """
+        with mock.patch.object(sequence_utils, "np", None):
+            with self.assertRaises(ImportError):
+                SequenceUtils.longest_common_subsequence("abc", "abc", method="numpy")
+
+    def assert_edit_script(self, seq1, seq2, opcodes):
+        """
+        检查编辑脚本覆盖两个序列，且 equal 片段组成最长公共子序列
+        """
+        i = j = 0
+        common = 0
+        for tag, i1, i2, j1, j2 in opcodes:
+            self.assertEqual((i1, j1), (i, j))
+            if tag == "equal":
+                self.assertEqual(list(seq1[i1:i2]), list(seq2[j1:j2]))
+                common += i2 - i1
+            else:
+                self.assertIn(tag, ("delete", "insert", "replace"))
+                self.assertEqual(tag == "delete", j1 == j2)
+                self.assertEqual(tag == "insert", i1 == i2)
+            i, j = i2, j2
+        self.assertEqual((i, j), (len(seq1), len(seq2)))
+        self.assertEqual(common, SequenceUtils.lcs_length(seq1, seq2, method="dp"))
+
+    def test_diff(self):
+        """
+        测试 Myers 差分算法生成的编辑脚本
+        """
+        self.assertEqual(SequenceUtils.diff("", ""), [])
+        self.assertEqual(SequenceUtils.diff("abc", "abc"), [("equal", 0, 3, 0, 3)])
+        self.assertEqual(SequenceUtils.diff("", "ab"), [("insert", 0, 0, 0, 2)])
+        self.assertEqual(SequenceUtils.diff("ab", ""), [("delete", 0, 2, 0, 0)])
+        self.assertEqual(
+            SequenceUtils.diff(["a", "b", "c", "d"], ["a", "x", "c", "d", "e"]),
+            [("equal", 0, 1, 0, 1), ("replace", 1, 2, 1, 2),
+             ("equal", 2, 4, 2, 4), ("insert", 4, 4, 4, 5)])
+        
+        rng = random.Random(13)
+        for _ in range(200):
+            alphabet = rng.choice(["ab", "abcd", "abcdefghij"])
+            seq1 = [rng.choice(alphabet) for _ in range(rng.randint(0, 60))]
+            seq2 = [rng.choice(alphabet) for _ in range(rng.randint(0, 60))]
+            self.assert_edit_script(seq1, seq2, SequenceUtils.diff(seq1, seq2))
+            str1, str2 = "".join(seq1), "".join(seq2)
+            self.assertEqual(
+                len(SequenceUtils.longest_common_subsequence(str1, str2, method="myers")),
+                len(SequenceUtils.longest_common_subsequence(str1, str2, method="table")))
+        
+        with self.assertRaises(TypeError):
+            SequenceUtils.diff([[1]], [[1]])
+
+    def test_diff_large_sequences(self):
+        """
+        测试差异很少的长行列表可以快速比较
+        """
+        lines = [f"line {i}" for i in range(100000)]
+        changed = list(lines)
+        changed[10] = "edited"
+        del changed[5000:5003]
+        changed.insert(90000, "added")
+        self.assertEqual(SequenceUtils.diff(lines, changed), [
+            ("equal", 0, 10, 0, 10),
+            ("replace", 10, 11, 10, 11),
+            ("equal", 11, 5000, 11, 5000),
+            ("delete", 5000, 5003, 5000, 5000),
+            ("equal", 5003, 90003, 5000, 90000),
+            ("insert", 90003, 90003, 90000, 90001),
+            ("equal", 90003, 100000, 90001, 99998),
+        ])
+
+
+    def test_lcs_batch(self):
+        """
+        测试多进程批量计算按输入顺序返回结果
+        """
+        rng = random.Random(19)
+        pairs = [
+            ("".join(rng.choice("abcd") for _ in range(rng.randint(0, 40))),
+             "".join(rng.choice("abcd") for _ in range(rng.randint(0, 40))))
+            for _ in range(100)
+        ]
+        expected = [SequenceUtils.longest_common_subsequence(str1, str2) for str1, str2 in pairs]
+        
+        results = SequenceUtils.lcs_batch(pairs, workers=2, chunksize=7)
+        self.assertIsInstance(results, types.GeneratorType)
+        self.assertEqual(list(results), expected)
+        self.assertEqual(list(SequenceUtils.lcs_batch(pairs, workers=1, chunksize=7)), expected)
+        self.assertEqual(
+            list(SequenceUtils.lcs_batch(iter(pairs), workers=2, method="hirschberg")),
+            [SequenceUtils.longest_common_subsequence(str1, str2, method="hirschberg")
+             for str1, str2 in pairs])
+        self.assertEqual(list(SequenceUtils.lcs_batch([], workers=2)), [])
+        
+        with self.assertRaises(ValueError):
+            list(SequenceUtils.lcs_batch(pairs, workers=0))
+        with self.assertRaises(ValueError):
+            list(SequenceUtils.lcs_batch(pairs, chunksize=0))
+
+    def test_lcs_batch_streams(self):
+        """
+        测试批量计算按需读取输入，可以处理无限的输入
+        """
+        results = SequenceUtils.lcs_batch(
+            itertools.repeat(("abcde", "ace")), workers=2, chunksize=3)
+        self.assertEqual(list(itertools.islice(results, 10)), ["ace"] * 10)
+        results.close()
+        
+        consumed = []
+        
+        def pairs():
+            for i in range(1000):
+                consumed.append(i)
+                yield "abc", "bc"
+        
+        results = SequenceUtils.lcs_batch(pairs(), workers=2, chunksize=4)
+        next(results)
+        # 只提交了有限个任务，而不是一次读完全部输入
+        self.assertLessEqual(len(consumed), 2 * sequence_utils._BATCH_TASKS_PER_WORKER * 4 + 4)
+        results.close()
+
+    def test_lcs_matrix(self):
+        """
+        测试两两计算的最长公共子序列长度矩阵
+        """
+        strings = ["abcde", "ace", "", "xyz", "我爱中国", "中国人"]
+        expected = [
+            [SequenceUtils.lcs_length(str1, str2) for str2 in strings]
+            for str1 in strings
+        ]
+        self.assertEqual(SequenceUtils.lcs_matrix(strings, workers=2, chunksize=2), expected)
+        self.assertEqual(SequenceUtils.lcs_matrix(iter(strings), workers=1), expected)
+        self.assertEqual(SequenceUtils.lcs_matrix([], workers=2), [])
+        
+        # 对称的另一半不会重复计算
+        with mock.patch.object(SequenceUtils, "lcs_length", wraps=SequenceUtils.lcs_length) as lcs_length:
+            SequenceUtils.lcs_matrix(strings, workers=1)
+        self.assertEqual(lcs_length.call_count, len(strings) * (len(strings) - 1) // 2)
+
+
 if __name__ == '__main__':
     unittest.main()
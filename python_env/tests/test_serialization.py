@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tests for fast JSON serialization of item rows
+"""
+
+from datetime import datetime
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from src import serialization
+from src.app import ItemResponse
+from src.serialization import ITEM_FIELDS, FastJSONResponse, parse_fields, rows_to_dicts
+
+
+# SQLite hands back naive datetimes
+ROWS = [
+    ("Item 1", "描述 \"quoted\"\n", True, 1, datetime(2024, 1, 2, 3, 4, 5), None),
+    ("Item 2", None, False, 2, datetime(2024, 1, 2, 3, 4, 5, 678000),
+     datetime(2024, 2, 3, 4, 5, 6)),
+]
+
+
+def test_item_fields_match_response_model():
+    """
+    Test that ITEM_FIELDS follows the ItemResponse field order
+    """
+    assert tuple(ItemResponse.schema()["properties"]) == ITEM_FIELDS
+
+
+def test_parse_fields():
+    """
+    Test field selection parsing, ordering and validation
+    """
+    assert parse_fields(None) == ITEM_FIELDS
+    assert parse_fields("id,name") == ("name", "id")
+    assert parse_fields(" name , id,name,") == ("name", "id")
+    with pytest.raises(ValueError, match="colour"):
+        parse_fields("id,colour")
+    with pytest.raises(ValueError):
+        parse_fields(" , ")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_fast_path_matches_default_encoding(monkeypatch, use_orjson):
+    """
+    Test that the fast path produces the bytes of the validated path
+    
+    Args:
+        monkeypatch: Pytest monkeypatch fixture
+        use_orjson: Whether orjson is used, when installed
+    """
+    if use_orjson and serialization.get_orjson() is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr(serialization, "get_orjson", lambda: None)
+    
+    items = [ItemResponse(**dict(zip(ITEM_FIELDS, row))) for row in ROWS]
+    expected = JSONResponse(jsonable_encoder(items)).body
+    assert FastJSONResponse(rows_to_dicts(ROWS)).body == expected